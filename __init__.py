@@ -22,19 +22,26 @@ def create_app(config_class=DevelopmentConfig):
     socketio.init_app(app)
     migrate.init_app(app, db)
     
+    from services.audit_log_service import audit_log
+    audit_log.init_app(app)
+    
+    from services.blob_store_service import blob_store
+    blob_store.init_app(app)
+    
+    from services.logo_service import company_logo_url
+    app.add_template_global(company_logo_url)
+    
     # Register context processor
     @app.context_processor
     def inject_datetime():
         from datetime import datetime, timedelta
         from flask import session
-        from models import Notification
+        from services.notification_service import get_unread_count
         
         unread_count = 0
         if 'user_id' in session:
-            unread_count = Notification.query.filter_by(
-                user_id=session['user_id'],
-                is_read=False
-            ).count()
+            # Counter column kept up to date on write, no COUNT(*) per render
+            unread_count = get_unread_count(session['user_id'])
         
         return {
             'datetime': datetime,
@@ -43,6 +50,14 @@ def create_app(config_class=DevelopmentConfig):
             'unread_notification_count': unread_count
         }
     
+    # Bodies over MAX_CONTENT_LENGTH are refused before they are read
+    @app.errorhandler(413)
+    def request_too_large(error):
+        from flask import flash, redirect, request
+        limit = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+        flash(f'The upload is too large (the limit is {limit} MB per form).', 'error')
+        return redirect(request.url)
+    
     # Register blueprints
     from routes.main import main_bp
     from routes.auth import auth_bp
@@ -70,6 +85,10 @@ def create_app(config_class=DevelopmentConfig):
     app.register_blueprint(common_bp)
     app.register_blueprint(expert_application_bp)
     
+    # Register maintenance CLI commands
+    from cli import register_commands
+    register_commands(app)
+    
     # Create database tables
     with app.app_context():
         db.create_all()
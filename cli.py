@@ -0,0 +1,182 @@
+import click
+from flask.cli import AppGroup
+
+matches_cli = AppGroup('matches', help='Maintain the precomputed candidate/job match scores.')
+
+
+@matches_cli.command('backfill')
+def backfill_matches():
+    """Recompute stored match scores for every candidate/job pair"""
+    from services.job_matching_service import backfill_match_scores
+    
+    total = backfill_match_scores()
+    click.echo(f'Stored {total} match scores.')
+
+
+@matches_cli.command('verify')
+@click.option('--candidate-id', 'candidate_ids', type=int, multiple=True,
+              help='Only check these candidates (repeatable).')
+def verify_matches(candidate_ids):
+    """Compare stored match scores against a live recompute"""
+    from services.job_matching_service import verify_match_scores
+    
+    mismatches = verify_match_scores(list(candidate_ids) or None)
+    for candidate_id, job_id, stored, live in mismatches:
+        click.echo(f'candidate={candidate_id} job={job_id} stored={stored} live={live}')
+    
+    if mismatches:
+        raise click.ClickException(f'{len(mismatches)} stored scores are out of date.')
+    click.echo('All stored match scores are up to date.')
+
+
+search_cli = AppGroup('search', help='Maintain the job posting search indexes.')
+
+
+@search_cli.command('rebuild')
+def rebuild_search():
+    """Rebuild the search documents of every job posting"""
+    from services.job_search_service import rebuild_search_index
+    
+    total = rebuild_search_index()
+    click.echo(f'Indexed {total} job postings.')
+
+
+@search_cli.command('build-index')
+@click.option('--path', default=None, help='Where to write the index (defaults to JOB_INDEX_PATH).')
+def build_job_index_file(path):
+    """Build the in-memory job index and save it for workers to warm-start from"""
+    from services.job_index_service import rebuild_job_index
+    
+    total = rebuild_job_index(path)
+    click.echo(f'Indexed {total} active job postings.')
+
+
+notifications_cli = AppGroup('notifications', help='Maintain the per-user unread notification counters.')
+
+
+@notifications_cli.command('reconcile')
+@click.option('--user-id', 'user_ids', type=int, multiple=True,
+              help='Only repair these users (repeatable).')
+def reconcile_notifications(user_ids):
+    """Reset unread counters that drifted from the notifications table"""
+    from services.notification_service import reconcile_unread_counts
+    
+    fixed = reconcile_unread_counts(list(user_ids) or None)
+    click.echo(f'Repaired {fixed} unread counters.')
+
+
+activity_cli = AppGroup('activity-logs', help='Roll up, partition and archive the audit log.')
+
+
+@activity_cli.command('rollup')
+def rollup_activity():
+    """Count complete days of activity_logs into activity_log_daily"""
+    from services.activity_log_service import rollup_activity_logs
+    
+    days = rollup_activity_logs()
+    click.echo(f'Rolled up {days} days of activity.')
+
+
+@activity_cli.command('partitions')
+@click.option('--months-ahead', default=3, show_default=True, help='Months to create partitions for in advance.')
+def create_activity_partitions(months_ahead):
+    """Add monthly activity_logs partitions ahead of time (MySQL)"""
+    from services.activity_log_service import ensure_partitions
+    
+    created = ensure_partitions(months_ahead)
+    click.echo(f'Created partitions: {", ".join(created)}' if created else 'No partitions needed.')
+
+
+@activity_cli.command('archive')
+@click.option('--days', type=int, default=None, help='Keep this many days (defaults to ACTIVITY_LOG_RETENTION_DAYS).')
+@click.option('--dir', 'archive_dir', default=None, help='Archive directory (defaults to ACTIVITY_LOG_ARCHIVE_DIR).')
+def archive_activity(days, archive_dir):
+    """Move audit entries past the retention window into compressed monthly files"""
+    from services.activity_log_service import archive_activity_logs
+    
+    total = archive_activity_logs(days, archive_dir)
+    click.echo(f'Archived {total} audit log entries.')
+
+
+reports_cli = AppGroup('reports', help='Maintain the daily fact tables behind the admin reports.')
+
+
+@reports_cli.command('rollup')
+@click.option('--full', is_flag=True, help='Rebuild every day instead of only the days touched since the last run.')
+def rollup_reports(full):
+    """Refresh the daily report tables (incremental by default; --full nightly)"""
+    from services.report_service import refresh_report_facts
+    
+    written = refresh_report_facts(full=full)
+    for table, rows in written.items():
+        click.echo(f'{table}: {rows} rows')
+
+
+blobs_cli = AppGroup('blobs', help='Maintain the file store behind CVs, logos and certificates.')
+
+
+@blobs_cli.command('migrate')
+@click.option('--batch-size', default=100, show_default=True, help='Rows read and committed at a time.')
+def migrate_blob_columns(batch_size):
+    """Move file bytes still stored in table rows into the blob store"""
+    from services.blob_store_service import migrate_blobs
+    
+    moved = migrate_blobs(batch_size)
+    for column, rows in moved.items():
+        click.echo(f'{column}: {rows} files moved')
+
+
+@blobs_cli.command('gc')
+@click.option('--grace', default=3600, show_default=True, help='Keep unreferenced blobs younger than this many seconds.')
+def collect_blob_garbage(grace):
+    """Delete stored files that no row refers to any more"""
+    from services.blob_store_service import collect_garbage
+    
+    removed = collect_garbage(grace)
+    click.echo(f'Removed {removed} unreferenced files.')
+
+
+@blobs_cli.command('thumbnails')
+@click.option('--batch-size', default=100, show_default=True, help='Companies read and committed at a time.')
+def make_logo_thumbnails(batch_size):
+    """Make listing-size thumbnails for logos uploaded without one"""
+    from services.logo_service import backfill_logo_thumbnails, thumbnails_available
+    
+    if not thumbnails_available():
+        raise click.ClickException('Pillow is not installed; listings keep showing the original logos.')
+    made = backfill_logo_thumbnails(batch_size)
+    click.echo(f'Made {made} logo thumbnails.')
+
+
+cv_cli = AppGroup('cv', help='Maintain the text extracted from candidate CVs.')
+
+
+@cv_cli.command('extract')
+@click.option('--retry-processing', is_flag=True, help="Also retry CVs left 'processing' by a stopped worker.")
+def extract_cvs(retry_processing):
+    """Extract the text of stored CVs that have none yet (and retry failed ones)"""
+    from services.cv_text_service import extract_pending_cvs
+    
+    done, failed = extract_pending_cvs(retry_processing)
+    click.echo(f'Extracted {done} CVs, {failed} failed.')
+
+
+@cv_cli.command('rematch')
+@click.option('--batch-size', default=100, show_default=True, help='Documents read and committed at a time.')
+def rematch_cvs(batch_size):
+    """Find skill mentions again in CVs matched against an older skill catalog"""
+    from services.cv_text_service import rematch_cv_skills
+    
+    updated = rematch_cv_skills(batch_size)
+    click.echo(f'Rematched skills in {updated} CVs.')
+
+
+def register_commands(app):
+    """Attach the maintenance CLI groups to the app"""
+    app.cli.add_command(matches_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(activity_cli)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(blobs_cli)
+    app.cli.add_command(cv_cli)
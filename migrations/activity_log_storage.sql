@@ -0,0 +1,72 @@
+-- =====================================================
+-- SQL Migration Script for Activity Log Storage
+-- HireMe Platform - Audit Log Partitions, Indexes & Rollups
+-- =====================================================
+
+-- activity_logs is append-only and only ever read by time range, so it is
+-- RANGE partitioned by month on TO_DAYS(timestamp). Partitions are named
+-- p_YYYYMM after the month they hold; pmax catches anything newer.
+--   flask activity-logs partitions   -- split pmax for the coming months
+--   flask activity-logs rollup       -- count finished days (run nightly)
+--   flask activity-logs archive      -- gzip old months, then DROP PARTITION
+
+-- Partitioned InnoDB tables cannot have foreign keys, and every unique key
+-- must include the partitioning column. Check the constraint name with
+-- SHOW CREATE TABLE activity_logs if it differs.
+ALTER TABLE activity_logs DROP FOREIGN KEY activity_logs_ibfk_1;
+
+ALTER TABLE activity_logs
+    MODIFY timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, timestamp);
+
+-- Filtered listings seek on (timestamp, id) within a table / operation / user
+CREATE INDEX ix_activity_logs_table_timestamp
+    ON activity_logs (table_name, timestamp, id);
+
+CREATE INDEX ix_activity_logs_operation_timestamp
+    ON activity_logs (operation_type, timestamp, id);
+
+CREATE INDEX ix_activity_logs_user_timestamp
+    ON activity_logs (user_id, timestamp);
+
+ALTER TABLE activity_logs
+PARTITION BY RANGE (TO_DAYS(timestamp)) (
+    PARTITION p_history VALUES LESS THAN (TO_DAYS('2026-01-01')),
+    PARTITION p_202601 VALUES LESS THAN (TO_DAYS('2026-02-01')),
+    PARTITION p_202602 VALUES LESS THAN (TO_DAYS('2026-03-01')),
+    PARTITION p_202603 VALUES LESS THAN (TO_DAYS('2026-04-01')),
+    PARTITION p_202604 VALUES LESS THAN (TO_DAYS('2026-05-01')),
+    PARTITION p_202605 VALUES LESS THAN (TO_DAYS('2026-06-01')),
+    PARTITION p_202606 VALUES LESS THAN (TO_DAYS('2026-07-01')),
+    PARTITION p_202607 VALUES LESS THAN (TO_DAYS('2026-08-01')),
+    PARTITION p_202608 VALUES LESS THAN (TO_DAYS('2026-09-01')),
+    PARTITION p_202609 VALUES LESS THAN (TO_DAYS('2026-10-01')),
+    PARTITION p_202610 VALUES LESS THAN (TO_DAYS('2026-11-01')),
+    PARTITION p_202611 VALUES LESS THAN (TO_DAYS('2026-12-01')),
+    PARTITION p_202612 VALUES LESS THAN (TO_DAYS('2027-01-01')),
+    PARTITION p_202701 VALUES LESS THAN (TO_DAYS('2027-02-01')),
+    PARTITION p_202702 VALUES LESS THAN (TO_DAYS('2027-03-01')),
+    PARTITION p_202703 VALUES LESS THAN (TO_DAYS('2027-04-01')),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+-- Per-day counts by table and operation for the admin screens
+CREATE TABLE IF NOT EXISTS activity_log_daily (
+    day DATE NOT NULL,
+    table_name VARCHAR(50) NOT NULL,
+    operation_type VARCHAR(20) NOT NULL,
+    log_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, table_name, operation_type)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Backfill every finished day; today is counted live until the next rollup
+INSERT INTO activity_log_daily (day, table_name, operation_type, log_count)
+SELECT DATE(timestamp), table_name, operation_type, COUNT(*)
+FROM activity_logs
+WHERE timestamp < CURDATE()
+GROUP BY DATE(timestamp), table_name, operation_type;
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
@@ -0,0 +1,17 @@
+-- =====================================================
+-- SQL Migration Script for Admin Dashboard Stats Indexes
+-- HireMe Platform - Admin Dashboard
+-- =====================================================
+
+-- "New today" counters and registration trends filter on timestamp ranges
+-- (created_at >= today), which these indexes serve directly.
+
+CREATE INDEX ix_users_created_at
+    ON users (created_at);
+
+CREATE INDEX ix_job_applications_applied_at
+    ON job_applications (applied_at);
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
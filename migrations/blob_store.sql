@@ -0,0 +1,33 @@
+-- =====================================================
+-- SQL Migration Script for the Upload Blob Store
+-- HireMe Platform - File Storage
+-- =====================================================
+
+-- Uploaded files move out of the rows into a content-addressed store on
+-- disk (BLOB_STORE_DIR, instance/blobs by default). Rows keep the SHA-256
+-- of the file. After applying this script run
+--   flask blobs migrate    -- copies existing bytes out and clears the row columns
+-- and schedule
+--   flask blobs gc         -- removes files no row refers to any more
+-- The old BLOB columns stay for rows written before the upgrade.
+
+ALTER TABLE candidate_profiles
+    ADD COLUMN cv_sha256 CHAR(64) NULL AFTER cv_content;
+
+ALTER TABLE companies
+    ADD COLUMN logo_sha256 CHAR(64) NULL AFTER logo;
+
+ALTER TABLE interviewer_profiles
+    ADD COLUMN cv_sha256 CHAR(64) NULL AFTER cv_content,
+    ADD COLUMN experience_proof_sha256 CHAR(64) NULL AFTER experience_proof_content;
+
+ALTER TABLE interviewer_certifications
+    ADD COLUMN certificate_sha256 CHAR(64) NULL AFTER certificate_content;
+
+ALTER TABLE interviewer_applications
+    ADD COLUMN cv_sha256 CHAR(64) NULL AFTER cv_content,
+    ADD COLUMN experience_proof_sha256 CHAR(64) NULL AFTER experience_proof_content;
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
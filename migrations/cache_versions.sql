@@ -0,0 +1,19 @@
+-- =====================================================
+-- SQL Migration Script for Cache Version Counters
+-- HireMe Platform - Skill Catalog
+-- =====================================================
+
+-- Every process keeps the skill catalog in memory and reloads it when the
+-- 'skills' counter moves. Writes to skills bump it in the same transaction.
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO cache_versions (name, version) VALUES ('skills', 1);
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
@@ -0,0 +1,29 @@
+-- =====================================================
+-- SQL Migration Script for Precomputed Match Scores
+-- HireMe Platform - Candidate/Job Match Table
+-- =====================================================
+
+-- Stores calculate_job_match_score results so recommendation pages
+-- become indexed lookups. Fill it afterwards with:
+--   flask matches backfill
+
+CREATE TABLE IF NOT EXISTS candidate_job_matches (
+    candidate_id INT NOT NULL,
+    job_id INT NOT NULL,
+    match_score INT NOT NULL DEFAULT 0,
+    computed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (candidate_id, job_id),
+    FOREIGN KEY (candidate_id) REFERENCES candidate_profiles(id) ON DELETE CASCADE,
+    FOREIGN KEY (job_id) REFERENCES job_postings(id) ON DELETE CASCADE,
+    
+    INDEX ix_candidate_job_matches_candidate_score (candidate_id, match_score),
+    INDEX ix_candidate_job_matches_job_score (job_id, match_score)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Check stored scores against a live recompute with:
+--   flask matches verify
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
@@ -0,0 +1,43 @@
+-- =====================================================
+-- SQL Migration Script for CV Text Extraction
+-- HireMe Platform - Candidate Search
+-- =====================================================
+
+-- Text of uploaded CVs, extracted in the background and stored once per
+-- file (keyed by the blob store SHA-256 that candidate_profiles.cv_sha256
+-- points at). Employers search it through the FULLTEXT index; catalog
+-- skills named in it feed job matching. After applying this script run
+--   flask cv extract    -- extracts the CVs uploaded before the upgrade
+-- (PDFs need the optional pypdf package; DOCX files need nothing extra).
+
+CREATE TABLE IF NOT EXISTS cv_documents (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    sha256 CHAR(64) NOT NULL,
+    status ENUM('pending', 'processing', 'done', 'failed') NOT NULL DEFAULT 'pending',
+    body MEDIUMTEXT,
+    error VARCHAR(255),
+    skills_version BIGINT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    extracted_at DATETIME NULL,
+    
+    UNIQUE KEY uq_cv_documents_sha256 (sha256),
+    FULLTEXT INDEX ft_cv_documents_body (body)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS cv_skill_mentions (
+    document_id INT NOT NULL,
+    skill_id INT NOT NULL,
+    mentions INT NOT NULL DEFAULT 1,
+    
+    PRIMARY KEY (document_id, skill_id),
+    INDEX ix_cv_skill_mentions_skill (skill_id),
+    FOREIGN KEY (document_id) REFERENCES cv_documents(id) ON DELETE CASCADE,
+    FOREIGN KEY (skill_id) REFERENCES skills(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Profiles sharing a CV file are found by its hash
+CREATE INDEX ix_candidate_profiles_cv_sha256 ON candidate_profiles (cv_sha256);
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
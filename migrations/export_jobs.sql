@@ -0,0 +1,29 @@
+-- =====================================================
+-- SQL Migration Script for Background Export Jobs
+-- HireMe Platform - Admin Exports
+-- =====================================================
+
+-- One row per export requested from /admin/exports. The file itself is a
+-- gzip CSV under EXPORT_DIR (instance/exports by default); file_path points at it.
+
+CREATE TABLE IF NOT EXISTS export_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    data_type VARCHAR(50) NOT NULL,
+    status ENUM('queued', 'running', 'completed', 'failed') NOT NULL DEFAULT 'queued',
+    requested_by INT,
+    rows_written INT NOT NULL DEFAULT 0,
+    total_rows INT,
+    file_path VARCHAR(500),
+    file_size BIGINT,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    heartbeat_at DATETIME,
+    finished_at DATETIME,
+    INDEX ix_export_jobs_requested_created (requested_by, created_at),
+    FOREIGN KEY (requested_by) REFERENCES users(id) ON DELETE SET NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
@@ -0,0 +1,43 @@
+-- =====================================================
+-- SQL Migration Script for Job Posting Full-Text Search
+-- HireMe Platform - Search Documents
+-- =====================================================
+
+-- One denormalized row per job posting so browse_jobs can use
+-- MATCH ... AGAINST instead of leading-wildcard LIKE scans.
+
+CREATE TABLE IF NOT EXISTS job_search_documents (
+    job_id INT PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    body TEXT,
+    company_name VARCHAR(255),
+    location VARCHAR(255),
+    indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (job_id) REFERENCES job_postings(id) ON DELETE CASCADE,
+    
+    -- Search box: title, description + requirements, company name
+    FULLTEXT INDEX ft_job_search_text (title, body, company_name),
+    -- Work mode filter: location and description
+    FULLTEXT INDEX ft_job_search_work_mode (location, body)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Backfill existing postings (same as: flask search rebuild)
+INSERT INTO job_search_documents (job_id, title, body, company_name, location)
+SELECT
+    jp.id,
+    jp.title,
+    CONCAT_WS('\n', jp.description, NULLIF(jp.requirements, '')),
+    c.company_name,
+    jp.location
+FROM job_postings jp
+JOIN companies c ON c.id = jp.company_id
+ON DUPLICATE KEY UPDATE
+    title = VALUES(title),
+    body = VALUES(body),
+    company_name = VALUES(company_name),
+    location = VALUES(location);
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
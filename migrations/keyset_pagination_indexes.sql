@@ -0,0 +1,17 @@
+-- =====================================================
+-- SQL Migration Script for Keyset Pagination Indexes
+-- HireMe Platform - Notifications & Activity Logs
+-- =====================================================
+
+-- Listings now seek on (created_at, id) / (timestamp, id) instead of
+-- OFFSET; these indexes let each page start straight at the cursor.
+
+CREATE INDEX ix_notifications_user_created
+    ON notifications (user_id, created_at, id);
+
+CREATE INDEX ix_activity_logs_timestamp_id
+    ON activity_logs (timestamp, id);
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
@@ -0,0 +1,18 @@
+-- =====================================================
+-- SQL Migration Script for Company Logo Thumbnails
+-- HireMe Platform - File Storage
+-- =====================================================
+
+-- Job listings show a small copy of each company logo, made when the logo
+-- is uploaded and kept in the blob store next to the original. Listings
+-- link to it by hash, so serving it needs no database read and browsers
+-- may cache it indefinitely. After applying this script run
+--   flask blobs thumbnails  -- makes thumbnails for logos uploaded before
+-- (needs Pillow from requirements.txt; without it listings keep showing the original file).
+
+ALTER TABLE companies
+    ADD COLUMN logo_thumb_sha256 CHAR(64) NULL AFTER logo_sha256;
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
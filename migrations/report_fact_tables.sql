@@ -0,0 +1,56 @@
+-- =====================================================
+-- SQL Migration Script for Daily Report Fact Tables
+-- HireMe Platform - Admin Reports
+-- =====================================================
+
+-- /admin/reports reads these per-day tables instead of grouping the raw
+-- tables on every visit. Keep them current with
+--   flask reports rollup          -- every few minutes (touched days only)
+--   flask reports rollup --full   -- nightly (also catches deletions)
+
+CREATE TABLE IF NOT EXISTS report_daily_registrations (
+    day DATE NOT NULL,
+    user_type VARCHAR(20) NOT NULL,
+    user_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, user_type)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS report_daily_applications (
+    day DATE NOT NULL,
+    application_status VARCHAR(50) NOT NULL,
+    application_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, application_status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS report_daily_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    day DATE NOT NULL,
+    company_id INT NOT NULL,
+    job_type VARCHAR(50),
+    location VARCHAR(255),
+    job_count INT NOT NULL DEFAULT 0,
+    INDEX ix_report_daily_jobs_day (day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS report_daily_skill_demand (
+    day DATE NOT NULL,
+    skill_id INT NOT NULL,
+    demand_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, skill_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS report_rollup_state (
+    name VARCHAR(50) PRIMARY KEY,
+    rolled_at DATETIME NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Incremental rollups find changed rows through updated_at
+CREATE INDEX ix_job_applications_updated_at
+    ON job_applications (updated_at);
+
+CREATE INDEX ix_job_postings_updated_at
+    ON job_postings (updated_at);
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
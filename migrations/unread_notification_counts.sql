@@ -0,0 +1,22 @@
+-- =====================================================
+-- SQL Migration Script for Unread Notification Counters
+-- HireMe Platform - Notifications
+-- =====================================================
+
+-- The navbar badge reads users.unread_notification_count instead of
+-- counting unread notifications on every render. The application keeps
+-- it in step; `flask notifications reconcile` repairs any drift.
+
+ALTER TABLE users
+    ADD COLUMN unread_notification_count INT NOT NULL DEFAULT 0;
+
+-- Backfill from the existing notifications
+UPDATE users u
+    SET u.unread_notification_count = (
+        SELECT COUNT(*) FROM notifications n
+        WHERE n.user_id = u.id AND n.is_read = FALSE
+    );
+
+-- =====================================================
+-- END OF MIGRATION SCRIPT
+-- =====================================================
@@ -2,10 +2,19 @@ from .user import User
 from .company import Company
 from .candidate import CandidateProfile
 from .job import JobPosting, JobApplication, JobRequiredSkill
+from .match import CandidateJobMatch
+from .search import JobSearchDocument
+from .cv import CvDocument, CvSkillMention
+from .export import ExportJob
+from .cache import CacheVersion
 from .exam import MCQExam, MCQQuestion, ExamAttempt, CandidateAnswer
 from .skill import Skill, CandidateSkill
 from .notification import Notification
-from .activity import ActivityLog, ApplicationStatusHistory
+from .activity import ActivityLog, ActivityLogDaily, ApplicationStatusHistory
+from .report import (
+    ReportDailyRegistrations, ReportDailyApplications, ReportDailyJobs,
+    ReportDailySkillDemand, ReportRollupState
+)
 from .interview import InterviewRoom, InterviewParticipant, InterviewFeedback, CodeSession, InterviewerRecommendation
 from .interviewer import (
     InterviewerProfile, InterviewerSkill, InterviewerIndustry, InterviewerCertification,
@@ -20,6 +29,12 @@ __all__ = [
     'JobPosting',
     'JobApplication',
     'JobRequiredSkill',
+    'CandidateJobMatch',
+    'JobSearchDocument',
+    'CvDocument',
+    'CvSkillMention',
+    'ExportJob',
+    'CacheVersion',
     'MCQExam',
     'MCQQuestion',
     'ExamAttempt',
@@ -28,6 +43,12 @@ __all__ = [
     'CandidateSkill',
     'Notification',
     'ActivityLog',
+    'ActivityLogDaily',
+    'ReportDailyRegistrations',
+    'ReportDailyApplications',
+    'ReportDailyJobs',
+    'ReportDailySkillDemand',
+    'ReportRollupState',
     'ApplicationStatusHistory',
     'InterviewRoom',
     'InterviewParticipant',
@@ -12,6 +12,25 @@ class ActivityLog(db.Model):
     new_values = db.Column(db.Text) # JSON string
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Keyset pagination of the admin activity log, newest first
+        db.Index('ix_activity_logs_timestamp_id', 'timestamp', 'id'),
+        # Same, filtered by table / operation / user
+        db.Index('ix_activity_logs_table_timestamp', 'table_name', 'timestamp', 'id'),
+        db.Index('ix_activity_logs_operation_timestamp', 'operation_type', 'timestamp', 'id'),
+        db.Index('ix_activity_logs_user_timestamp', 'user_id', 'timestamp'),
+    )
+
+
+class ActivityLogDaily(db.Model):
+    """activity_logs counts per day, table and operation (kept by the rollup job)"""
+    __tablename__ = 'activity_log_daily'
+    
+    day = db.Column(db.Date, primary_key=True)
+    table_name = db.Column(db.String(50), primary_key=True)
+    operation_type = db.Column(db.String(20), primary_key=True)
+    log_count = db.Column(db.Integer, nullable=False, default=0)
 
 
 class ApplicationStatusHistory(db.Model):
@@ -0,0 +1,13 @@
+from extensions import db
+from datetime import datetime
+
+class CacheVersion(db.Model):
+    """Counter bumped in the same transaction as writes to a cached table.
+
+    Each process compares it with the version of its in-memory copy, so
+    every worker sees a change as soon as it is committed.
+    """
+    __tablename__ = 'cache_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -11,7 +11,9 @@ class CandidateProfile(db.Model):
     location = db.Column(db.String(255))
     salary_expectation = db.Column(db.Numeric(10, 2))
     cv_file_path = db.Column(db.String(500))
-    cv_content = db.Column(db.LargeBinary)
+    # Legacy file bytes (new uploads go to the blob store); only download endpoints load them
+    cv_content = db.deferred(db.Column(db.LargeBinary), group='file_content')
+    cv_sha256 = db.Column(db.String(64), index=True)  # blob store key, also the CvDocument key
     cv_filename = db.Column(db.String(255))
     cv_mimetype = db.Column(db.String(100))
     summary = db.Column(db.Text)
@@ -19,3 +21,8 @@ class CandidateProfile(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     applications = db.relationship('JobApplication', backref='candidate', lazy=True)
+    
+    @property
+    def has_cv(self):
+        """Whether a CV was uploaded, without loading its bytes"""
+        return bool(self.cv_sha256 or self.cv_filename)
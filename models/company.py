@@ -11,9 +11,22 @@ class Company(db.Model):
     location = db.Column(db.String(255))
     description = db.Column(db.Text)
     website = db.Column(db.String(255))
-    logo = db.Column(db.LargeBinary)
+    # Legacy file bytes (new uploads go to the blob store); only the logo endpoints load them
+    logo = db.deferred(db.Column(db.LargeBinary), group='file_content')
+    logo_sha256 = db.Column(db.String(64))  # blob store key
+    logo_thumb_sha256 = db.Column(db.String(64))  # listing-size copy made at upload
     logo_filename = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     job_postings = db.relationship('JobPosting', backref='company', lazy=True)
+    
+    @property
+    def has_logo(self):
+        """Whether a logo was uploaded, without loading its bytes"""
+        return bool(self.logo_sha256 or self.logo_filename)
+    
+    @property
+    def logo_thumb_key(self):
+        """Blob store key of the logo to show in listings (the original if no thumbnail was made)"""
+        return self.logo_thumb_sha256 or self.logo_sha256
 
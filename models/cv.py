@@ -0,0 +1,62 @@
+from extensions import db
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects import mysql
+from datetime import datetime
+
+class CvDocument(db.Model):
+    """Text extracted from an uploaded CV, keyed by the file's SHA-256.
+
+    Profiles point at it through their ``cv_sha256``, so a file is parsed
+    once however many profiles share it. Searched like JobSearchDocument:
+    a FULLTEXT index on MySQL, an external-content FTS5 table on SQLite.
+    """
+    __tablename__ = 'cv_documents'
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    status = db.Column(db.Enum('pending', 'processing', 'done', 'failed'), default='pending', nullable=False)
+    body = db.Column(db.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'))
+    error = db.Column(db.String(255))
+    # Skill catalog version the mentions were matched against
+    skills_version = db.Column(db.BigInteger)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    extracted_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ft_cv_documents_body', 'body', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+
+
+class CvSkillMention(db.Model):
+    """A catalog skill named in a CV's text"""
+    __tablename__ = 'cv_skill_mentions'
+    document_id = db.Column(db.Integer, db.ForeignKey('cv_documents.id', ondelete='CASCADE'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True)
+    mentions = db.Column(db.Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        db.Index('ix_cv_skill_mentions_skill', 'skill_id'),
+    )
+
+
+# --- SQLite FTS5 FALLBACK ---
+
+for _statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cv_documents_fts USING fts5("
+    "body, content='cv_documents', content_rowid='id')",
+
+    "CREATE TRIGGER IF NOT EXISTS cv_documents_ai AFTER INSERT ON cv_documents BEGIN "
+    "INSERT INTO cv_documents_fts(rowid, body) VALUES (new.id, new.body); END",
+
+    "CREATE TRIGGER IF NOT EXISTS cv_documents_ad AFTER DELETE ON cv_documents BEGIN "
+    "INSERT INTO cv_documents_fts(cv_documents_fts, rowid, body) VALUES ('delete', old.id, old.body); END",
+
+    "CREATE TRIGGER IF NOT EXISTS cv_documents_au AFTER UPDATE OF body ON cv_documents BEGIN "
+    "INSERT INTO cv_documents_fts(cv_documents_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "INSERT INTO cv_documents_fts(rowid, body) VALUES (new.id, new.body); END",
+):
+    event.listen(CvDocument.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+event.listen(
+    CvDocument.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS cv_documents_fts').execute_if(dialect='sqlite')
+)
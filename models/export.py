@@ -0,0 +1,47 @@
+from extensions import db
+from datetime import datetime
+
+class ExportJob(db.Model):
+    """Background admin export and the gzip CSV it produced"""
+    __tablename__ = 'export_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    data_type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.Enum('queued', 'running', 'completed', 'failed'), nullable=False, default='queued')
+    requested_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    rows_written = db.Column(db.Integer, nullable=False, default=0)
+    total_rows = db.Column(db.Integer)
+    file_path = db.Column(db.String(500))
+    file_size = db.Column(db.BigInteger)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    # Bumped with every progress update; a running job that stops beating is reported failed
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.Index('ix_export_jobs_requested_created', 'requested_by', 'created_at'),
+    )
+    
+    @property
+    def progress(self):
+        """Percent done, or None while the total is unknown"""
+        if self.status == 'completed':
+            return 100
+        if not self.total_rows:
+            return None
+        return min(99, int(self.rows_written * 100 / self.total_rows))
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'data_type': self.data_type,
+            'status': self.status,
+            'rows_written': self.rows_written,
+            'total_rows': self.total_rows,
+            'progress': self.progress,
+            'file_size': self.file_size,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -17,13 +17,16 @@ class InterviewerProfile(db.Model):
     
     # CV/Resume
     cv_file_path = db.Column(db.String(500))
-    cv_content = db.Column(db.LargeBinary)
+    # Legacy file bytes (new uploads go to the blob store); only download endpoints load them
+    cv_content = db.deferred(db.Column(db.LargeBinary), group='file_content')
+    cv_sha256 = db.Column(db.String(64))  # blob store key
     cv_filename = db.Column(db.String(255))
     cv_mimetype = db.Column(db.String(100))
     
     # Experience Proof Document
     experience_proof_path = db.Column(db.String(500))
-    experience_proof_content = db.Column(db.LargeBinary)
+    experience_proof_content = db.deferred(db.Column(db.LargeBinary), group='file_content')
+    experience_proof_sha256 = db.Column(db.String(64))
     experience_proof_filename = db.Column(db.String(255))
     experience_proof_mimetype = db.Column(db.String(100))
     
@@ -127,7 +130,9 @@ class InterviewerCertification(db.Model):
     
     # Certificate file
     certificate_file_path = db.Column(db.String(500))
-    certificate_content = db.Column(db.LargeBinary)
+    # Legacy file bytes (new uploads go to the blob store); only download endpoints load them
+    certificate_content = db.deferred(db.Column(db.LargeBinary), group='file_content')
+    certificate_sha256 = db.Column(db.String(64))  # blob store key
     certificate_filename = db.Column(db.String(255))
     certificate_mimetype = db.Column(db.String(100))
     
@@ -232,11 +237,14 @@ class InterviewerApplication(db.Model):
     industries_json = db.Column(db.Text)  # JSON array of industries
     
     # Documents
-    cv_content = db.Column(db.LargeBinary)
+    # Legacy file bytes (new uploads go to the blob store); only download endpoints load them
+    cv_content = db.deferred(db.Column(db.LargeBinary), group='file_content')
+    cv_sha256 = db.Column(db.String(64))  # blob store key
     cv_filename = db.Column(db.String(255))
     cv_mimetype = db.Column(db.String(100))
     
-    experience_proof_content = db.Column(db.LargeBinary)
+    experience_proof_content = db.deferred(db.Column(db.LargeBinary), group='file_content')
+    experience_proof_sha256 = db.Column(db.String(64))
     experience_proof_filename = db.Column(db.String(255))
     experience_proof_mimetype = db.Column(db.String(100))
     
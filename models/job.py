@@ -16,7 +16,7 @@ class JobPosting(db.Model):
     application_deadline = db.Column(db.Date)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     applications = db.relationship('JobApplication', backref='job', lazy=True)
 
@@ -28,8 +28,8 @@ class JobApplication(db.Model):
     cover_letter = db.Column(db.Text)
     application_status = db.Column(db.Enum('applied', 'under_review', 'shortlisted', 'interview_scheduled', 'rejected', 'hired'), default='applied')
     exam_score = db.Column(db.Numeric(5, 2))
-    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 class JobRequiredSkill(db.Model):
     __tablename__ = 'job_required_skills'
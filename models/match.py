@@ -0,0 +1,15 @@
+from extensions import db
+from datetime import datetime
+
+class CandidateJobMatch(db.Model):
+    """Precomputed calculate_job_match_score result for a candidate/job pair"""
+    __tablename__ = 'candidate_job_matches'
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), primary_key=True)
+    match_score = db.Column(db.Integer, nullable=False, default=0)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_candidate_job_matches_candidate_score', 'candidate_id', 'match_score'),
+        db.Index('ix_candidate_job_matches_job_score', 'job_id', 'match_score'),
+    )
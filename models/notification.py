@@ -11,3 +11,8 @@ class Notification(db.Model):
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     action_url = db.Column(db.String(500))
+    
+    __table_args__ = (
+        # Keyset pagination of a user's notifications, newest first
+        db.Index('ix_notifications_user_created', 'user_id', 'created_at', 'id'),
+    )
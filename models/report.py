@@ -0,0 +1,45 @@
+from extensions import db
+
+# Daily fact tables behind /admin/reports, kept by services.report_service.
+# Each row counts the events of one day; reports SUM over a day range.
+
+class ReportDailyRegistrations(db.Model):
+    """New users per day and user type"""
+    __tablename__ = 'report_daily_registrations'
+    day = db.Column(db.Date, primary_key=True)
+    user_type = db.Column(db.String(20), primary_key=True)
+    user_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ReportDailyApplications(db.Model):
+    """Applications per day applied and current status"""
+    __tablename__ = 'report_daily_applications'
+    day = db.Column(db.Date, primary_key=True)
+    application_status = db.Column(db.String(50), primary_key=True)
+    application_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ReportDailyJobs(db.Model):
+    """Job postings per day posted, company, type and location"""
+    __tablename__ = 'report_daily_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    company_id = db.Column(db.Integer, nullable=False)
+    job_type = db.Column(db.String(50))
+    location = db.Column(db.String(255))
+    job_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ReportDailySkillDemand(db.Model):
+    """Required-skill mentions per day the job was posted"""
+    __tablename__ = 'report_daily_skill_demand'
+    day = db.Column(db.Date, primary_key=True)
+    skill_id = db.Column(db.Integer, primary_key=True)
+    demand_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ReportRollupState(db.Model):
+    """When each rollup last ran, so the next run only redoes touched days"""
+    __tablename__ = 'report_rollup_state'
+    name = db.Column(db.String(50), primary_key=True)
+    rolled_at = db.Column(db.DateTime, nullable=False)
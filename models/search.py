@@ -0,0 +1,52 @@
+from extensions import db
+from sqlalchemy import DDL, event
+from datetime import datetime
+
+class JobSearchDocument(db.Model):
+    """Denormalized searchable text of a job posting.
+
+    MySQL serves it with FULLTEXT indexes (MATCH ... AGAINST); on SQLite an
+    external-content FTS5 table kept in sync by triggers is created alongside.
+    """
+    __tablename__ = 'job_search_documents'
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), primary_key=True)
+    title = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text)
+    company_name = db.Column(db.String(255))
+    location = db.Column(db.String(255))
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ft_job_search_text', 'title', 'body', 'company_name', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        db.Index('ft_job_search_work_mode', 'location', 'body', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+
+
+# --- SQLite FTS5 FALLBACK ---
+
+_FTS_COLUMNS = 'title, body, company_name, location'
+
+for _statement in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS job_search_fts USING fts5("
+    f"{_FTS_COLUMNS}, content='job_search_documents', content_rowid='job_id')",
+    
+    f"CREATE TRIGGER IF NOT EXISTS job_search_documents_ai AFTER INSERT ON job_search_documents BEGIN "
+    f"INSERT INTO job_search_fts(rowid, {_FTS_COLUMNS}) "
+    f"VALUES (new.job_id, new.title, new.body, new.company_name, new.location); END",
+    
+    f"CREATE TRIGGER IF NOT EXISTS job_search_documents_ad AFTER DELETE ON job_search_documents BEGIN "
+    f"INSERT INTO job_search_fts(job_search_fts, rowid, {_FTS_COLUMNS}) "
+    f"VALUES ('delete', old.job_id, old.title, old.body, old.company_name, old.location); END",
+    
+    f"CREATE TRIGGER IF NOT EXISTS job_search_documents_au AFTER UPDATE ON job_search_documents BEGIN "
+    f"INSERT INTO job_search_fts(job_search_fts, rowid, {_FTS_COLUMNS}) "
+    f"VALUES ('delete', old.job_id, old.title, old.body, old.company_name, old.location); "
+    f"INSERT INTO job_search_fts(rowid, {_FTS_COLUMNS}) "
+    f"VALUES (new.job_id, new.title, new.body, new.company_name, new.location); END",
+):
+    event.listen(JobSearchDocument.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+event.listen(
+    JobSearchDocument.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS job_search_fts').execute_if(dialect='sqlite')
+)
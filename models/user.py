@@ -10,10 +10,12 @@ class User(db.Model):
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     last_login = db.Column(db.DateTime)
+    # Kept in step with unread notifications by services.notification_service
+    unread_notification_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     candidate_profile = db.relationship('CandidateProfile', backref='user', uselist=False)
     company = db.relationship('Company', backref='user', uselist=False)
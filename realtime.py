@@ -4,14 +4,28 @@ from datetime import datetime
 from extensions import db, socketio
 from models import User, InterviewParticipant
 from collections import defaultdict
+import threading
 
 # Track interview participants
 INTERVIEW_PARTICIPANTS = defaultdict(dict)  # room_id -> { sid: user_info }
 SID_TO_INTERVIEW_ROOM = {}  # sid -> room_id
 
+# Notifications waiting for the next push window
+PENDING_NOTIFICATIONS = defaultdict(list)  # user_id -> [notification payloads]
+_push_lock = threading.Lock()
+_push_scheduled = False
+
+def user_room(user_id):
+    """Socket.IO room every connection of a logged-in user joins"""
+    return f'user:{user_id}'
+
 @socketio.on('connect')
 def on_connect():
     print(f'Client connected: {request.sid}')
+    
+    # Personal channel for notification pushes
+    if 'user_id' in session:
+        join_room(user_room(session['user_id']))
 
 @socketio.on('join_interview')
 def on_join_interview(data):
@@ -201,3 +215,44 @@ def on_code_change(data):
             'language': data.get('language', 'javascript'),
             'from': request.sid
         }, room=room_id, include_self=False)
+
+# ===================== Notification Push =====================
+
+def push_notifications(app, notifications):
+    """Queue ``(user_id, payload)`` pairs for delivery to the users' rooms.
+
+    Everything queued within NOTIFICATION_PUSH_WINDOW seconds goes out as one
+    ``notifications`` event per user, together with their unread count.
+    """
+    global _push_scheduled
+    with _push_lock:
+        for user_id, payload in notifications:
+            PENDING_NOTIFICATIONS[user_id].append(payload)
+        if _push_scheduled or not PENDING_NOTIFICATIONS:
+            return
+        _push_scheduled = True
+    socketio.start_background_task(_deliver_notifications, app)
+
+def _deliver_notifications(app):
+    global _push_scheduled
+    socketio.sleep(app.config.get('NOTIFICATION_PUSH_WINDOW', 0.5))
+    
+    with _push_lock:
+        pending = dict(PENDING_NOTIFICATIONS)
+        PENDING_NOTIFICATIONS.clear()
+        _push_scheduled = False
+    
+    limit = app.config.get('NOTIFICATION_PUSH_LIMIT', 20)
+    with app.app_context():
+        try:
+            unread_counts = dict(db.session.query(User.id, User.unread_notification_count).filter(
+                User.id.in_(list(pending))
+            ))
+            for user_id, payloads in pending.items():
+                socketio.emit('notifications', {
+                    'notifications': payloads[-limit:],
+                    'total': len(payloads),
+                    'unread_count': unread_counts.get(user_id, 0)
+                }, to=user_room(user_id))
+        except Exception as e:
+            print(f'Error pushing notifications: {e}')
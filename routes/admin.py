@@ -5,14 +5,31 @@ from models import (
     Company, Skill, CandidateSkill, JobRequiredSkill, CandidateProfile,
     InterviewRoom, InterviewParticipant, InterviewFeedback, InterviewerRecommendation,
     InterviewerApplication, InterviewerProfile, InterviewerSkill, InterviewerIndustry,
-    InterviewerCertification, InterviewerJobRole
+    InterviewerCertification, InterviewerJobRole, ExportJob
 )
 from datetime import datetime, timedelta
-from io import BytesIO
-from sqlalchemy import func, text, and_, or_
+from sqlalchemy import func, text, and_, or_, select
+from sqlalchemy.orm import undefer_group
+from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.security import generate_password_hash
+from services.notification_service import log_activity
+from services.activity_log_service import activity_counts, activity_log_tables
+from services.admin_stats_service import get_dashboard_stats, invalidate_dashboard_stats
+from services.report_service import (
+    user_growth_report, job_statistics_report, daily_applications_report,
+    status_distribution_report, skill_demand_report
+)
+from services.skill_import_service import import_skills_csv
+from services.skill_catalog_service import get_skill_catalog
+from services.blob_store_service import send_stored_file, copy_stored_file
+from services.export_service import (
+    EXPORTS, export_rows, export_timestamp, start_export, expire_stale_exports, delete_export
+)
+from utils.pagination import keyset_paginate, offset_paginate
+from utils.csv_export import stream_csv
 import csv
 import json
+import os
 
 bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -22,38 +39,13 @@ def admin_dashboard():
     if 'user_id' not in session or session['user_type'] != 'admin':
         return redirect(url_for('auth.login'))
     
-    # System statistics
-    stats = {
-        'total_users': User.query.count(),
-        'total_candidates': User.query.filter_by(user_type='candidate').count(),
-        'candidates': User.query.filter_by(user_type='candidate').count(),
-        'total_employers': User.query.filter_by(user_type='employer').count(),
-        'employers': User.query.filter_by(user_type='employer').count(),
-        'total_interviewers': User.query.filter_by(user_type='interviewer').count(),
-        'interviewers': User.query.filter_by(user_type='interviewer').count(),
-        'pending_interviewer_apps': InterviewerApplication.query.filter_by(status='pending').count(),
-        'total_jobs': JobPosting.query.count(),
-        'active_jobs': JobPosting.query.filter_by(is_active=True).count(),
-        'total_applications': JobApplication.query.count(),
-        'total_skills': Skill.query.count(),
-        'total_companies': Company.query.count(),
-        'new_users_today': User.query.filter(func.date(User.created_at) == func.date(datetime.now())).count(),
-        'new_applications_today': JobApplication.query.filter(func.date(JobApplication.applied_at) == func.date(datetime.now())).count()
-    }
+    # System statistics, cached and optionally kept warm in the background
+    stats, daily_registrations = get_dashboard_stats()
     
-    # Recent activity
+    # Recent activity (the dashboard shows five)
     recent_activities = ActivityLog.query.order_by(
-        ActivityLog.timestamp.desc()
-    ).limit(20).all()
-    
-    # User registration trends (last 30 days)
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    daily_registrations = db.session.query(
-        func.date(User.created_at).label('date'),
-        func.count(User.id).label('count')
-    ).filter(
-        User.created_at >= thirty_days_ago
-    ).group_by(func.date(User.created_at)).all()
+        ActivityLog.timestamp.desc(), ActivityLog.id.desc()
+    ).limit(5).all()
     
     return render_template('admin/admin_dashboard.html',
                          stats=stats,
@@ -118,6 +110,7 @@ def admin_skills():
                 )
                 db.session.add(new_skill)
                 db.session.commit()
+                invalidate_dashboard_stats()
                 
                 log_activity('skills', 'INSERT', new_skill.id,
                            new_values={'skill_name': skill_name, 'category': category},
@@ -127,36 +120,22 @@ def admin_skills():
         
         elif action == 'bulk_import':
             # Handle CSV upload for bulk skill import
-            if 'csv_file' in request.files:
-                file = request.files['csv_file']
-                if file and file.filename.endswith('.csv'):
-                    try:
-                        # Process CSV file
-                        csv_data = file.read().decode('utf-8')
-                        csv_reader = csv.DictReader(csv_data.splitlines())
-                        
-                        added_count = 0
-                        for row in csv_reader:
-                            if 'skill_name' in row and row['skill_name']:
-                                existing = Skill.query.filter_by(
-                                    skill_name=row['skill_name']
-                                ).first()
-                                
-                                if not existing:
-                                    new_skill = Skill(
-                                        skill_name=row['skill_name'],
-                                        category=row.get('category', 'General'),
-                                        description=row.get('description', '')
-                                    )
-                                    db.session.add(new_skill)
-                                    added_count += 1
-                        
-                        db.session.commit()
-                        flash(f'Successfully imported {added_count} skills', 'success')
-                        
-                    except Exception as e:
-                        db.session.rollback()
-                        flash(f'Error importing skills: {str(e)}', 'error')
+            file = request.files.get('csv_file')
+            if not file or not file.filename.endswith('.csv'):
+                flash('Please upload a .csv file', 'error')
+            else:
+                try:
+                    report = import_skills_csv(file.stream)
+                    invalidate_dashboard_stats()
+                    
+                    flash(f'Imported {report.added} skills, skipped {report.skipped} duplicates, '
+                          f'{report.invalid} invalid rows', 'success' if not report.invalid else 'warning')
+                    for line, message in report.errors[:5]:
+                        flash(f'Line {line}: {message}', 'warning')
+                    
+                except (ValueError, UnicodeDecodeError, csv.Error, SQLAlchemyError) as e:
+                    db.session.rollback()
+                    flash(f'Error importing skills: {str(e)}', 'error')
     
     # Get skills with pagination
     page = request.args.get('page', 1, type=int)
@@ -171,8 +150,7 @@ def admin_skills():
     )
     
     # Get unique categories
-    categories = db.session.query(Skill.category).distinct().all()
-    categories = [cat[0] for cat in categories if cat[0]]
+    categories = [category for category in get_skill_catalog().by_category if category]
     
     return render_template('admin/admin_skills.html',
                          skills=skills,
@@ -187,11 +165,12 @@ def admin_activity_logs():
     
     from datetime import datetime
     
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     table_filter = request.args.get('table', '')
     operation_filter = request.args.get('operation', '')
     date_from = request.args.get('date_from', '')
     date_to = request.args.get('date_to', '')
+    from_day = to_day = None
     
     query = ActivityLog.query
     
@@ -205,6 +184,7 @@ def admin_activity_logs():
         try:
             from_date = datetime.strptime(date_from, '%Y-%m-%d')
             query = query.filter(ActivityLog.timestamp >= from_date)
+            from_day = from_date.date()
         except ValueError:
             pass
     
@@ -214,21 +194,31 @@ def admin_activity_logs():
             # Add 1 day to include the entire end date
             to_date = to_date.replace(hour=23, minute=59, second=59)
             query = query.filter(ActivityLog.timestamp <= to_date)
+            to_day = to_date.date()
         except ValueError:
             pass
     
-    logs = query.order_by(ActivityLog.timestamp.desc()).paginate(
-        page=page, per_page=50, error_out=False
-    )
+    # Seek on (timestamp, id) so deep pages cost the same as the first
+    logs = keyset_paginate(query, (ActivityLog.timestamp, ActivityLog.id),
+                           cursor=cursor, per_page=50)
+    
+    # Totals come from the daily rollups, not a scan of the raw logs
+    logs.total = sum(activity_counts(from_day, to_day, table_filter or None,
+                                     operation_filter or None, retained_only=True).values())
+    today = activity_counts(date_from=datetime.utcnow().date())
+    today_stats = {
+        'new_users': today[('users', 'INSERT')],
+        'applications': today[('job_applications', 'INSERT')],
+    }
     
     # Get unique table names and operations
-    tables = db.session.query(ActivityLog.table_name).distinct().all()
-    tables = [table[0] for table in tables if table[0]]
+    tables = activity_log_tables()
     
     operations = ['INSERT', 'UPDATE', 'DELETE', 'DOWNLOAD_CV']
     
     return render_template('admin/admin_activity_logs.html',
                          logs=logs,
+                         today_stats=today_stats,
                          tables=tables,
                          operations=operations,
                          table_filter=table_filter,
@@ -242,90 +232,25 @@ def admin_reports():
     if 'user_id' not in session or session['user_type'] != 'admin':
         return redirect(url_for('auth.login'))
     
-    # Generate various reports
-    reports = {
-        'user_growth': get_user_growth_report(),
-        'job_statistics': get_job_statistics_report(),
-        'application_trends': get_application_trends_report(),
-        'skill_demand': get_skill_demand_report()
-    }
-    
-    return render_template('admin/admin_reports.html', reports=reports)
-
-# --- REPORT GENERATION FUNCTIONS ---
-
-def get_user_growth_report():
-    """Generate user growth report"""
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    
-    growth_data = db.session.query(
-        func.date(User.created_at).label('date'),
-        User.user_type,
-        func.count(User.id).label('count')
-    ).filter(
-        User.created_at >= thirty_days_ago
-    ).group_by(
-        func.date(User.created_at), User.user_type
-    ).order_by(func.date(User.created_at)).all()
-    
-    return growth_data
-
-def get_job_statistics_report():
-    """Generate job statistics report"""
-    stats = {
-        'by_type': db.session.query(
-            JobPosting.job_type,
-            func.count(JobPosting.id)
-        ).group_by(JobPosting.job_type).all(),
-        
-        'by_location': db.session.query(
-            JobPosting.location,
-            func.count(JobPosting.id)
-        ).group_by(JobPosting.location).order_by(
-            func.count(JobPosting.id).desc()
-        ).limit(10).all(),
-        
-        'by_company': db.session.query(
-            Company.company_name,
-            func.count(JobPosting.id)
-        ).join(JobPosting).group_by(Company.id).order_by(
-            func.count(JobPosting.id).desc()
-        ).limit(10).all()
-    }
-    
-    return stats
-
-def get_application_trends_report():
-    """Generate application trends report"""
-    thirty_days_ago = datetime.now() - timedelta(days=30)
+    # ?days=N limits every report to the last N days; by default the trends
+    # cover 30 days and the distributions all time
+    days = request.args.get('days', type=int)
+    today = datetime.utcnow().date()
+    trend_from = today - timedelta(days=days or 30)
+    range_from = today - timedelta(days=days) if days else None
     
-    trends = {
-        'daily_applications': db.session.query(
-            func.date(JobApplication.applied_at).label('date'),
-            func.count(JobApplication.id).label('count')
-        ).filter(
-            JobApplication.applied_at >= thirty_days_ago
-        ).group_by(func.date(JobApplication.applied_at)).all(),
-        
-        'status_distribution': db.session.query(
-            JobApplication.application_status,
-            func.count(JobApplication.id)
-        ).group_by(JobApplication.application_status).all()
+    # Generate various reports from the daily fact tables
+    reports = {
+        'user_growth': user_growth_report(trend_from),
+        'job_statistics': job_statistics_report(range_from),
+        'application_trends': {
+            'daily_applications': daily_applications_report(trend_from),
+            'status_distribution': status_distribution_report(range_from)
+        },
+        'skill_demand': skill_demand_report(range_from)
     }
     
-    return trends
-
-def get_skill_demand_report():
-    """Generate skill demand report"""
-    skill_demand = db.session.query(
-        Skill.skill_name,
-        Skill.category,
-        func.count(JobRequiredSkill.id).label('demand_count')
-    ).join(JobRequiredSkill).group_by(Skill.id).order_by(
-        func.count(JobRequiredSkill.id).desc()
-    ).limit(20).all()
-    
-    return skill_demand
+    return render_template('admin/admin_reports.html', reports=reports, days=days or 30)
 
 # --- EXPORT ROUTES ---
 
@@ -334,165 +259,103 @@ def admin_export_data(data_type):
     if 'user_id' not in session or session['user_type'] != 'admin':
         return redirect(url_for('auth.login'))
     
-    try:
-        if data_type == 'users':
-            return export_users_csv()
-        elif data_type == 'jobs':
-            return export_jobs_csv()
-        elif data_type == 'applications':
-            return export_applications_csv()
-        elif data_type == 'skills':
-            return export_skills_csv()
-        else:
-            flash('Invalid export type', 'error')
-            return redirect(url_for('admin.admin_reports'))
-    
-    except Exception as e:
-        flash(f'Export failed: {str(e)}', 'error')
+    if data_type not in EXPORTS:
+        flash('Invalid export type', 'error')
         return redirect(url_for('admin.admin_reports'))
-
-# --- EXPORT FUNCTIONS ---
-
-def export_users_csv():
-    """Export users data to CSV"""
-    users = db.session.query(User, CandidateProfile, Company).outerjoin(
-        CandidateProfile, User.id == CandidateProfile.user_id
-    ).outerjoin(
-        Company, User.id == Company.user_id
-    ).all()
-    
-    output = BytesIO()
-    output.write('ID,Email,User Type,First Name,Last Name,Phone,Created At,Last Login,Is Active,Experience Years,Education Level,Company Name,Industry\n'.encode())
-    
-    for user, candidate, company in users:
-        row = [
-            str(user.id),
-            user.email,
-            user.user_type,
-            user.first_name,
-            user.last_name,
-            user.phone or '',
-            user.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else '',
-            str(user.is_active),
-            str(candidate.experience_years) if candidate else '',
-            candidate.education_level or '' if candidate else '',
-            company.company_name or '' if company else '',
-            company.industry or '' if company else ''
-        ]
-        output.write(','.join([f'"{field}"' for field in row]).encode() + b'\n')
-    
-    output.seek(0)
     
-    return send_file(
-        output,
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'users_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    # Streamed straight from a server-side cursor; large exports should go through export jobs
+    return stream_csv(
+        f'{data_type}_export_{export_timestamp()}.csv',
+        EXPORTS[data_type].header,
+        export_rows(data_type)
     )
 
-def export_jobs_csv():
-    """Export jobs data to CSV"""
-    jobs = db.session.query(JobPosting, Company).join(Company).all()
-    
-    output = BytesIO()
-    output.write('Job ID,Title,Company,Location,Job Type,Experience Required,Salary Min,Salary Max,Created At,Is Active,Applications Count\n'.encode())
+@bp.route('/exports')
+def admin_exports():
+    """Background export jobs and their downloads"""
+    if 'user_id' not in session or session['user_type'] != 'admin':
+        return redirect(url_for('auth.login'))
     
-    for job, company in jobs:
-        app_count = JobApplication.query.filter_by(job_id=job.id).count()
-        
-        row = [
-            str(job.id),
-            job.title,
-            company.company_name,
-            job.location or '',
-            job.job_type or '',
-            str(job.experience_required),
-            str(job.salary_min) if job.salary_min else '',
-            str(job.salary_max) if job.salary_max else '',
-            job.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            str(job.is_active),
-            str(app_count)
-        ]
-        output.write(','.join([f'"{field}"' for field in row]).encode() + b'\n')
-    
-    output.seek(0)
+    expire_stale_exports()
+    jobs = ExportJob.query.order_by(ExportJob.created_at.desc(), ExportJob.id.desc()).limit(50).all()
     
-    return send_file(
-        output,
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'jobs_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-    )
+    return render_template('admin/admin_exports.html', jobs=jobs, data_types=list(EXPORTS))
 
-def export_applications_csv():
-    """Export applications data to CSV"""
-    applications = db.session.query(
-        JobApplication, JobPosting, Company, CandidateProfile, User
-    ).join(
-        JobPosting, JobApplication.job_id == JobPosting.id
-    ).join(
-        Company, JobPosting.company_id == Company.id
-    ).join(
-        CandidateProfile, JobApplication.candidate_id == CandidateProfile.id
-    ).join(
-        User, CandidateProfile.user_id == User.id
-    ).all()
-    
-    output = BytesIO()
-    output.write('Application ID,Job Title,Company,Candidate Name,Candidate Email,Status,Applied At,Exam Score\n'.encode())
-    
-    for app, job, company, candidate, user in applications:
-        row = [
-            str(app.id),
-            job.title,
-            company.company_name,
-            f"{user.first_name} {user.last_name}",
-            user.email,
-            app.application_status,
-            app.applied_at.strftime('%Y-%m-%d %H:%M:%S'),
-            str(app.exam_score) if app.exam_score else ''
-        ]
-        output.write(','.join([f'"{field}"' for field in row]).encode() + b'\n')
-    
-    output.seek(0)
+@bp.route('/exports/<data_type>', methods=['POST'])
+def start_export_job(data_type):
+    """Queue a background export"""
+    if 'user_id' not in session or session['user_type'] != 'admin':
+        if request.is_json:
+            return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+        return redirect(url_for('auth.login'))
     
-    return send_file(
-        output,
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'applications_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-    )
+    if data_type not in EXPORTS:
+        if request.is_json:
+            return jsonify({'success': False, 'message': 'Invalid export type'}), 400
+        flash('Invalid export type', 'error')
+        return redirect(url_for('admin.admin_exports'))
+    
+    job = start_export(data_type, session['user_id'])
+    log_activity('export_jobs', 'INSERT', job.id, None, {'data_type': data_type}, session['user_id'])
+    
+    if request.is_json:
+        return jsonify({
+            'success': True,
+            'job': job.to_dict(),
+            'status_url': url_for('admin.export_job_status', job_id=job.id)
+        }), 202
+    
+    flash(f'{data_type.title()} export started', 'success')
+    return redirect(url_for('admin.admin_exports'))
 
-def export_skills_csv():
-    """Export skills data to CSV"""
-    skills = Skill.query.order_by(Skill.category, Skill.skill_name).all()
+@bp.route('/exports/<int:job_id>/status')
+def export_job_status(job_id):
+    """Progress of an export job, for polling when the socket is unavailable"""
+    if 'user_id' not in session or session['user_type'] != 'admin':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
     
-    output = BytesIO()
-    output.write('Skill ID,Skill Name,Category,Description,Usage Count\n'.encode())
+    expire_stale_exports()
+    job = ExportJob.query.get_or_404(job_id)
+    data = job.to_dict()
+    if job.status == 'completed':
+        data['download_url'] = url_for('admin.download_export', job_id=job.id)
     
-    for skill in skills:
-        usage_count = CandidateSkill.query.filter_by(skill_id=skill.id).count()
-        usage_count += JobRequiredSkill.query.filter_by(skill_id=skill.id).count()
-        
-        row = [
-            str(skill.id),
-            skill.skill_name,
-            skill.category or '',
-            skill.description or '',
-            str(usage_count)
-        ]
-        output.write(','.join([f'"{field}"' for field in row]).encode() + b'\n')
+    return jsonify({'success': True, 'job': data})
+
+@bp.route('/exports/<int:job_id>/download')
+def download_export(job_id):
+    """Finished export file; conditional and Range requests are honoured so downloads can resume"""
+    if 'user_id' not in session or session['user_type'] != 'admin':
+        return redirect(url_for('auth.login'))
     
-    output.seek(0)
+    job = ExportJob.query.get_or_404(job_id)
+    if job.status != 'completed' or not job.file_path or not os.path.exists(job.file_path):
+        flash('Export file is not available', 'error')
+        return redirect(url_for('admin.admin_exports'))
     
     return send_file(
-        output,
-        mimetype='text/csv',
+        job.file_path,
+        mimetype='application/gzip',
         as_attachment=True,
-        download_name=f'skills_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        download_name=os.path.basename(job.file_path),
+        conditional=True,
+        max_age=0
     )
 
+@bp.route('/exports/<int:job_id>/delete', methods=['POST'])
+def delete_export_job(job_id):
+    if 'user_id' not in session or session['user_type'] != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    job = ExportJob.query.get_or_404(job_id)
+    if job.status in ('queued', 'running'):
+        flash('Export is still running', 'error')
+    else:
+        delete_export(job)
+        flash('Export deleted', 'success')
+    
+    return redirect(url_for('admin.admin_exports'))
+
 
 # =====================================================
 # INTERVIEWER APPLICATION MANAGEMENT
@@ -512,17 +375,15 @@ def interviewer_applications():
     if status_filter:
         query = query.filter(InterviewerApplication.status == status_filter)
     
-    applications = query.order_by(
+    applications = offset_paginate(query.order_by(
         InterviewerApplication.created_at.desc()
-    ).paginate(page=page, per_page=20, error_out=False)
-    
-    # Get counts for each status
-    status_counts = {
-        'pending': InterviewerApplication.query.filter_by(status='pending').count(),
-        'under_review': InterviewerApplication.query.filter_by(status='under_review').count(),
-        'approved': InterviewerApplication.query.filter_by(status='approved').count(),
-        'rejected': InterviewerApplication.query.filter_by(status='rejected').count()
-    }
+    ), InterviewerApplication.id, page=page, per_page=20)
+    
+    # Get counts for each status in one GROUP BY
+    status_counts = dict.fromkeys(['pending', 'under_review', 'approved', 'rejected'], 0)
+    status_counts.update(db.session.query(
+        InterviewerApplication.status, func.count(InterviewerApplication.id)
+    ).group_by(InterviewerApplication.status).all())
     
     return render_template('admin/interviewer_applications.html',
                          applications=applications,
@@ -556,21 +417,13 @@ def download_application_cv(app_id):
     if 'user_id' not in session or session['user_type'] != 'admin':
         return redirect(url_for('auth.login'))
     
-    application = InterviewerApplication.query.get_or_404(app_id)
+    application = InterviewerApplication.query.options(undefer_group('file_content')).get_or_404(app_id)
     
-    if not application.cv_content:
+    response = send_stored_file(application, 'cv_content', application.cv_filename, application.cv_mimetype)
+    if response is None:
         flash('CV not found.', 'error')
         return redirect(url_for('admin.view_interviewer_application', app_id=app_id))
     
-    from flask import Response
-    response = Response(
-        application.cv_content,
-        mimetype=application.cv_mimetype or 'application/octet-stream',
-        headers={
-            'Content-Disposition': f'attachment; filename="{application.cv_filename}"',
-            'Content-Length': len(application.cv_content)
-        }
-    )
     return response
 
 
@@ -580,21 +433,14 @@ def download_application_exp_proof(app_id):
     if 'user_id' not in session or session['user_type'] != 'admin':
         return redirect(url_for('auth.login'))
     
-    application = InterviewerApplication.query.get_or_404(app_id)
+    application = InterviewerApplication.query.options(undefer_group('file_content')).get_or_404(app_id)
     
-    if not application.experience_proof_content:
+    response = send_stored_file(application, 'experience_proof_content',
+                                application.experience_proof_filename, application.experience_proof_mimetype)
+    if response is None:
         flash('Experience proof document not found.', 'error')
         return redirect(url_for('admin.view_interviewer_application', app_id=app_id))
     
-    from flask import Response
-    response = Response(
-        application.experience_proof_content,
-        mimetype=application.experience_proof_mimetype or 'application/octet-stream',
-        headers={
-            'Content-Disposition': f'attachment; filename="{application.experience_proof_filename}"',
-            'Content-Length': len(application.experience_proof_content)
-        }
-    )
     return response
 
 
@@ -608,6 +454,7 @@ def review_interviewer_application(app_id):
     application.status = 'under_review'
     application.reviewed_by = session['user_id']
     db.session.commit()
+    invalidate_dashboard_stats()
     
     flash('Application marked as under review.', 'info')
     return redirect(url_for('admin.view_interviewer_application', app_id=app_id))
@@ -646,10 +493,10 @@ def approve_interviewer_application(app_id):
                 profile.is_active = True
                 profile.is_available = True
                 profile.approved_at = datetime.utcnow()
-                profile.cv_content = application.cv_content
+                copy_stored_file(application, profile, 'cv_content')
                 profile.cv_filename = application.cv_filename
                 profile.cv_mimetype = application.cv_mimetype
-                profile.experience_proof_content = application.experience_proof_content
+                copy_stored_file(application, profile, 'experience_proof_content')
                 profile.experience_proof_filename = application.experience_proof_filename
                 profile.experience_proof_mimetype = application.experience_proof_mimetype
             else:
@@ -668,13 +515,13 @@ def approve_interviewer_application(app_id):
                     is_active=True,
                     is_available=True,
                     approved_at=datetime.utcnow(),
-                    cv_content=application.cv_content,
                     cv_filename=application.cv_filename,
                     cv_mimetype=application.cv_mimetype,
-                    experience_proof_content=application.experience_proof_content,
                     experience_proof_filename=application.experience_proof_filename,
                     experience_proof_mimetype=application.experience_proof_mimetype
                 )
+                copy_stored_file(application, profile, 'cv_content')
+                copy_stored_file(application, profile, 'experience_proof_content')
                 db.session.add(profile)
             
             db.session.flush()
@@ -720,13 +567,13 @@ def approve_interviewer_application(app_id):
                 is_active=True,
                 is_available=True,
                 approved_at=datetime.utcnow(),
-                cv_content=application.cv_content,
                 cv_filename=application.cv_filename,
                 cv_mimetype=application.cv_mimetype,
-                experience_proof_content=application.experience_proof_content,
                 experience_proof_filename=application.experience_proof_filename,
                 experience_proof_mimetype=application.experience_proof_mimetype
             )
+            copy_stored_file(application, profile, 'cv_content')
+            copy_stored_file(application, profile, 'experience_proof_content')
             db.session.add(profile)
             db.session.flush()
             
@@ -783,6 +630,7 @@ def approve_interviewer_application(app_id):
         application.created_user_id = user.id
         
         db.session.commit()
+        invalidate_dashboard_stats()
         
         # Log activity
         log_activity('interviewer_applications', 'UPDATE', application.id,
@@ -813,6 +661,7 @@ def reject_interviewer_application(app_id):
     application.reviewed_at = datetime.utcnow()
     
     db.session.commit()
+    invalidate_dashboard_stats()
     
     # Log activity
     log_activity('interviewer_applications', 'UPDATE', application.id,
@@ -854,9 +703,8 @@ def manage_interviewers():
             )
         )
     
-    interviewers = query.order_by(InterviewerProfile.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    interviewers = offset_paginate(query.order_by(InterviewerProfile.created_at.desc()),
+                                   InterviewerProfile.id, page=page, per_page=20)
     
     return render_template('admin/manage_interviewers.html',
                          interviewers=interviewers,
@@ -897,19 +745,6 @@ def toggle_interviewer_active(profile_id):
 
 # --- ADMIN HELPER FUNCTIONS ---
 
-def log_activity(table_name, operation_type, record_id, old_values=None, new_values=None, user_id=None):
-    """Log activity for audit trail"""
-    activity = ActivityLog(
-        table_name=table_name,
-        operation_type=operation_type,
-        record_id=record_id,
-        old_values=json.dumps(old_values) if old_values else None,
-        new_values=json.dumps(new_values) if new_values else None,
-        user_id=user_id
-    )
-    db.session.add(activity)
-    db.session.commit()
-
 def create_notification(user_id, title, message, notification_type='system', action_url=None):
     """Create a new notification for a user"""
     notification = Notification(
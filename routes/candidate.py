@@ -1,7 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from sqlalchemy import and_, or_
 from datetime import datetime
-from werkzeug.utils import secure_filename
 import os
 from extensions import db
 from models import (
@@ -9,44 +8,23 @@ from models import (
     MCQExam, ExamAttempt, Skill, CandidateSkill, JobRequiredSkill, 
     Notification, InterviewRoom
 )
-from services import create_notification, log_activity, calculate_job_match_score
+from services import create_notification, log_activity
+from services.job_matching_service import get_top_job_matches, refresh_candidate_matches
+from services.skill_matrix_service import candidate_skill_pairs
+from services.skill_catalog_service import get_skill_catalog
+from services.upload_service import store_upload
+from services.cv_text_service import index_candidate_cv
 from utils import allowed_file
 
 candidate_bp = Blueprint('candidate', __name__)
 
 def get_job_recommendations(candidate_id):
     """Get personalized job recommendations for a candidate"""
-    candidate = CandidateProfile.query.get(candidate_id)
-    if not candidate:
-        return []
-    
-    # Get jobs the candidate hasn't applied to
-    applied_job_ids = db.session.query(JobApplication.job_id).filter_by(
-        candidate_id=candidate_id
-    ).subquery()
-    
-    available_jobs = db.session.query(JobPosting, Company).join(
-        Company, JobPosting.company_id == Company.id
-    ).filter(
-        JobPosting.is_active == True,
-        ~JobPosting.id.in_(applied_job_ids)
-    ).all()
-    
-    # Calculate match scores and sort
-    job_matches = []
-    for job, company in available_jobs:
-        match_score = calculate_job_match_score(candidate_id, job.id)
-        if match_score > 30:  # Only show jobs with decent match
-            job_matches.append({
-                'job': job,
-                'company': company,
-                'match_score': match_score
-            })
-    
-    # Sort by match score
-    job_matches.sort(key=lambda x: x['match_score'], reverse=True)
-    
-    return job_matches[:10]  # Return top 10 matches
+    # Indexed lookup on the precomputed candidate_job_matches table
+    return [
+        {'job': job, 'company': company, 'match_score': match_score}
+        for job, company, match_score in get_top_job_matches(candidate_id, limit=10, min_score=30)
+    ]
 
 @candidate_bp.route('/candidate/dashboard')
 def candidate_dashboard():
@@ -149,7 +127,7 @@ def candidate_profile():
     profile = user.candidate_profile
     
     # Get available skills and candidate's current skills
-    available_skills = Skill.query.order_by(Skill.category, Skill.skill_name).all()
+    skill_categories = get_skill_catalog().by_category.items()
     candidate_skills = db.session.query(CandidateSkill, Skill).join(Skill).filter(
         CandidateSkill.candidate_id == profile.id
     ).all()
@@ -157,6 +135,7 @@ def candidate_profile():
     if request.method == 'POST':
         try:
             # Store old values for logging
+            old_skill_ids = {cs.skill_id for cs, _ in candidate_skills}
             old_values = {
                 'experience_years': profile.experience_years,
                 'education_level': profile.education_level,
@@ -181,15 +160,12 @@ def candidate_profile():
             
             # Handle CV file upload
             cv_file = request.files.get('cv_file')
+            cv_uploaded = False
             if cv_file and cv_file.filename and allowed_file(cv_file.filename):
                 try:
-                    # Read file content as binary
-                    file_content = cv_file.read()
-                    
-                    # Save CV to database
-                    profile.cv_content = file_content
-                    profile.cv_filename = secure_filename(cv_file.filename)
-                    profile.cv_mimetype = cv_file.mimetype
+                    # Stream the CV to the blob store, checking its type and size
+                    store_upload(profile, 'cv_content', cv_file, 'cv', 'CV')
+                    cv_uploaded = True
                     
                     flash('CV uploaded successfully!', 'success')
                 except Exception as e:
@@ -229,6 +205,16 @@ def candidate_profile():
             log_activity('candidate_profiles', 'UPDATE', profile.id,
                         old_values=old_values, new_values=new_values, user_id=session['user_id'])
             
+            # Refresh stored match scores only when a scoring input changed
+            new_skill_ids = {int(skill_id) for skill_id in selected_skills}
+            match_fields = ('experience_years', 'location', 'salary_expectation')
+            if new_skill_ids != old_skill_ids or any(old_values[f] != new_values[f] for f in match_fields):
+                refresh_candidate_matches(profile.id)
+            
+            # A new CV's text is extracted in the background for search and matching
+            if cv_uploaded:
+                index_candidate_cv(profile)
+            
             # Create notification for profile update
             create_notification(session['user_id'], 'Profile Updated',
                               'Your profile has been successfully updated. Check your new job recommendations!',
@@ -244,7 +230,7 @@ def candidate_profile():
     return render_template('candidate/candidate_profile_edit.html',
                          user=user,
                          profile=profile,
-                         available_skills=available_skills,
+                         skill_categories=skill_categories,
                          candidate_skills=candidate_skills)
 
 
@@ -312,6 +298,10 @@ def candidate_skill_analysis():
     # Get detailed job analysis
     recommendations = get_job_recommendations(profile.id)
     
+    # Same skills the match scores count: picked on the profile or named in the CV
+    pairs = candidate_skill_pairs([profile.id])
+    candidate_skill_ids = {skill_id for (skill_id,) in db.session.query(pairs.c.skill_id)}
+    
     # Analyze skill gaps
     skill_gap_analysis = []
     for rec in recommendations[:5]:  # Top 5 recommendations
@@ -320,7 +310,6 @@ def candidate_skill_analysis():
             JobRequiredSkill.job_id == job.id
         ).all()
         
-        candidate_skill_ids = [cs.skill_id for cs, _ in candidate_skills]
         missing_skills = []
         matching_skills = []
         
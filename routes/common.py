@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from extensions import db
 from models import User, Notification
+from services.notification_service import mark_notifications_read
+from utils.pagination import keyset_paginate
 from datetime import datetime, timedelta
 from sqlalchemy import func, or_
 
@@ -14,15 +16,15 @@ def notifications():
         return redirect(url_for('auth.login'))
 
     # --- filtering & pagination -------------------------------
-    page        = request.args.get('page', 1, type=int)
+    cursor      = request.args.get('cursor')
     base_q      = Notification.query.filter_by(user_id=session['user_id'])
     if request.args.get('filter') == 'unread':
         base_q = base_q.filter_by(is_read=False)
     if request.args.get('type'):
         base_q = base_q.filter_by(notification_type=request.args['type'])
 
-    notifications_data = base_q.order_by(Notification.created_at.desc()) \
-                          .paginate(page=page, per_page=20, error_out=False)
+    notifications_data = keyset_paginate(base_q, (Notification.created_at, Notification.id),
+                                         cursor=cursor, per_page=20, count=1000)
 
     # --- date cut-offs that the template will use --------------
     now            = datetime.utcnow()
@@ -48,7 +50,7 @@ def mark_notification_read(notification_id):
     ).first()
     
     if notification:
-        notification.is_read = True
+        mark_notifications_read(session['user_id'], [notification.id])
         db.session.commit()
         
         if notification.action_url:
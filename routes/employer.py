@@ -1,8 +1,7 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, Response
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
 from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import undefer_group
 from datetime import datetime, timedelta
-from io import BytesIO
-from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash
 
 from extensions import db
@@ -14,10 +13,18 @@ from models import (
     InterviewerReview, InterviewerJobRole, InterviewFeedback, InterviewParticipant
 )
 from services.email_service import send_interview_scheduled_email
-from services import log_activity, create_notification
-from services.job_matching_service import calculate_job_match_score
+from services import log_activity, create_notification, create_notifications_bulk
+from services.job_search_service import index_job, reindex_company_jobs
+from services.skill_catalog_service import get_skill_catalog
+from services.blob_store_service import send_stored_file
+from services.logo_service import store_logo, send_logo_image
+from services.cv_text_service import cv_text_condition
+from services.job_matching_service import (
+    get_match_score, refresh_job_matches, score_candidates_for_job,
+    rank_candidates_for_job, get_skill_overlap
+)
 from utils.file_utils import allowed_file
-from flask import send_file
+from utils.pagination import offset_paginate
 import json
 
 bp = Blueprint('employer', __name__, url_prefix='/employer')
@@ -38,6 +45,7 @@ def company_profile():
     
     if request.method == 'POST':
         try:
+            old_company_name = company.company_name
             company.company_name = request.form.get('company_name', company.company_name)
             company.industry = request.form.get('industry', '')
             company.company_size = request.form.get('company_size', '')
@@ -49,12 +57,12 @@ def company_profile():
             if 'logo' in request.files:
                 logo_file = request.files['logo']
                 if logo_file and logo_file.filename:
-                    # Check allowed image extensions
-                    allowed_image_ext = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-                    ext = logo_file.filename.rsplit('.', 1)[1].lower() if '.' in logo_file.filename else ''
-                    if ext in allowed_image_ext:
-                        company.logo = logo_file.read()
-                        company.logo_filename = secure_filename(logo_file.filename)
+                    # Type is checked from the file's contents, size against UPLOAD_LIMITS
+                    store_logo(company, logo_file)
+            
+            # Company name is part of every posting's search document
+            if company.company_name != old_company_name:
+                reindex_company_jobs(company)
             
             db.session.commit()
             
@@ -88,34 +96,31 @@ def company_logo():
     if 'user_id' not in session or session['user_type'] != 'employer':
         return redirect(url_for('auth.login'))
     
-    user = User.query.get(session['user_id'])
-    company = user.company
+    company = Company.query.options(undefer_group('file_content')).filter_by(user_id=session['user_id']).first()
     
-    if company and company.logo:
-        return send_file(
-            BytesIO(company.logo),
-            mimetype='image/png',
-            download_name=company.logo_filename or 'logo.png'
-        )
+    response = send_stored_file(company, 'logo', company.logo_filename or 'logo.png',
+                                as_attachment=False) if company else None
     
     # Return a placeholder or 404
-    return '', 404
+    return response or ('', 404)
 
 
 @bp.route('/company/<int:company_id>/logo')
 def get_company_logo(company_id):
     """Serve company logo by company ID (public)"""
-    company = Company.query.get(company_id)
+    company = Company.query.options(undefer_group('file_content')).get(company_id)
     
-    if company and company.logo:
-        return send_file(
-            BytesIO(company.logo),
-            mimetype='image/png',
-            download_name=company.logo_filename or 'logo.png'
-        )
+    response = send_stored_file(company, 'logo', company.logo_filename or 'logo.png', as_attachment=False,
+                                max_age=current_app.config.get('LOGO_CACHE_MAX_AGE', 300)) if company else None
     
     # Return empty for no logo
-    return '', 404
+    return response or ('', 404)
+
+
+@bp.route('/logos/<digest>')
+def logo_image(digest):
+    """Serve a logo or logo thumbnail by content hash (public, no database read)"""
+    return send_logo_image(digest) or ('', 404)
 
 
 def get_employer_analytics(company_id):
@@ -288,8 +293,14 @@ def create_job():
                 except (ValueError, TypeError):
                     continue
             
+            # Keep the search index in the same transaction
+            index_job(job, company)
+            
             db.session.commit()
             
+            # Score the new posting against all candidates
+            refresh_job_matches(job.id)
+            
             flash('Job posting created successfully!', 'success')
             return redirect(url_for('employer.employer_jobs'))
             
@@ -297,10 +308,11 @@ def create_job():
             db.session.rollback()
             flash(f'Error creating job posting: {str(e)}', 'error')
     
-    # Get all skills for the form
-    skills = Skill.query.order_by(Skill.skill_name).all()
+    # Get all skills for the form, grouped by category
+    catalog = get_skill_catalog()
     
-    return render_template('employer/create_job.html', user=user, company=company, skills=skills)
+    return render_template('employer/create_job.html', user=user, company=company,
+                         skills=catalog.skills, skill_categories=catalog.by_category.items())
 
 
 @bp.route('/job/<int:job_id>/exam', methods=['GET', 'POST'])
@@ -435,6 +447,7 @@ def employer_applications():
     # Get applications with filters
     status_filter = request.args.get('status', '')
     job_filter = request.args.get('job_id', '')
+    cv_search = request.args.get('cv', '').strip()
     
     query = db.session.query(JobApplication, JobPosting, CandidateProfile, User).join(
         JobPosting, JobApplication.job_id == JobPosting.id
@@ -452,13 +465,25 @@ def employer_applications():
     if job_filter:
         query = query.filter(JobPosting.id == int(job_filter))
     
+    # Words that must all appear in the candidate's CV
+    cv_condition = cv_text_condition(cv_search)
+    if cv_condition is not None:
+        query = query.filter(cv_condition)
+    
     applications_raw = query.order_by(JobApplication.applied_at.desc()).all()
     
-    # Calculate match scores for each application
-    applications = []
+    # Calculate match scores in one batch per job
+    candidates_by_job = {}
     for app, job, candidate, candidate_user in applications_raw:
-        match_score = calculate_job_match_score(candidate.id, job.id)
-        applications.append((app, job, candidate, candidate_user, match_score))
+        candidates_by_job.setdefault(job.id, []).append(candidate.id)
+    match_scores = {
+        job_id: score_candidates_for_job(job_id, candidate_ids)
+        for job_id, candidate_ids in candidates_by_job.items()
+    }
+    applications = [
+        (app, job, candidate, candidate_user, match_scores[job.id].get(candidate.id, 0))
+        for app, job, candidate, candidate_user in applications_raw
+    ]
     
     # Get company jobs for filter
     company_jobs = JobPosting.query.filter_by(company_id=company.id).all()
@@ -469,7 +494,84 @@ def employer_applications():
         company=company,
         user=user,
         status_filter=status_filter,
-        job_filter=job_filter)
+        job_filter=job_filter,
+        cv_search=cv_search)
+
+
+@bp.route('/job/<int:job_id>/candidates')
+def job_candidates(job_id):
+    """Applicants or the whole candidate pool for a job, ranked by match score"""
+    if 'user_id' not in session or session['user_type'] != 'employer':
+        return redirect(url_for('auth.login'))
+    
+    user = User.query.get(session['user_id'])
+    company = user.company
+    job = JobPosting.query.get_or_404(job_id)
+    
+    if not company or job.company_id != company.id:
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('employer.employer_jobs'))
+    
+    page = request.args.get('page', 1, type=int)
+    scope = request.args.get('scope', 'applicants')
+    if scope not in ('applicants', 'pool'):
+        scope = 'applicants'
+    
+    candidates = offset_paginate(rank_candidates_for_job(
+        job.id, applicants_only=(scope == 'applicants')
+    ), CandidateProfile.id, page=page, per_page=20)
+    
+    # Matched / lacking skills for the page in two queries
+    skill_overlap = get_skill_overlap(job.id, [candidate.id for candidate, _, _, _ in candidates.items])
+    
+    return render_template('employer/job_candidates.html',
+                         user=user,
+                         company=company,
+                         job=job,
+                         scope=scope,
+                         candidates=candidates,
+                         skill_overlap=skill_overlap)
+
+
+@bp.route('/api/job/<int:job_id>/candidates')
+def api_job_candidates(job_id):
+    """JSON version of the ranked candidate list"""
+    if 'user_id' not in session or session['user_type'] != 'employer':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+    
+    user = User.query.get(session['user_id'])
+    job = JobPosting.query.get(job_id)
+    
+    if not job or not user.company or job.company_id != user.company.id:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    applicants_only = request.args.get('scope', 'applicants') != 'pool'
+    
+    candidates = offset_paginate(rank_candidates_for_job(
+        job.id, applicants_only=applicants_only
+    ), CandidateProfile.id, page=page, per_page=per_page)
+    skill_overlap = get_skill_overlap(job.id, [candidate.id for candidate, _, _, _ in candidates.items])
+    
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'page': candidates.page,
+        'pages': candidates.pages,
+        'total': candidates.total,
+        'candidates': [{
+            'candidate_id': candidate.id,
+            # Contact details only for candidates who applied to this job
+            'name': f'{candidate_user.first_name} {candidate_user.last_name}' if application else f'Candidate #{candidate.id}',
+            'email': candidate_user.email if application else None,
+            'match_score': match_score,
+            'application_id': application.id if application else None,
+            'application_status': application.application_status if application else None,
+            'matched_skills': skill_overlap[candidate.id][0],
+            'lacking_skills': skill_overlap[candidate.id][1]
+        } for candidate, candidate_user, application, match_score in candidates.items]
+    })
 
 
 @bp.route('/application/<int:application_id>')
@@ -530,7 +632,7 @@ def employer_view_application(application_id):
     ).order_by(ApplicationStatusHistory.changed_at.desc()).all()
     
     # Calculate match score
-    match_score = calculate_job_match_score(candidate.id, job.id)
+    match_score = get_match_score(candidate.id, job.id)
     
     # Get available interviewers for recommendation
     available_interviewers = User.query.filter_by(
@@ -636,8 +738,8 @@ def download_cv(candidate_id):
     if 'user_id' not in session or session['user_type'] != 'employer':
         return redirect(url_for('auth.login'))
     
-    # Get candidate profile
-    candidate = CandidateProfile.query.get_or_404(candidate_id)
+    # Get candidate profile, with the legacy CV bytes in case it predates the blob store
+    candidate = CandidateProfile.query.options(undefer_group('file_content')).get_or_404(candidate_id)
     
     # Verify employer has access to this candidate's CV (through applications)
     employer = User.query.get(session['user_id'])
@@ -656,7 +758,9 @@ def download_cv(candidate_id):
         return redirect(url_for('employer.employer_applications'))
     
     # Check if CV exists
-    if not candidate.cv_content or not candidate.cv_filename:
+    response = send_stored_file(candidate, 'cv_content', candidate.cv_filename,
+                                candidate.cv_mimetype) if candidate.cv_filename else None
+    if response is None:
         flash('CV not found for this candidate', 'error')
         return redirect(url_for('employer.employer_applications'))
     
@@ -666,13 +770,6 @@ def download_cv(candidate_id):
                     new_values={'downloaded_by': session['user_id']},
                     user_id=session['user_id'])
         
-        # Return the file with proper headers to force download
-        response = Response(
-            candidate.cv_content,
-            mimetype=candidate.cv_mimetype or 'application/octet-stream'
-        )
-        response.headers['Content-Disposition'] = f'attachment; filename="{candidate.cv_filename}"'
-        response.headers['Content-Length'] = len(candidate.cv_content)
         return response
     except Exception as e:
         flash(f'Error downloading CV: {str(e)}', 'error')
@@ -739,15 +836,16 @@ def recommend_interviewer(application_id):
         # Notify ADMIN/MANAGER (not interviewer)
         interviewer = User.query.get(interviewer_id)
         employer = User.query.get(session['user_id'])
-        admins = User.query.filter(User.user_type.in_(['admin', 'manager'])).all()
-        for admin in admins:
-            create_notification(
-                admin.id,
-                'New Interviewer Recommendation',
-                f'Employer {employer.first_name} {employer.last_name} has recommended {interviewer.first_name} {interviewer.last_name} for interviewing candidate {application.candidate.user.first_name} {application.candidate.user.last_name} (Job: {application.job.title}).',
-                'system',
-                url_for('admin.schedule_interview', application_id=application_id)
-            )
+        admin_ids = [admin_id for admin_id, in db.session.query(User.id).filter(
+            User.user_type.in_(['admin', 'manager'])
+        )]
+        create_notifications_bulk(
+            admin_ids,
+            'New Interviewer Recommendation',
+            f'Employer {employer.first_name} {employer.last_name} has recommended {interviewer.first_name} {interviewer.last_name} for interviewing candidate {application.candidate.user.first_name} {application.candidate.user.last_name} (Job: {application.job.title}).',
+            'system',
+            url_for('admin.schedule_interview', application_id=application_id)
+        )
         db.session.commit()
         flash('Interviewer recommendation submitted to manager for approval and scheduling.', 'success')
     except Exception as e:
@@ -931,13 +1029,13 @@ def browse_expert_interviewers():
             )
         )
     
-    interviewers = query.order_by(
+    interviewers = offset_paginate(query.order_by(
         InterviewerProfile.is_verified.desc(),
         InterviewerProfile.average_rating.desc()
-    ).paginate(page=page, per_page=12, error_out=False)
+    ), InterviewerProfile.id, page=page, per_page=12)
     
     # Get filter options
-    all_skills = Skill.query.order_by(Skill.skill_name).all()
+    all_skills = get_skill_catalog().skills
     all_industries = db.session.query(InterviewerIndustry.industry_name).distinct().all()
     all_industries = [i[0] for i in all_industries]
     
@@ -1102,7 +1200,7 @@ def add_inhouse_interviewer():
             db.session.rollback()
             flash(f'Error adding interviewer: {str(e)}', 'error')
     
-    all_skills = Skill.query.order_by(Skill.skill_name).all()
+    all_skills = get_skill_catalog().skills
     
     return render_template('employer/add_inhouse_interviewer.html',
                          user=user,
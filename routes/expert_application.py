@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
 from extensions import db
-from models import User, Skill, InterviewerApplication, InterviewerProfile
+from models import User, InterviewerApplication, InterviewerProfile
+from services.skill_catalog_service import get_skill_catalog
+from services.upload_service import store_upload
 from werkzeug.security import generate_password_hash
 from datetime import datetime
 import json
@@ -15,7 +17,7 @@ bp = Blueprint('expert_application', __name__)
 @bp.route('/become-expert-interviewer')
 def become_expert():
     """Landing page for expert interviewer application"""
-    skills = Skill.query.order_by(Skill.skill_name).all()
+    skills = get_skill_catalog().skills
     
     # Common industries list
     industries = [
@@ -94,9 +96,10 @@ def apply_as_expert():
             # Skills (as JSON)
             skill_ids = request.form.getlist('skills')
             skills_data = []
+            catalog = get_skill_catalog()
             for skill_id in skill_ids:
                 try:
-                    skill = Skill.query.get(int(skill_id))
+                    skill = catalog.by_id.get(int(skill_id))
                     if skill:
                         skills_data.append({
                             'id': skill.id,
@@ -118,9 +121,7 @@ def apply_as_expert():
             # CV upload
             cv_file = request.files.get('cv_file')
             if cv_file and cv_file.filename:
-                application.cv_content = cv_file.read()
-                application.cv_filename = cv_file.filename
-                application.cv_mimetype = cv_file.mimetype
+                store_upload(application, 'cv_content', cv_file, 'cv', 'CV')
             else:
                 flash('CV/Resume is required.', 'error')
                 return redirect(url_for('expert_application.apply_as_expert'))
@@ -128,9 +129,7 @@ def apply_as_expert():
             # Experience proof upload
             exp_file = request.files.get('experience_proof')
             if exp_file and exp_file.filename:
-                application.experience_proof_content = exp_file.read()
-                application.experience_proof_filename = exp_file.filename
-                application.experience_proof_mimetype = exp_file.mimetype
+                store_upload(application, 'experience_proof_content', exp_file, 'experience_proof', 'Experience proof')
             
             # Certifications (as JSON)
             cert_names = request.form.getlist('cert_name')
@@ -179,7 +178,7 @@ def apply_as_expert():
             return redirect(url_for('expert_application.apply_as_expert'))
     
     # GET request - show form
-    skills = Skill.query.order_by(Skill.skill_name).all()
+    skills = get_skill_catalog().skills
     industries = [
         'Technology', 'Finance & Banking', 'Healthcare', 'E-commerce',
         'Education', 'Manufacturing', 'Telecommunications', 'Media & Entertainment',
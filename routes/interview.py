@@ -1,12 +1,12 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from extensions import db
 from models import (
-    User, ActivityLog, Notification, InterviewRoom, InterviewParticipant, 
+    User, Notification, InterviewRoom, InterviewParticipant, 
     InterviewFeedback, CodeSession, InterviewerRecommendation,
     JobApplication, JobPosting, Company, CandidateProfile
 )
+from services.notification_service import create_notifications_bulk, log_activity
 from datetime import datetime
-import json
 import time
 
 bp = Blueprint('interview', __name__)
@@ -362,25 +362,24 @@ def schedule_interview(application_id):
                 else:
                     rec.status = 'not_selected'
 
-            db.session.commit()
-
-            # Send notifications
-            create_notification(
-                application.candidate.user_id,
+            # Send notifications in the same transaction as the room
+            create_notifications_bulk(
+                [application.candidate.user_id],
                 'Interview Scheduled',
                 f'Your interview for {application.job.title} has been scheduled for {scheduled_time.strftime("%B %d, %Y at %I:%M %p")}',
                 'system',
                 url_for('interview.join_interview', room_code=room_code)
             )
 
-            for interviewer_id in interviewer_ids:
-                create_notification(
-                    int(interviewer_id),
-                    'Interview Assignment',
-                    f'You have been assigned to interview for {application.job.title} on {scheduled_time.strftime("%B %d, %Y at %I:%M %p")}',
-                    'system',
-                    url_for('interview.join_interview', room_code=room_code)
-                )
+            create_notifications_bulk(
+                interviewer_ids,
+                'Interview Assignment',
+                f'You have been assigned to interview for {application.job.title} on {scheduled_time.strftime("%B %d, %Y at %I:%M %p")}',
+                'system',
+                url_for('interview.join_interview', room_code=room_code)
+            )
+
+            db.session.commit()
 
             flash('Interview scheduled successfully for 24/7 availability!', 'success')
             return redirect(url_for('admin.admin_dashboard'))
@@ -480,14 +479,14 @@ def edit_interview(interview_id):
                 )
             
             # Notify new interviewers
-            for interviewer_id in new_interviewer_ids:
-                create_notification(
-                    int(interviewer_id),
-                    'Interview Updated',
-                    f'Interview assignment updated for {interview_room.application.job.title} - {scheduled_time.strftime("%B %d, %Y at %I:%M %p")}',
-                    'system',
-                    url_for('interview.join_interview', room_code=interview_room.room_code)
-                )
+            create_notifications_bulk(
+                new_interviewer_ids,
+                'Interview Updated',
+                f'Interview assignment updated for {interview_room.application.job.title} - {scheduled_time.strftime("%B %d, %Y at %I:%M %p")}',
+                'system',
+                url_for('interview.join_interview', room_code=interview_room.room_code)
+            )
+            db.session.commit()
             
             flash('Interview updated successfully!', 'success')
             return redirect(url_for('interview.manage_interviews'))
@@ -549,16 +548,15 @@ def delete_interview(interview_id):
                     old_values={'room_code': room_code, 'job_title': job_title},
                     user_id=session['user_id'])
         
-        db.session.commit()
-        
         # Notify all participants about cancellation
-        for participant, user in participants:
-            create_notification(
-                participant.user_id,
-                'Interview Cancelled',
-                f'The interview for {job_title} scheduled in room {room_code} has been cancelled.',
-                'system'
-            )
+        create_notifications_bulk(
+            [participant.user_id for participant, user in participants],
+            'Interview Cancelled',
+            f'The interview for {job_title} scheduled in room {room_code} has been cancelled.',
+            'system'
+        )
+        
+        db.session.commit()
         
         flash('Interview deleted successfully and participants notified.', 'success')
         
@@ -629,17 +627,16 @@ def cancel_interview(interview_id):
                     new_values={'status': 'cancelled'},
                     user_id=session['user_id'])
         
-        db.session.commit()
-        
         # Notify participants
         job_title = interview_room.application.job.title
-        for participant, user in participants:
-            create_notification(
-                participant.user_id,
-                'Interview Cancelled',
-                f'The interview for {job_title} has been cancelled. You will be notified if it gets rescheduled.',
-                'system'
-            )
+        create_notifications_bulk(
+            [participant.user_id for participant, user in participants],
+            'Interview Cancelled',
+            f'The interview for {job_title} has been cancelled. You will be notified if it gets rescheduled.',
+            'system'
+        )
+        
+        db.session.commit()
         
         flash('Interview cancelled successfully and participants notified.', 'success')
         
@@ -651,19 +648,6 @@ def cancel_interview(interview_id):
 
 # --- HELPER FUNCTIONS ---
 
-def log_activity(table_name, operation_type, record_id, old_values=None, new_values=None, user_id=None):
-    """Log activity for audit trail"""
-    activity = ActivityLog(
-        table_name=table_name,
-        operation_type=operation_type,
-        record_id=record_id,
-        old_values=json.dumps(old_values) if old_values else None,
-        new_values=json.dumps(new_values) if new_values else None,
-        user_id=user_id
-    )
-    db.session.add(activity)
-    db.session.commit()
-
 def create_notification(user_id, title, message, notification_type='system', action_url=None):
     """Create a new notification for a user"""
     notification = Notification(
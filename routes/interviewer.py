@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, send_file
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from extensions import db
 from models import (
     User, InterviewRoom, InterviewParticipant, Skill,
@@ -7,8 +7,11 @@ from models import (
     InterviewerApplication, JobApplication, JobPosting, Company, CandidateProfile, CandidateSkill,
     JobRequiredSkill, ExamAttempt
 )
+from sqlalchemy.orm import undefer_group
+from services.skill_catalog_service import get_skill_catalog
+from services.blob_store_service import send_stored_file
+from services.upload_service import receive_upload, store_upload
 from datetime import datetime, time
-import io
 
 bp = Blueprint('interviewer', __name__, url_prefix='/interviewer')
 
@@ -135,7 +138,7 @@ def apply_expert():
         flash('You already have a pending application. Please wait for admin review.', 'info')
         return redirect(url_for('interviewer.interviewer_dashboard'))
     
-    skills = Skill.query.order_by(Skill.skill_name).all()
+    skills = get_skill_catalog().skills
     industries = [
         'Technology', 'Finance & Banking', 'Healthcare', 'E-commerce',
         'Education', 'Manufacturing', 'Telecommunications', 'Media & Entertainment',
@@ -165,9 +168,10 @@ def apply_expert():
             # Process skills
             selected_skills = request.form.getlist('skills')
             skills_data = []
+            catalog = get_skill_catalog()
             for skill_id in selected_skills:
                 try:
-                    skill = Skill.query.get(int(skill_id))
+                    skill = catalog.by_id.get(int(skill_id))
                     if skill:
                         proficiency = request.form.get(f'skill_proficiency_{skill_id}', 'Expert')
                         skills_data.append({
@@ -196,22 +200,14 @@ def apply_expert():
             
             # Handle file uploads
             cv_file = request.files.get('cv')
-            cv_content = None
-            cv_filename = None
-            cv_mimetype = None
+            cv_upload = None
             if cv_file and cv_file.filename:
-                cv_content = cv_file.read()
-                cv_filename = cv_file.filename
-                cv_mimetype = cv_file.mimetype
+                cv_upload = receive_upload(cv_file, 'cv', 'CV')
             
             exp_proof_file = request.files.get('experience_proof')
-            exp_content = None
-            exp_filename = None
-            exp_mimetype = None
+            exp_upload = None
             if exp_proof_file and exp_proof_file.filename:
-                exp_content = exp_proof_file.read()
-                exp_filename = exp_proof_file.filename
-                exp_mimetype = exp_proof_file.mimetype
+                exp_upload = receive_upload(exp_proof_file, 'experience_proof', 'Experience proof')
             
             # Create application (linked to logged-in user)
             application = InterviewerApplication(
@@ -228,12 +224,12 @@ def apply_expert():
                 skills_json=json.dumps(skills_data),
                 industries_json=json.dumps(selected_industries),
                 certifications_json=json.dumps(certifications_data),
-                cv_content=cv_content,
-                cv_filename=cv_filename,
-                cv_mimetype=cv_mimetype,
-                experience_proof_content=exp_content,
-                experience_proof_filename=exp_filename,
-                experience_proof_mimetype=exp_mimetype,
+                cv_sha256=cv_upload.digest if cv_upload else None,
+                cv_filename=cv_upload.filename if cv_upload else None,
+                cv_mimetype=cv_upload.mimetype if cv_upload else None,
+                experience_proof_sha256=exp_upload.digest if exp_upload else None,
+                experience_proof_filename=exp_upload.filename if exp_upload else None,
+                experience_proof_mimetype=exp_upload.mimetype if exp_upload else None,
                 status='pending',
                 created_user_id=user.id  # Link to existing user
             )
@@ -284,7 +280,7 @@ def profile():
         db.session.add(profile)
         db.session.commit()
     
-    all_skills = Skill.query.order_by(Skill.skill_name).all()
+    all_skills = get_skill_catalog().skills
     reviews = InterviewerReview.query.filter_by(interviewer_id=profile.id, is_public=True).order_by(
         InterviewerReview.created_at.desc()
     ).limit(10).all()
@@ -323,16 +319,12 @@ def edit_profile():
             # Handle CV upload
             cv_file = request.files.get('cv_file')
             if cv_file and cv_file.filename:
-                profile.cv_content = cv_file.read()
-                profile.cv_filename = cv_file.filename
-                profile.cv_mimetype = cv_file.mimetype
+                store_upload(profile, 'cv_content', cv_file, 'cv', 'CV')
             
             # Handle experience proof upload
             exp_file = request.files.get('experience_proof')
             if exp_file and exp_file.filename:
-                profile.experience_proof_content = exp_file.read()
-                profile.experience_proof_filename = exp_file.filename
-                profile.experience_proof_mimetype = exp_file.mimetype
+                store_upload(profile, 'experience_proof_content', exp_file, 'experience_proof', 'Experience proof')
             
             # Update skills
             skill_ids = request.form.getlist('skills')
@@ -379,7 +371,7 @@ def edit_profile():
             db.session.rollback()
             flash(f'Error updating profile: {str(e)}', 'error')
     
-    all_skills = Skill.query.order_by(Skill.skill_name).all()
+    all_skills = get_skill_catalog().skills
     
     return render_template('interviewer/edit_profile.html',
                          user=user,
@@ -577,9 +569,7 @@ def add_certification():
         # Handle certificate file upload
         cert_file = request.files.get('certificate_file')
         if cert_file and cert_file.filename:
-            cert.certificate_content = cert_file.read()
-            cert.certificate_filename = cert_file.filename
-            cert.certificate_mimetype = cert_file.mimetype
+            store_upload(cert, 'certificate_content', cert_file, 'certificate', 'Certificate')
         
         db.session.add(cert)
         db.session.commit()
@@ -733,21 +723,17 @@ def download_cv(profile_id):
     if 'user_id' not in session:
         return redirect(url_for('auth.login'))
     
-    profile = InterviewerProfile.query.get_or_404(profile_id)
+    profile = InterviewerProfile.query.options(undefer_group('file_content')).get_or_404(profile_id)
     
     # Allow download if it's the owner or an employer
     if session['user_id'] != profile.user_id and session['user_type'] not in ['employer', 'admin']:
         flash('Unauthorized access.', 'error')
         return redirect(url_for('main.index'))
     
-    if not profile.cv_content:
+    response = send_stored_file(profile, 'cv_content', profile.cv_filename, profile.cv_mimetype)
+    if response is None:
         flash('CV not found.', 'error')
         return redirect(url_for('interviewer.profile'))
     
-    return send_file(
-        io.BytesIO(profile.cv_content),
-        mimetype=profile.cv_mimetype,
-        as_attachment=True,
-        download_name=profile.cv_filename
-    )
+    return response
 
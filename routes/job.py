@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, send_file
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, send_file, current_app
 from sqlalchemy import and_, or_, func
 from datetime import datetime
 from extensions import db
@@ -6,8 +6,15 @@ from models import (
     User, JobPosting, Company, CandidateProfile, JobApplication, 
     JobRequiredSkill, Skill, ApplicationStatusHistory, InterviewRoom, CandidateSkill, MCQExam
 )
-from services import create_notification, log_activity, calculate_job_match_score
+from services import create_notification, log_activity
+from services.job_matching_service import get_match_score
+from services.job_search_service import (
+    search_hits, count_active_jobs, count_job_facets, experience_condition
+)
+from services.job_index_service import search_jobs, EXPERIENCE_BANDS
+from services.skill_catalog_service import get_skill_catalog
 from services.email_service import send_application_confirmation_email
+from utils.pagination import offset_paginate
 
 job_bp = Blueprint('job', __name__)
 
@@ -21,13 +28,55 @@ def browse_jobs():
     salary_min = request.args.get('min_salary', type=int) or request.args.get('salary_min', type=int)
     skill_id = request.args.get('skill', type=int)
     work_mode = request.args.get('work_mode', '')
-    sort = request.args.get('sort', 'newest')
+    sort = request.args.get('sort', 'relevance' if search else 'newest')
+    
+    if current_app.config.get('JOB_SEARCH_BACKEND', 'memory') == 'memory':
+        # Search box, sidebar filters and facet counts straight from the in-process index
+        jobs, facets, total_jobs = search_jobs(
+            search,
+            page=page,
+            per_page=12,
+            job_types=job_types,
+            experience=experience_level,
+            skill_id=skill_id,
+            location=location,
+            work_mode=work_mode,
+            salary_min=salary_min,
+            sort=sort
+        )
+    else:
+        jobs, facets, total_jobs = _query_browse_jobs(
+            search, location, job_types, work_mode, experience_level, salary_min, skill_id, sort, page
+        )
+    
+    # Get all skills for filter
+    skills = get_skill_catalog().skills
     
+    return render_template('job/browse_jobs.html',
+                         jobs=jobs,
+                         total_jobs=total_jobs,
+                         skills=skills,
+                         search=search,
+                         location=location,
+                         job_types=job_types,
+                         experience_level=experience_level,
+                         salary_min=salary_min,
+                         skill_id=skill_id,
+                         sort=sort,
+                         facets=facets)
+
+
+def _query_browse_jobs(search, location, job_types, work_mode, experience_level, salary_min, skill_id, sort, page):
+    """browse_jobs straight from the database; returns (pagination, facet counts, total active jobs)"""
     query = db.session.query(JobPosting, Company).join(Company).filter(
         JobPosting.is_active == True
     )
     
-    if search:
+    # Full-text index when the database has one, LIKE scan otherwise
+    hits = search_hits(search) if search else None
+    if hits is not None:
+        query = query.join(hits, hits.c.job_id == JobPosting.id)
+    elif search:
         query = query.filter(
             or_(
                 JobPosting.title.ilike(f'%{search}%'),
@@ -39,32 +88,16 @@ def browse_jobs():
     if location:
         query = query.filter(JobPosting.location.ilike(f'%{location}%'))
     
-    if job_types:
-        # Filter by multiple job types
-        query = query.filter(JobPosting.job_type.in_(job_types))
-    
     # Filter by work mode (Remote, Onsite, Hybrid)
     if work_mode:
-        query = query.filter(
-            or_(
-                JobPosting.location.ilike(f'%{work_mode}%'),
-                JobPosting.description.ilike(f'%{work_mode}%')
-            )
-        )
-    
-    if experience_level:
-        exp_ranges = {
-            'entry': (0, 2),
-            'mid': (2, 5),
-            'senior': (5, 50),
-            'executive': (10, 50)
-        }
-        if experience_level in exp_ranges:
-            min_exp, max_exp = exp_ranges[experience_level]
+        work_mode_hits = search_hits(work_mode, columns=('location', 'body'))
+        if work_mode_hits is not None:
+            query = query.join(work_mode_hits, work_mode_hits.c.job_id == JobPosting.id)
+        else:
             query = query.filter(
                 or_(
-                    JobPosting.experience_required.between(min_exp, max_exp),
-                    JobPosting.experience_required == None
+                    JobPosting.location.ilike(f'%{work_mode}%'),
+                    JobPosting.description.ilike(f'%{work_mode}%')
                 )
             )
     
@@ -83,6 +116,16 @@ def browse_jobs():
         ).subquery()
         query = query.filter(JobPosting.id.in_(job_ids_with_skill))
     
+    # Facet counts for everything but job type / experience, then apply those two
+    facets = count_job_facets(query, job_types, experience_level)
+    
+    if job_types:
+        # Filter by multiple job types
+        query = query.filter(JobPosting.job_type.in_(job_types))
+    
+    if experience_level in EXPERIENCE_BANDS:
+        query = query.filter(experience_condition(experience_level))
+    
     # Sorting - Using CASE for MySQL compatibility (MySQL doesn't support NULLS LAST)
     if sort == 'salary_high':
         query = query.order_by(
@@ -95,28 +138,14 @@ def browse_jobs():
             func.coalesce(JobPosting.salary_min, 999999999).asc(),
             JobPosting.created_at.desc()
         )
+    elif sort == 'relevance' and hits is not None:
+        query = query.order_by(hits.c.score.desc(), JobPosting.created_at.desc())
     else:  # newest
         query = query.order_by(JobPosting.created_at.desc())
     
-    jobs = query.paginate(page=page, per_page=12, error_out=False)
-    
-    # Get total jobs count
-    total_jobs = db.session.query(JobPosting).filter(JobPosting.is_active == True).count()
+    jobs = offset_paginate(query, JobPosting.id, page=page, per_page=12)
     
-    # Get all skills for filter
-    skills = Skill.query.order_by(Skill.skill_name).all()
-    
-    return render_template('job/browse_jobs.html',
-                         jobs=jobs,
-                         total_jobs=total_jobs,
-                         skills=skills,
-                         search=search,
-                         location=location,
-                         job_types=job_types,
-                         experience_level=experience_level,
-                         salary_min=salary_min,
-                         skill_id=skill_id,
-                         sort=sort)
+    return jobs, facets, count_active_jobs()
 
 @job_bp.route('/job/<int:job_id>')
 def job_details(job_id):
@@ -145,7 +174,7 @@ def job_details(job_id):
                 job_id=job_id, candidate_id=user.candidate_profile.id
             ).first()
             has_applied = application is not None
-            match_score = calculate_job_match_score(user.candidate_profile.id, job_id)
+            match_score = get_match_score(user.candidate_profile.id, job_id)
     
     # Get related jobs from same company
     related_jobs = JobPosting.query.filter(
@@ -1,8 +1,12 @@
 from flask import Blueprint, render_template, request, redirect, url_for, session
 from datetime import datetime, timedelta
 
+from sqlalchemy.orm.attributes import set_committed_value
+
 from extensions import db
 from models import Notification
+from services.notification_service import get_unread_count, mark_notifications_read
+from utils.pagination import keyset_paginate
 
 bp = Blueprint('notification', __name__)
 
@@ -13,33 +17,29 @@ def notifications():
         return redirect(url_for('auth.login'))
 
     # --- filtering & pagination -------------------------------
-    page        = request.args.get('page', 1, type=int)
+    cursor      = request.args.get('cursor')
     base_q      = Notification.query.filter_by(user_id=session['user_id'])
     if request.args.get('filter') == 'unread':
         base_q = base_q.filter_by(is_read=False)
     if request.args.get('type'):
         base_q = base_q.filter_by(notification_type=request.args['type'])
 
-    notifications = base_q.order_by(Notification.created_at.desc()) \
-                          .paginate(page=page, per_page=20, error_out=False)
+    # Seek on (created_at, id) instead of OFFSET; count at most 1000 rows
+    notifications = keyset_paginate(base_q, (Notification.created_at, Notification.id),
+                                    cursor=cursor, per_page=20, count=1000)
 
     # --- Auto-mark viewed notifications as read ----------------
     # Get IDs of unread notifications on the current page
     unread_ids = [n.id for n in notifications.items if not n.is_read]
     if unread_ids:
-        Notification.query.filter(
-            Notification.id.in_(unread_ids)
-        ).update({'is_read': True}, synchronize_session=False)
-        db.session.commit()
+        mark_notifications_read(session['user_id'], unread_ids)
         # Update the in-memory objects so template reflects the change
         for n in notifications.items:
-            n.is_read = True
+            set_committed_value(n, 'is_read', True)
+        db.session.commit()
 
     # --- Get updated unread count after marking as read --------
-    updated_unread_count = Notification.query.filter_by(
-        user_id=session['user_id'],
-        is_read=False
-    ).count()
+    updated_unread_count = get_unread_count(session['user_id'])
 
     # --- date cut-offs that the template will use --------------
     now            = datetime.utcnow()
@@ -67,7 +67,7 @@ def mark_notification_read(notification_id):
     ).first()
     
     if notification:
-        notification.is_read = True
+        mark_notifications_read(session['user_id'], [notification.id])
         db.session.commit()
         
         if notification.action_url:
@@ -82,9 +82,7 @@ def mark_all_notifications_read():
         return redirect(url_for('auth.login'))
     
     # Mark all unread notifications as read
-    Notification.query.filter_by(
-        user_id=session['user_id'], is_read=False
-    ).update({'is_read': True})
+    mark_notifications_read(session['user_id'])
     
     db.session.commit()
     
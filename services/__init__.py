@@ -1,4 +1,4 @@
-from .notification_service import create_notification, log_activity
-from .job_matching_service import calculate_job_match_score
+from .notification_service import create_notification, create_notifications_bulk, log_activity
+from .job_matching_service import calculate_job_match_score, score_jobs_for_candidate
 
-__all__ = ['create_notification', 'log_activity', 'calculate_job_match_score']
+__all__ = ['create_notification', 'create_notifications_bulk', 'log_activity', 'calculate_job_match_score', 'score_jobs_for_candidate']
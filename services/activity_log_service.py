@@ -0,0 +1,272 @@
+import gzip
+import json
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, text, delete, insert, or_, and_
+from extensions import db
+from models import ActivityLog, ActivityLogDaily
+
+
+def _as_date(value):
+    """func.date() comes back as a string on SQLite"""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _day_start(day):
+    return datetime.combine(day, datetime.min.time())
+
+
+# --- DAILY ROLLUPS ---
+
+def rollup_watermark():
+    """Last day counted in activity_log_daily, or None before the first rollup"""
+    return _as_date(db.session.query(func.max(ActivityLogDaily.day)).scalar())
+
+
+def rollup_activity_logs(until=None):
+    """Count every complete day not rolled up yet (up to ``until``, exclusive; default today).
+
+    Re-counts from the day after the watermark, so running it twice is
+    harmless. Returns the number of days covered.
+    """
+    until = until or datetime.utcnow().date()
+    watermark = rollup_watermark()
+    if watermark is not None:
+        start = watermark + timedelta(days=1)
+    else:
+        first = db.session.query(func.min(ActivityLog.timestamp)).scalar()
+        if first is None:
+            return 0
+        start = _as_date(first)
+    if start >= until:
+        return 0
+
+    day = func.date(ActivityLog.timestamp)
+    rows = db.session.query(
+        day, ActivityLog.table_name, ActivityLog.operation_type, func.count(ActivityLog.id)
+    ).filter(
+        ActivityLog.timestamp >= _day_start(start),
+        ActivityLog.timestamp < _day_start(until)
+    ).group_by(day, ActivityLog.table_name, ActivityLog.operation_type).all()
+
+    db.session.execute(delete(ActivityLogDaily).where(
+        ActivityLogDaily.day >= start, ActivityLogDaily.day < until
+    ))
+    if rows:
+        db.session.execute(insert(ActivityLogDaily), [
+            {'day': _as_date(d), 'table_name': t, 'operation_type': o, 'log_count': c}
+            for d, t, o, c in rows
+        ])
+    db.session.commit()
+    return (until - start).days
+
+
+def activity_counts(date_from=None, date_to=None, table_name=None, operation_type=None, retained_only=False):
+    """``{(table_name, operation_type): count}`` over whole days ``date_from``..``date_to`` (inclusive).
+
+    Rolled-up days come from activity_log_daily; only the days after the
+    watermark (normally just today) touch activity_logs, through the
+    timestamp index. ``retained_only`` skips days that were archived away.
+    """
+    if retained_only:
+        first = db.session.query(func.min(ActivityLog.timestamp)).scalar()
+        if first is None:
+            return Counter()
+        date_from = max(date_from, _as_date(first)) if date_from else _as_date(first)
+    if date_from and date_to and date_from > date_to:
+        return Counter()
+
+    counts = Counter()
+    watermark = rollup_watermark()
+
+    if watermark is not None and (date_from is None or date_from <= watermark):
+        rolled = db.session.query(
+            ActivityLogDaily.table_name, ActivityLogDaily.operation_type, func.sum(ActivityLogDaily.log_count)
+        ).filter(ActivityLogDaily.day <= (min(watermark, date_to) if date_to else watermark))
+        if date_from:
+            rolled = rolled.filter(ActivityLogDaily.day >= date_from)
+        if table_name:
+            rolled = rolled.filter(ActivityLogDaily.table_name == table_name)
+        if operation_type:
+            rolled = rolled.filter(ActivityLogDaily.operation_type == operation_type)
+        for t, o, c in rolled.group_by(ActivityLogDaily.table_name, ActivityLogDaily.operation_type):
+            counts[(t, o)] += int(c or 0)
+
+    # Days not rolled up yet
+    tail_from = watermark + timedelta(days=1) if watermark is not None else None
+    if date_from and (tail_from is None or date_from > tail_from):
+        tail_from = date_from
+    if date_to is None or tail_from is None or tail_from <= date_to:
+        raw = db.session.query(ActivityLog.table_name, ActivityLog.operation_type, func.count(ActivityLog.id))
+        if tail_from:
+            raw = raw.filter(ActivityLog.timestamp >= _day_start(tail_from))
+        if date_to:
+            raw = raw.filter(ActivityLog.timestamp < _day_start(date_to + timedelta(days=1)))
+        if table_name:
+            raw = raw.filter(ActivityLog.table_name == table_name)
+        if operation_type:
+            raw = raw.filter(ActivityLog.operation_type == operation_type)
+        for t, o, c in raw.group_by(ActivityLog.table_name, ActivityLog.operation_type):
+            counts[(t, o)] += c
+
+    return counts
+
+
+def activity_log_tables():
+    """Table names that appear in the audit log, without a DISTINCT over activity_logs"""
+    names = {name for name, in db.session.query(ActivityLogDaily.table_name).distinct()}
+    watermark = rollup_watermark()
+    recent = db.session.query(ActivityLog.table_name).distinct()
+    if watermark is not None:
+        recent = recent.filter(ActivityLog.timestamp >= _day_start(watermark + timedelta(days=1)))
+    names.update(name for name, in recent)
+    return sorted(name for name in names if name)
+
+
+# --- PARTITIONS (MySQL) ---
+# activity_logs is RANGE partitioned by TO_DAYS(timestamp), one partition per
+# month named p_YYYYMM plus a pmax catch-all (migrations/activity_log_storage.sql).
+
+def _to_days(day):
+    """MySQL TO_DAYS() of a date"""
+    return day.toordinal() + 365
+
+
+def _from_days(days):
+    return date.fromordinal(days - 365)
+
+
+def _next_month(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _mysql_partitions():
+    """``[(name, upper bound in TO_DAYS or None for MAXVALUE)]``, empty when not partitioned"""
+    if db.engine.dialect.name != 'mysql':
+        return []
+    rows = db.session.execute(text(
+        "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'activity_logs' AND PARTITION_NAME IS NOT NULL "
+        "ORDER BY PARTITION_ORDINAL_POSITION"
+    )).all()
+    return [(name, None if bound == 'MAXVALUE' else int(bound)) for name, bound in rows]
+
+
+def ensure_partitions(months_ahead=3):
+    """Split pmax so every month up to ``months_ahead`` from now has its own partition.
+
+    Returns the names of the partitions created (none off MySQL or when the
+    table is not partitioned).
+    """
+    partitions = _mysql_partitions()
+    bounds = [bound for name, bound in partitions if bound is not None]
+    if not partitions or partitions[-1][1] is not None or not bounds:
+        return []
+
+    target = datetime.utcnow().date().replace(day=1)
+    for _ in range(months_ahead + 1):
+        target = _next_month(target)
+
+    month = _from_days(max(bounds))
+    new_partitions = []
+    while month < target:
+        new_partitions.append((f'p_{month:%Y%m}', _to_days(_next_month(month))))
+        month = _next_month(month)
+    if not new_partitions:
+        return []
+
+    definitions = ', '.join(f'PARTITION {name} VALUES LESS THAN ({bound})' for name, bound in new_partitions)
+    db.session.execute(text(
+        f'ALTER TABLE activity_logs REORGANIZE PARTITION {partitions[-1][0]} INTO '
+        f'({definitions}, PARTITION {partitions[-1][0]} VALUES LESS THAN MAXVALUE)'
+    ))
+    db.session.commit()
+    return [name for name, bound in new_partitions]
+
+
+# --- RETENTION ---
+
+def archive_path(archive_dir=None):
+    return (archive_dir or current_app.config.get('ACTIVITY_LOG_ARCHIVE_DIR')
+            or os.path.join(current_app.instance_path, 'activity_archive'))
+
+
+def archive_activity_logs(retention_days=None, archive_dir=None, batch_size=1000):
+    """Move logs older than the retention window into gzip JSON-lines files, one per month.
+
+    Rows are rolled up first so the admin counts keep covering them. On a
+    partitioned MySQL table the cutoff is rounded down to a month and the
+    emptied partitions are dropped; elsewhere rows are deleted batch by
+    batch once written. Appending to an existing month file adds a gzip
+    member, which gzip readers handle transparently. Returns the number
+    of rows archived.
+    """
+    retention_days = retention_days or current_app.config.get('ACTIVITY_LOG_RETENTION_DAYS', 365)
+    archive_dir = archive_path(archive_dir)
+    partitions = _mysql_partitions()
+
+    cutoff = datetime.utcnow().date() - timedelta(days=retention_days)
+    if partitions:
+        cutoff = cutoff.replace(day=1)
+    cutoff_at = _day_start(cutoff)
+
+    rollup_activity_logs()
+    os.makedirs(archive_dir, exist_ok=True)
+
+    files = {}
+    archived = 0
+    last = None
+    try:
+        while True:
+            query = ActivityLog.query.filter(ActivityLog.timestamp < cutoff_at)
+            if last is not None:
+                query = query.filter(or_(
+                    ActivityLog.timestamp > last[0],
+                    and_(ActivityLog.timestamp == last[0], ActivityLog.id > last[1])
+                ))
+            batch = query.order_by(ActivityLog.timestamp, ActivityLog.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            for log in batch:
+                month = log.timestamp.strftime('%Y-%m')
+                if month not in files:
+                    files[month] = gzip.open(os.path.join(archive_dir, f'activity_logs_{month}.jsonl.gz'), 'at', encoding='utf-8')
+                files[month].write(json.dumps({
+                    'id': log.id,
+                    'table_name': log.table_name,
+                    'operation_type': log.operation_type,
+                    'record_id': log.record_id,
+                    'old_values': log.old_values,
+                    'new_values': log.new_values,
+                    'user_id': log.user_id,
+                    'timestamp': log.timestamp.isoformat(),
+                }) + '\n')
+            for handle in files.values():
+                handle.flush()
+
+            last = (batch[-1].timestamp, batch[-1].id)
+            archived += len(batch)
+            if not partitions:
+                db.session.execute(delete(ActivityLog).where(
+                    ActivityLog.id.in_([log.id for log in batch])
+                ))
+                db.session.commit()
+            db.session.expunge_all()
+    finally:
+        for handle in files.values():
+            handle.close()
+
+    if partitions:
+        expired = [name for name, bound in partitions if bound is not None and bound <= _to_days(cutoff)]
+        if expired:
+            db.session.execute(text(f'ALTER TABLE activity_logs DROP PARTITION {", ".join(expired)}'))
+            db.session.commit()
+
+    return archived
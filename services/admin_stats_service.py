@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, case, select
+from extensions import db
+from models import User, JobPosting, JobApplication, Skill, Company, InterviewerApplication
+from utils.cache import TTLCache
+
+_stats_cache = TTLCache(default_ttl=60)
+_refresher = None
+_refresher_pid = None
+_refresher_lock = threading.Lock()
+
+
+def _count(model, *criteria):
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+def compute_dashboard_stats():
+    """All admin dashboard counters in three queries.
+
+    "Today" is the current UTC day, compared as a timestamp range so the
+    created_at / applied_at indexes stay usable.
+    """
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # Users per type, with today's sign-ups, in one GROUP BY
+    users_by_type = {}
+    new_users_today = 0
+    for user_type, total, new_today in db.session.query(
+        User.user_type,
+        func.count(User.id),
+        func.sum(case((User.created_at >= today_start, 1), else_=0))
+    ).group_by(User.user_type):
+        users_by_type[user_type] = total
+        new_users_today += int(new_today or 0)
+    
+    # Everything else as scalar subqueries of a single SELECT
+    counts = db.session.execute(select(
+        _count(JobPosting),
+        _count(JobPosting, JobPosting.is_active == True),
+        _count(JobApplication),
+        _count(JobApplication, JobApplication.applied_at >= today_start),
+        _count(Skill),
+        _count(Company),
+        _count(InterviewerApplication, InterviewerApplication.status == 'pending'),
+    )).one()
+    total_jobs, active_jobs, total_applications, new_applications_today, total_skills, total_companies, pending_apps = counts
+    
+    # User registration trends (last 30 days)
+    thirty_days_ago = today_start - timedelta(days=30)
+    daily_registrations = [tuple(row) for row in db.session.query(
+        func.date(User.created_at).label('date'),
+        func.count(User.id).label('count')
+    ).filter(
+        User.created_at >= thirty_days_ago
+    ).group_by(func.date(User.created_at))]
+    
+    stats = {
+        'total_users': sum(users_by_type.values()),
+        'total_candidates': users_by_type.get('candidate', 0),
+        'candidates': users_by_type.get('candidate', 0),
+        'total_employers': users_by_type.get('employer', 0),
+        'employers': users_by_type.get('employer', 0),
+        'total_interviewers': users_by_type.get('interviewer', 0),
+        'interviewers': users_by_type.get('interviewer', 0),
+        'pending_interviewer_apps': pending_apps,
+        'total_jobs': total_jobs,
+        'active_jobs': active_jobs,
+        'total_applications': total_applications,
+        'total_skills': total_skills,
+        'total_companies': total_companies,
+        'new_users_today': new_users_today,
+        'new_applications_today': new_applications_today,
+        'computed_at': datetime.utcnow(),
+    }
+    return stats, daily_registrations
+
+
+def get_dashboard_stats():
+    """``(stats, daily_registrations)``, at most ADMIN_STATS_TTL seconds old"""
+    if current_app.config.get('ADMIN_STATS_BACKGROUND_REFRESH'):
+        _ensure_refresher(current_app._get_current_object())
+    return _stats_cache.get('dashboard', compute_dashboard_stats,
+                            ttl=current_app.config.get('ADMIN_STATS_TTL', 60))
+
+
+def invalidate_dashboard_stats():
+    """Drop the cached counters after an admin change so the dashboard shows it at once.
+
+    Sign-ups, postings and applications from other users are left to
+    ADMIN_STATS_TTL.
+    """
+    _stats_cache.invalidate('dashboard')
+
+
+def _ensure_refresher(app):
+    """Start the thread that recomputes the stats before they expire (once per process)"""
+    global _refresher, _refresher_pid
+    if _refresher is not None and _refresher.is_alive() and _refresher_pid == os.getpid():
+        return
+    with _refresher_lock:
+        if _refresher is not None and _refresher.is_alive() and _refresher_pid == os.getpid():
+            return
+        _refresher_pid = os.getpid()
+        _refresher = threading.Thread(target=_refresh_loop, args=(app,), name='admin-stats-refresher', daemon=True)
+        _refresher.start()
+
+
+def _refresh_loop(app):
+    ttl = app.config.get('ADMIN_STATS_TTL', 60)
+    while True:
+        try:
+            with app.app_context():
+                _stats_cache.set('dashboard', compute_dashboard_stats(), ttl)
+        except Exception:
+            app.logger.exception('Refreshing admin dashboard stats failed')
+        # Refresh well before expiry so readers never hit a cold cache
+        time.sleep(max(ttl / 2, 1))
@@ -0,0 +1,126 @@
+import atexit
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from sqlalchemy import insert
+from extensions import db
+from models import ActivityLog
+
+
+class AuditLogWriter:
+    """Write-behind buffer for activity_logs.
+
+    ``log()`` only appends to an in-memory queue; a background thread writes
+    the queue in multi-row INSERTs every AUDIT_LOG_FLUSH_INTERVAL seconds, or
+    sooner once AUDIT_LOG_BATCH_SIZE entries are waiting. The queue never
+    grows past AUDIT_LOG_MAX_QUEUE: at the cap the caller flushes inline.
+    Whatever is left is flushed at interpreter exit. With AUDIT_LOG_SYNC
+    (tests) every entry is inserted and committed immediately.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+        self._exit_hook = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.sync = app.config.get('AUDIT_LOG_SYNC', False)
+        self.batch_size = app.config.get('AUDIT_LOG_BATCH_SIZE', 200)
+        self.flush_interval = app.config.get('AUDIT_LOG_FLUSH_INTERVAL', 2.0)
+        self.max_queue = app.config.get('AUDIT_LOG_MAX_QUEUE', 10000)
+        if not self._exit_hook:
+            atexit.register(self.close)
+            self._exit_hook = True
+
+    def log(self, table_name, operation_type, record_id, old_values=None, new_values=None, user_id=None):
+        """Queue one audit entry"""
+        row = {
+            'table_name': table_name,
+            'operation_type': operation_type,
+            'record_id': record_id,
+            'old_values': json.dumps(old_values) if old_values else None,
+            'new_values': json.dumps(new_values) if new_values else None,
+            'user_id': user_id,
+            'timestamp': datetime.utcnow(),
+        }
+        
+        if self.app is None or self.sync:
+            db.session.execute(insert(ActivityLog.__table__).values([row]))
+            db.session.commit()
+            return
+        
+        with self._lock:
+            self._queue.append(row)
+            pending = len(self._queue)
+        
+        self._ensure_thread()
+        if pending >= self.max_queue:
+            # Writer is behind; make the caller pay instead of growing the queue
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Write every queued entry now; returns how many were written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return written
+                try:
+                    with self.app.app_context():
+                        with db.engine.begin() as connection:
+                            connection.execute(insert(ActivityLog.__table__).values(batch))
+                except Exception:
+                    self.app.logger.exception('Writing %d audit log entries failed', len(batch))
+                    with self._lock:
+                        # Keep them for the next round if there is room, oldest first
+                        room = max(self.max_queue - len(self._queue), 0)
+                        if room < len(batch):
+                            self.app.logger.error('Dropping %d audit log entries', len(batch) - room)
+                        self._queue.extendleft(reversed(batch[:room]))
+                    return written
+                written += len(batch)
+
+    def close(self):
+        """Stop the writer thread and flush what is left"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval + 5)
+        if self.app is not None and self._queue:
+            self.flush()
+
+    def _ensure_thread(self):
+        # Threads do not survive fork; pre-forking servers start one per worker
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stopping = False
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+audit_log = AuditLogWriter()
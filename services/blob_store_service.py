@@ -0,0 +1,213 @@
+import hashlib
+import mimetypes
+import os
+import tempfile
+import time
+from io import BytesIO
+from flask import send_file
+from sqlalchemy import update
+from extensions import db
+from models import CandidateProfile, Company, InterviewerProfile, InterviewerCertification, InterviewerApplication
+
+CHUNK_SIZE = 64 * 1024
+
+# Every uploaded-file column: (model, legacy bytes column, blob key column)
+BLOB_FIELDS = (
+    (CandidateProfile, 'cv_content', 'cv_sha256'),
+    (Company, 'logo', 'logo_sha256'),
+    (InterviewerProfile, 'cv_content', 'cv_sha256'),
+    (InterviewerProfile, 'experience_proof_content', 'experience_proof_sha256'),
+    (InterviewerCertification, 'certificate_content', 'certificate_sha256'),
+    (InterviewerApplication, 'cv_content', 'cv_sha256'),
+    (InterviewerApplication, 'experience_proof_content', 'experience_proof_sha256'),
+)
+
+# Blob keys of files derived from an upload (thumbnails), kept alive by garbage collection too
+DERIVED_BLOB_FIELDS = (
+    (Company, 'logo_thumb_sha256'),
+)
+
+
+class BlobStore:
+    """Content-addressed file store for uploads.
+
+    A blob lives at ``<root>/<sha[:2]>/<sha[2:4]>/<sha>`` and is never
+    modified, so identical uploads share one file and the hash doubles as
+    a strong ETag. Files are written under a temporary name and renamed
+    into place, so a reader never sees a partial blob. Rows keep only the
+    hash; unreferenced files are removed by ``collect_garbage``.
+    """
+
+    def __init__(self, app=None):
+        self.root = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = app.config.get('BLOB_STORE_DIR') or os.path.join(app.instance_path, 'blobs')
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return bool(digest) and os.path.exists(self.path(digest))
+
+    def put(self, data):
+        """Store ``data`` (bytes or a binary file object); returns its SHA-256 hex digest"""
+        stream = BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        sha = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix='.incoming-')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha.update(chunk)
+                    handle.write(chunk)
+            digest = sha.hexdigest()
+            if self.exists(digest):
+                os.remove(temp_path)
+                # Fresh mtime keeps garbage collection off a blob that is being reused
+                os.utime(self.path(digest))
+            else:
+                os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+                os.replace(temp_path, self.path(digest))
+            return digest
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def open(self, digest):
+        return open(self.path(digest), 'rb')
+
+    def read(self, digest):
+        with self.open(digest) as handle:
+            return handle.read()
+
+    def remove(self, digest):
+        try:
+            os.remove(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def digests(self):
+        """Every stored digest with its modification time"""
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if not name.startswith('.'):
+                    yield name, os.path.getmtime(os.path.join(directory, name))
+
+
+blob_store = BlobStore()
+
+
+def send_blob(digest, legacy_content=None, mimetype=None, download_name=None, as_attachment=True, max_age=None):
+    """Response for a stored upload, or None when there is nothing to send.
+
+    Blob-store files go out through ``send_file`` with the hash as ETag, so
+    conditional (304) and Range requests are answered from disk. Rows not
+    migrated yet fall back to their in-row bytes.
+    """
+    if not mimetype and download_name:
+        mimetype = mimetypes.guess_type(download_name)[0]
+    mimetype = mimetype or 'application/octet-stream'
+
+    if blob_store.exists(digest):
+        return send_file(blob_store.path(digest), mimetype=mimetype, as_attachment=as_attachment,
+                         download_name=download_name, conditional=True, etag=digest, max_age=max_age)
+    if legacy_content:
+        return send_file(BytesIO(legacy_content), mimetype=mimetype, as_attachment=as_attachment,
+                         download_name=download_name, conditional=True,
+                         etag=hashlib.sha256(legacy_content).hexdigest(), max_age=max_age)
+    return None
+
+
+# --- MODEL HELPERS ---
+# ``content_name`` is the legacy bytes column (cv_content, logo, ...); its
+# blob key lives next to it in ``<name>_sha256``.
+
+def _sha_name(content_name):
+    if content_name.endswith('_content'):
+        content_name = content_name[:-len('_content')]
+    return f'{content_name}_sha256'
+
+
+def store_file(instance, content_name, data):
+    """Put ``data`` (bytes or a binary file object) in the store and point ``instance`` at it"""
+    digest = blob_store.put(data)
+    setattr(instance, _sha_name(content_name), digest)
+    setattr(instance, content_name, None)
+    return digest
+
+
+def copy_stored_file(source, target, content_name, target_content_name=None):
+    """Make ``target`` refer to the same file as ``source`` without copying bytes through the row"""
+    target_content_name = target_content_name or content_name
+    digest = getattr(source, _sha_name(content_name))
+    if not digest:
+        legacy = getattr(source, content_name)
+        digest = blob_store.put(legacy) if legacy else None
+    setattr(target, _sha_name(target_content_name), digest)
+    setattr(target, target_content_name, None)
+    return digest
+
+
+def send_stored_file(instance, content_name, download_name=None, mimetype=None, as_attachment=True, max_age=None):
+    """``send_blob`` for a model's file; the row's bytes are only read if it was never migrated"""
+    digest = getattr(instance, _sha_name(content_name))
+    legacy = None if digest else getattr(instance, content_name)
+    return send_blob(digest, legacy, mimetype=mimetype, download_name=download_name,
+                     as_attachment=as_attachment, max_age=max_age)
+
+
+# --- MAINTENANCE ---
+
+def migrate_blobs(batch_size=100):
+    """Move bytes still stored in rows into the blob store.
+
+    Reads only the id and bytes columns, one batch at a time, and commits
+    after each batch. Returns ``{table.column: rows moved}``.
+    """
+    moved = {}
+    for model, content_name, sha_name in BLOB_FIELDS:
+        content = getattr(model, content_name)
+        sha_column = getattr(model, sha_name)
+        count = 0
+        while True:
+            batch = db.session.query(model.id, content).filter(content.isnot(None)).order_by(model.id).limit(batch_size).all()
+            if not batch:
+                break
+            for row_id, data in batch:
+                db.session.execute(update(model).where(model.id == row_id).values({
+                    sha_column: blob_store.put(data), content: None
+                }))
+            db.session.commit()
+            count += len(batch)
+        moved[f'{model.__tablename__}.{content_name}'] = count
+    return moved
+
+
+def referenced_digests():
+    digests = set()
+    for model, content_name, sha_name in BLOB_FIELDS:
+        column = getattr(model, sha_name)
+        digests.update(digest for digest, in db.session.query(column).filter(column.isnot(None)).distinct())
+    for model, sha_name in DERIVED_BLOB_FIELDS:
+        column = getattr(model, sha_name)
+        digests.update(digest for digest, in db.session.query(column).filter(column.isnot(None)).distinct())
+    return digests
+
+
+def collect_garbage(grace_seconds=3600):
+    """Delete blobs no row points at; recent ones are kept for uploads not committed yet"""
+    referenced = referenced_digests()
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    for digest, modified in list(blob_store.digests()):
+        if digest not in referenced and modified < cutoff:
+            blob_store.remove(digest)
+            removed += 1
+    return removed
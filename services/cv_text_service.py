@@ -0,0 +1,379 @@
+import os
+import re
+import threading
+import zipfile
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from xml.etree import ElementTree
+from flask import current_app
+from sqlalchemy import select, table, column, literal, literal_column, func, delete, insert, update, and_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import CandidateProfile, CvDocument, CvSkillMention
+from services.blob_store_service import blob_store
+from services.job_matching_service import refresh_candidate_matches
+from services.job_search_service import split_fulltext_terms
+from services.skill_catalog_service import get_skill_catalog
+from services.upload_service import SNIFF_BYTES, PDF, sniff_mimetype
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # in requirements.txt; without it PDF CVs are marked failed
+    PdfReader = None
+
+# Only the first words of a long search query are used
+MAX_QUERY_TERMS = 16
+# word/document.xml larger than this is not parsed (a DOCX is compressed XML)
+MAX_DOCX_XML_SIZE = 50 * 1024 * 1024
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+# Keeps C++, C#, Node.js and the like in one token
+_TOKEN = re.compile(r'\w[\w+#.]*', re.UNICODE)
+
+_fts = table('cv_documents_fts', column('rowid'))
+_fts_ref = literal_column('cv_documents_fts')
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+# Catalog skill names as token tuples -> skill id, for one catalog version.
+# Names of one or two characters (R, C, Go) only match with the same case.
+_SkillMatcher = namedtuple('_SkillMatcher', 'version phrases exact longest')
+_matcher = None
+
+
+# --- TEXT EXTRACTION ---
+
+def _pdf_text(path):
+    if PdfReader is None:
+        raise ValueError('Reading PDF CVs needs the pypdf package')
+    reader = PdfReader(path)
+    pages = islice(reader.pages, current_app.config.get('CV_MAX_PAGES', 30))
+    return '\n'.join(page.extract_text() or '' for page in pages)
+
+
+def _docx_text(path):
+    with zipfile.ZipFile(path) as archive:
+        try:
+            info = archive.getinfo('word/document.xml')
+        except KeyError:
+            raise ValueError('Not a Word document')
+        if info.file_size > MAX_DOCX_XML_SIZE:
+            raise ValueError('Word document is too large to read')
+
+        paragraphs = []
+        parts = []
+        with archive.open(info) as handle:
+            for _, element in ElementTree.iterparse(handle):
+                tag = element.tag.rsplit('}', 1)[-1]
+                if tag == 't':
+                    parts.append(element.text or '')
+                elif tag == 'tab':
+                    parts.append('\t')
+                elif tag in ('br', 'cr'):
+                    parts.append('\n')
+                elif tag == 'p':
+                    paragraphs.append(''.join(parts))
+                    parts = []
+                    element.clear()
+        return '\n'.join(paragraphs)
+
+
+def extract_text(path):
+    """Plain text of a PDF or DOCX file; raises ValueError for other formats"""
+    with open(path, 'rb') as handle:
+        head = handle.read(SNIFF_BYTES)
+    if sniff_mimetype(head) == PDF:
+        return _pdf_text(path)
+    if zipfile.is_zipfile(path):
+        return _docx_text(path)
+    raise ValueError('Only PDF and DOCX CVs can be read')
+
+
+def _clean_text(text):
+    text = text.replace('\x00', '')
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = re.sub(r' ?\n[ \n]*', '\n', text).strip()
+    return text[:current_app.config.get('CV_TEXT_MAX_CHARS', 200000)]
+
+
+# --- SKILL MENTIONS ---
+
+def _tokens(text):
+    return [token.rstrip('.') for token in _TOKEN.findall(text)]
+
+
+def _skill_matcher():
+    """Phrase lookup over the current skill catalog, rebuilt when the catalog version moves"""
+    global _matcher
+    catalog = get_skill_catalog()
+    matcher = _matcher
+    if matcher is None or matcher.version != catalog.version:
+        phrases = {}
+        exact = {}
+        for skill in catalog.skills:
+            tokens = _tokens(skill.skill_name)
+            if len(skill.skill_name) <= 2 and len(tokens) == 1:
+                exact.setdefault(tokens[0], skill.id)
+            elif tokens:
+                phrases.setdefault(tuple(token.lower() for token in tokens), skill.id)
+        longest = max((len(phrase) for phrase in phrases), default=1)
+        matcher = _matcher = _SkillMatcher(catalog.version, phrases, exact, longest)
+    return matcher
+
+
+def find_skill_mentions(text, matcher=None):
+    """``Counter`` of catalog skill id -> how often the skill is named in ``text``"""
+    matcher = matcher or _skill_matcher()
+    tokens = _tokens(text)
+    lowered = [token.lower() for token in tokens]
+    found = Counter()
+    for i, token in enumerate(tokens):
+        if token in matcher.exact:
+            found[matcher.exact[token]] += 1
+        for n in range(1, min(matcher.longest, len(tokens) - i) + 1):
+            skill_id = matcher.phrases.get(tuple(lowered[i:i + n]))
+            if skill_id:
+                found[skill_id] += 1
+    return found
+
+
+def _store_mentions(document, matcher=None):
+    """Replace the skill mentions of a document from its text; the caller commits"""
+    matcher = matcher or _skill_matcher()
+    mentions = find_skill_mentions(document.body or '', matcher)
+    db.session.execute(delete(CvSkillMention).where(CvSkillMention.document_id == document.id))
+    if mentions:
+        db.session.execute(insert(CvSkillMention), [
+            {'document_id': document.id, 'skill_id': skill_id, 'mentions': count}
+            for skill_id, count in mentions.items()
+        ])
+    document.skills_version = matcher.version
+
+
+def _refresh_profiles_using(digest):
+    """Recompute the stored match scores of every profile whose CV is ``digest``"""
+    candidate_ids = [candidate_id for (candidate_id,) in db.session.query(CandidateProfile.id).filter(
+        CandidateProfile.cv_sha256 == digest
+    )]
+    for candidate_id in candidate_ids:
+        refresh_candidate_matches(candidate_id)
+
+
+# --- PIPELINE ---
+
+def _get_executor():
+    """Worker pool for extraction, recreated in a forked child"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor_pid = os.getpid()
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get('CV_EXTRACT_WORKERS', 1),
+                thread_name_prefix='cv-extract'
+            )
+        return _executor
+
+
+def extract_document(document_id):
+    """Extract, store and skill-match the text of one CvDocument.
+
+    The row is claimed first (pending/failed -> processing), so a file is
+    only worked on once at a time; returns False when it could not be
+    claimed. Failures are recorded on the row rather than raised.
+    """
+    claimed = db.session.execute(update(CvDocument).where(
+        CvDocument.id == document_id,
+        CvDocument.status.in_(['pending', 'failed'])
+    ).values(status='processing', error=None))
+    db.session.commit()
+    if not claimed.rowcount:
+        return False
+
+    document = db.session.get(CvDocument, document_id)
+    try:
+        if not blob_store.exists(document.sha256):
+            raise ValueError('CV file is not in the blob store')
+        body = _clean_text(extract_text(blob_store.path(document.sha256)))
+    except Exception as e:
+        current_app.logger.warning('CV text extraction failed for %s: %s', document.sha256, e)
+        document.status = 'failed'
+        document.error = str(e)[:255]
+        document.extracted_at = datetime.utcnow()
+        db.session.commit()
+        return True
+
+    document.body = body
+    _store_mentions(document)
+    document.status = 'done'
+    document.extracted_at = datetime.utcnow()
+    db.session.commit()
+
+    _refresh_profiles_using(document.sha256)
+    return True
+
+
+def _run_extraction(app, document_id):
+    with app.app_context():
+        try:
+            extract_document(document_id)
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception('CV extraction job %s failed', document_id)
+        finally:
+            db.session.remove()
+
+
+def _submit(document_id):
+    if current_app.config.get('CV_EXTRACT_SYNC'):
+        extract_document(document_id)
+    else:
+        _get_executor().submit(_run_extraction, current_app._get_current_object(), document_id)
+
+
+def index_candidate_cv(profile):
+    """Make a newly uploaded CV searchable and count its skills in matching.
+
+    Call after the upload is committed. A file extracted before is not
+    parsed again: its stored text and skills apply at once. A new file is
+    extracted on the worker pool (inline with CV_EXTRACT_SYNC), which then
+    refreshes the match scores of every profile using it. Returns the
+    CvDocument, or None when the profile has no stored CV.
+    """
+    digest = profile.cv_sha256
+    if not digest:
+        return None
+
+    document = CvDocument.query.filter_by(sha256=digest).first()
+    if document is None:
+        document = CvDocument(sha256=digest, status='pending')
+        db.session.add(document)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Uploaded at the same time elsewhere; that request queues it
+            db.session.rollback()
+            return CvDocument.query.filter_by(sha256=digest).first()
+    elif document.status == 'done':
+        refresh_candidate_matches(profile.id)
+        return document
+    elif document.status != 'failed':
+        return document
+
+    _submit(document.id)
+    return document
+
+
+def extract_pending_cvs(retry_processing=False):
+    """Extract every stored CV without text, inline; returns ``(done, failed)``.
+
+    Creates documents for profile CVs uploaded before extraction existed,
+    then works through pending and failed ones. ``retry_processing`` also
+    picks up rows left in 'processing' by a worker that stopped.
+    """
+    known = select(CvDocument.sha256)
+    for (digest,) in db.session.query(CandidateProfile.cv_sha256).filter(
+        CandidateProfile.cv_sha256.isnot(None),
+        CandidateProfile.cv_sha256.not_in(known)
+    ).distinct().all():
+        db.session.add(CvDocument(sha256=digest, status='pending'))
+    if retry_processing:
+        db.session.execute(update(CvDocument).where(CvDocument.status == 'processing').values(status='pending'))
+    db.session.commit()
+
+    document_ids = [document_id for (document_id,) in db.session.query(CvDocument.id).filter(
+        CvDocument.status.in_(['pending', 'failed'])
+    ).order_by(CvDocument.id)]
+    for document_id in document_ids:
+        extract_document(document_id)
+
+    counts = dict(db.session.query(CvDocument.status, func.count(CvDocument.id)).filter(
+        CvDocument.id.in_(document_ids)
+    ).group_by(CvDocument.status).all()) if document_ids else {}
+    return counts.get('done', 0), counts.get('failed', 0)
+
+
+def rematch_cv_skills(batch_size=100):
+    """Re-find skill mentions in extracted CVs matched against an older skill catalog.
+
+    Works from the stored text, so nothing is parsed again. Returns the
+    number of documents updated.
+    """
+    matcher = _skill_matcher()
+    updated = 0
+    last_id = 0
+    while True:
+        documents = CvDocument.query.filter(
+            CvDocument.id > last_id,
+            CvDocument.status == 'done',
+            (CvDocument.skills_version != matcher.version) | CvDocument.skills_version.is_(None)
+        ).order_by(CvDocument.id).limit(batch_size).all()
+        if not documents:
+            return updated
+        for document in documents:
+            _store_mentions(document, matcher)
+        db.session.commit()
+        for document in documents:
+            _refresh_profiles_using(document.sha256)
+        updated += len(documents)
+        last_id = documents[-1].id
+
+
+# --- SEARCH ---
+
+def _query_terms(query):
+    return _WORD.findall((query or '').lower())[:MAX_QUERY_TERMS]
+
+
+def cv_search_hits(query):
+    """Subquery of ``(document_id, score)`` for CVs containing every word of ``query``.
+
+    Words are prefix-matched; higher ``score`` is more relevant. Returns
+    ``None`` when the database has no full-text backend or ``query`` has no
+    searchable words.
+    """
+    terms = _query_terms(query)
+    if not terms or db.engine.dialect.name not in ('mysql', 'sqlite'):
+        return None
+
+    if db.engine.dialect.name == 'mysql':
+        indexed, unindexed = split_fulltext_terms(terms)
+        # Words the index cannot see ("Go", "C", "AI") are matched with LIKE
+        conditions = [CvDocument.body.contains(term, autoescape=True) for term in unindexed]
+        if indexed:
+            relevance = match(CvDocument.body, against=' '.join(f'+{term}*' for term in indexed)).in_boolean_mode()
+            conditions.insert(0, relevance)
+        else:
+            relevance = literal(0)
+        return select(
+            CvDocument.id.label('document_id'),
+            relevance.label('score')
+        ).where(*conditions).subquery()
+
+    # SQLite FTS5: bm25() is lower-is-better, so negate it
+    fts_query = ' '.join(f'"{term}"*' for term in terms)
+    return select(
+        _fts.c.rowid.label('document_id'),
+        (-func.bm25(_fts_ref)).label('score')
+    ).where(_fts_ref.op('MATCH')(fts_query)).subquery()
+
+
+def cv_text_condition(query):
+    """Filter on CandidateProfile: the candidate's CV text contains every word of ``query``.
+
+    Returns ``None`` when ``query`` has no searchable words. Without a
+    full-text backend the words are matched with LIKE.
+    """
+    terms = _query_terms(query)
+    if not terms:
+        return None
+    hits = cv_search_hits(query)
+    if hits is not None:
+        matching = select(CvDocument.sha256).join(hits, hits.c.document_id == CvDocument.id)
+    else:
+        matching = select(CvDocument.sha256).where(and_(*[CvDocument.body.contains(term) for term in terms]))
+    return CandidateProfile.cv_sha256.in_(matching.where(CvDocument.status == 'done'))
@@ -0,0 +1,372 @@
+import csv
+import gzip
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, update
+from extensions import db, socketio
+from models import (
+    User, CandidateProfile, Company, JobPosting, JobApplication, Skill,
+    CandidateSkill, JobRequiredSkill, ExportJob
+)
+from utils.aggregates import counts_by
+
+# Rows per round trip: the cursor batch when streaming, the key range of a background batch
+EXPORT_BATCH_SIZE = 1000
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+# Jobs submitted to this process's pool that no worker has picked up yet
+_waiting = set()
+
+
+def _csv_datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def export_timestamp():
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+# --- EXPORT DEFINITIONS ---
+# Exports select plain columns (no ORM objects piling up in the session) and
+# map each result tuple to a CSV row. ``key`` is the primary key the export
+# walks; ``query(key_range)`` restricts every part of the statement, joined
+# aggregates included, to ``low < key <= high`` so background jobs can read
+# one batch per short transaction.
+
+ExportDefinition = namedtuple('ExportDefinition', 'header query row key')
+
+
+def _key_range(column, key_range):
+    if key_range is None:
+        return []
+    low, high = key_range
+    criteria = []
+    if low is not None:
+        criteria.append(column > low)
+    if high is not None:
+        criteria.append(column <= high)
+    return criteria
+
+
+def _users_query(key_range=None):
+    return db.session.query(
+        User.id, User.email, User.user_type, User.first_name, User.last_name, User.phone,
+        User.created_at, User.last_login, User.is_active,
+        CandidateProfile.experience_years, CandidateProfile.education_level,
+        Company.company_name, Company.industry
+    ).outerjoin(
+        CandidateProfile, User.id == CandidateProfile.user_id
+    ).outerjoin(
+        Company, User.id == Company.user_id
+    ).filter(*_key_range(User.id, key_range)).order_by(User.id)
+
+
+def _users_row(user):
+    (user_id, email, user_type, first_name, last_name, phone, created_at, last_login, is_active,
+     experience_years, education_level, company_name, industry) = user
+    return [
+        user_id,
+        email,
+        user_type,
+        first_name,
+        last_name,
+        phone or '',
+        _csv_datetime(created_at),
+        _csv_datetime(last_login),
+        str(is_active),
+        experience_years if experience_years is not None else '',
+        education_level or '',
+        company_name or '',
+        industry or ''
+    ]
+
+
+def _jobs_query(key_range=None):
+    # Application counts for every job in one GROUP BY, joined into the streaming query
+    app_counts = counts_by(JobApplication.job_id, *_key_range(JobApplication.job_id, key_range))
+    return db.session.query(
+        JobPosting.id, JobPosting.title, Company.company_name, JobPosting.location, JobPosting.job_type,
+        JobPosting.experience_required, JobPosting.salary_min, JobPosting.salary_max,
+        JobPosting.created_at, JobPosting.is_active, func.coalesce(app_counts.c.count, 0)
+    ).join(Company).outerjoin(
+        app_counts, app_counts.c.key == JobPosting.id
+    ).filter(*_key_range(JobPosting.id, key_range)).order_by(JobPosting.id)
+
+
+def _jobs_row(job):
+    (job_id, title, company_name, location, job_type, experience_required,
+     salary_min, salary_max, created_at, is_active, applications) = job
+    return [
+        job_id,
+        title,
+        company_name,
+        location or '',
+        job_type or '',
+        experience_required,
+        salary_min if salary_min else '',
+        salary_max if salary_max else '',
+        _csv_datetime(created_at),
+        str(is_active),
+        applications
+    ]
+
+
+def _applications_query(key_range=None):
+    return db.session.query(
+        JobApplication.id, JobPosting.title, Company.company_name, User.first_name, User.last_name,
+        User.email, JobApplication.application_status, JobApplication.applied_at, JobApplication.exam_score
+    ).join(
+        JobPosting, JobApplication.job_id == JobPosting.id
+    ).join(
+        Company, JobPosting.company_id == Company.id
+    ).join(
+        CandidateProfile, JobApplication.candidate_id == CandidateProfile.id
+    ).join(
+        User, CandidateProfile.user_id == User.id
+    ).filter(*_key_range(JobApplication.id, key_range)).order_by(JobApplication.id)
+
+
+def _applications_row(application):
+    (application_id, job_title, company_name, first_name, last_name, email,
+     status, applied_at, exam_score) = application
+    return [
+        application_id,
+        job_title,
+        company_name,
+        f"{first_name} {last_name}",
+        email,
+        status,
+        _csv_datetime(applied_at),
+        exam_score if exam_score else ''
+    ]
+
+
+def _skills_query(key_range=None):
+    # Usage by candidates and by jobs, each one GROUP BY joined into the streaming query
+    candidate_uses = counts_by(CandidateSkill.skill_id, *_key_range(CandidateSkill.skill_id, key_range))
+    job_uses = counts_by(JobRequiredSkill.skill_id, *_key_range(JobRequiredSkill.skill_id, key_range))
+    return db.session.query(
+        Skill.id, Skill.skill_name, Skill.category, Skill.description,
+        func.coalesce(candidate_uses.c.count, 0), func.coalesce(job_uses.c.count, 0)
+    ).outerjoin(
+        candidate_uses, candidate_uses.c.key == Skill.id
+    ).outerjoin(
+        job_uses, job_uses.c.key == Skill.id
+    ).filter(*_key_range(Skill.id, key_range)).order_by(Skill.category, Skill.skill_name)
+
+
+def _skills_row(skill):
+    skill_id, skill_name, category, description, candidate_count, job_count = skill
+    return [
+        skill_id,
+        skill_name,
+        category or '',
+        description or '',
+        candidate_count + job_count
+    ]
+
+
+EXPORTS = {
+    'users': ExportDefinition(
+        ['ID', 'Email', 'User Type', 'First Name', 'Last Name', 'Phone', 'Created At', 'Last Login',
+         'Is Active', 'Experience Years', 'Education Level', 'Company Name', 'Industry'],
+        _users_query, _users_row, User.id
+    ),
+    'jobs': ExportDefinition(
+        ['Job ID', 'Title', 'Company', 'Location', 'Job Type', 'Experience Required', 'Salary Min',
+         'Salary Max', 'Created At', 'Is Active', 'Applications Count'],
+        _jobs_query, _jobs_row, JobPosting.id
+    ),
+    'applications': ExportDefinition(
+        ['Application ID', 'Job Title', 'Company', 'Candidate Name', 'Candidate Email', 'Status',
+         'Applied At', 'Exam Score'],
+        _applications_query, _applications_row, JobApplication.id
+    ),
+    'skills': ExportDefinition(
+        ['Skill ID', 'Skill Name', 'Category', 'Description', 'Usage Count'],
+        _skills_query, _skills_row, Skill.id
+    ),
+}
+
+
+def export_rows(data_type):
+    """CSV rows of an export, fetched in batches from a server-side cursor"""
+    definition = EXPORTS[data_type]
+    for values in definition.query().yield_per(EXPORT_BATCH_SIZE):
+        yield definition.row(values)
+
+
+def export_batches(data_type, batch_size=EXPORT_BATCH_SIZE):
+    """CSV rows of an export in lists of about ``batch_size``, in key order.
+
+    Each batch first finds its upper key through the primary key index,
+    then reads that key range; the transaction ends between batches, so a
+    long export holds no cursor or snapshot open.
+    """
+    definition = EXPORTS[data_type]
+    low = None
+    while True:
+        keys = db.session.query(definition.key).order_by(definition.key)
+        if low is not None:
+            keys = keys.filter(definition.key > low)
+        high = keys.offset(batch_size - 1).limit(1).scalar()
+
+        batch = definition.query((low, high)).order_by(None).order_by(definition.key).all()
+        db.session.rollback()
+        if not batch:
+            return
+        yield [definition.row(values) for values in batch]
+        if high is None:
+            return
+        low = high
+
+
+# --- BACKGROUND EXPORT JOBS ---
+
+def export_dir():
+    return current_app.config.get('EXPORT_DIR') or os.path.join(current_app.instance_path, 'exports')
+
+
+def _get_executor():
+    """Worker pool for export jobs, recreated in a forked child"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor_pid = os.getpid()
+            _waiting.clear()
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get('EXPORT_WORKERS', 2),
+                thread_name_prefix='export-worker'
+            )
+        return _executor
+
+
+def start_export(data_type, user_id):
+    """Queue an export of ``data_type`` for ``user_id``; returns the ExportJob"""
+    if data_type not in EXPORTS:
+        raise ValueError(f'Invalid export type: {data_type}')
+
+    job = ExportJob(data_type=data_type, status='queued', requested_by=user_id, heartbeat_at=datetime.utcnow())
+    db.session.add(job)
+    db.session.commit()
+
+    executor = _get_executor()
+    with _executor_lock:
+        _waiting.add(job.id)
+    executor.submit(_run_export, current_app._get_current_object(), job.id)
+    return job
+
+
+def _set_progress(job_id, **values):
+    """Write job state on its own connection, outside the exporting session's transaction.
+
+    Also refreshes the heartbeat of the jobs queued behind it in this
+    process: they are alive for as long as the pool is.
+    """
+    values['heartbeat_at'] = datetime.utcnow()
+    with _executor_lock:
+        waiting = list(_waiting)
+    with db.engine.begin() as connection:
+        connection.execute(update(ExportJob).where(ExportJob.id == job_id).values(**values))
+        if waiting:
+            connection.execute(update(ExportJob).where(
+                ExportJob.id.in_(waiting), ExportJob.status == 'queued'
+            ).values(heartbeat_at=values['heartbeat_at']))
+
+
+def _emit_progress(job):
+    if job['requested_by']:
+        from realtime import user_room
+        socketio.emit('export_progress', job, to=user_room(job['requested_by']))
+
+
+def _run_export(app, job_id):
+    with _executor_lock:
+        _waiting.discard(job_id)
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if job is None or job.status != 'queued':
+            return
+        definition = EXPORTS[job.data_type]
+        requested_by = job.requested_by
+        data_type = job.data_type
+
+        directory = export_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{data_type}_export_{job_id}_{export_timestamp()}.csv.gz')
+        partial = path + '.part'
+
+        state = {'id': job_id, 'data_type': data_type, 'requested_by': requested_by, 'status': 'running'}
+        try:
+            total = db.session.query(func.count(definition.key)).scalar()
+            db.session.rollback()
+            _set_progress(job_id, status='running', started_at=datetime.utcnow(), total_rows=total)
+            state.update(total_rows=total, rows_written=0)
+            _emit_progress(state)
+
+            interval = app.config.get('EXPORT_PROGRESS_INTERVAL', 1.0)
+            written = 0
+            last_report = time.monotonic()
+
+            with gzip.open(partial, 'wt', encoding='utf-8', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(definition.header)
+                for batch in export_batches(data_type):
+                    writer.writerows(batch)
+                    written += len(batch)
+                    if time.monotonic() - last_report >= interval:
+                        last_report = time.monotonic()
+                        _set_progress(job_id, rows_written=written)
+                        state['rows_written'] = written
+                        _emit_progress(state)
+
+            os.replace(partial, path)
+            _set_progress(job_id, status='completed', rows_written=written, file_path=path,
+                          file_size=os.path.getsize(path), finished_at=datetime.utcnow())
+            state.update(status='completed', rows_written=written)
+
+        except Exception as e:
+            db.session.rollback()
+            if os.path.exists(partial):
+                os.remove(partial)
+            current_app.logger.exception('Export job %s failed', job_id)
+            _set_progress(job_id, status='failed', error=str(e), finished_at=datetime.utcnow())
+            state.update(status='failed', error=str(e))
+
+        finally:
+            db.session.remove()
+
+        _emit_progress(state)
+
+
+def expire_stale_exports():
+    """Mark jobs whose worker went away (process restart) as failed.
+
+    A running job updates heartbeat_at at least every few seconds, and
+    refreshes the jobs queued behind it in the same process, so a queued
+    job stays alive however long it waits. Anything quiet for
+    EXPORT_STALE_AFTER seconds belongs to a process that is gone.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config.get('EXPORT_STALE_AFTER', 900))
+    expired = db.session.execute(update(ExportJob).where(
+        ExportJob.status.in_(['queued', 'running']),
+        # Jobs queued before heartbeats were set on submit only have created_at
+        func.coalesce(ExportJob.heartbeat_at, ExportJob.created_at) < cutoff
+    ).values(status='failed', error='Export worker stopped', finished_at=datetime.utcnow()))
+    db.session.commit()
+    return expired.rowcount
+
+
+def delete_export(job):
+    """Remove a job and its artifact"""
+    if job.file_path and os.path.exists(job.file_path):
+        os.remove(job.file_path)
+    db.session.delete(job)
+    db.session.commit()
@@ -0,0 +1,544 @@
+import math
+import os
+import pickle
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from flask import current_app
+from flask_sqlalchemy.pagination import Pagination
+from sqlalchemy import func, inspect
+from extensions import db
+from models import JobPosting, Company, JobRequiredSkill, Skill
+from utils.cache import watch_writes, ALL_ROWS
+
+# Same bands as the browse_jobs experience filter (bounds inclusive)
+EXPERIENCE_BANDS = {
+    'entry': (0, 2),
+    'mid': (2, 5),
+    'senior': (5, 50),
+    'executive': (10, 50)
+}
+
+FACETS = ('job_type', 'experience', 'skill', 'location')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Bump when the pickled layout changes so old files are rebuilt, not loaded
+INDEX_FORMAT = 2
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return _WORD.findall((text or '').lower())
+
+
+def _bitset(docnos):
+    """Bitset (an int) with the given doc numbers set"""
+    docnos = list(docnos)
+    if not docnos:
+        return 0
+    buf = bytearray(max(docnos) // 8 + 1)
+    for docno in docnos:
+        buf[docno >> 3] |= 1 << (docno & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def _members(bitset):
+    """Doc numbers set in a bitset, ascending"""
+    bits = bin(bitset)[:1:-1]
+    return [docno for docno, bit in enumerate(bits) if bit == '1']
+
+
+class JobIndex:
+    """Inverted index over active job postings with BM25 ranking and facet bitsets.
+
+    Every posting gets a doc number; term postings map doc numbers to term
+    frequencies, facets map each value to a bitset of doc numbers. Doc
+    numbers of removed postings are left unused until the next full build.
+    """
+
+    def __init__(self):
+        self.job_ids = []        # docno -> job_id, None once removed
+        self.docnos = {}         # job_id -> docno
+        self.postings = {}       # term -> {docno: term frequency}
+        self.doc_terms = []      # docno -> Counter of terms
+        self.description_postings = {}  # term -> docnos with it in the description (work-mode filter)
+        self.description_terms = []     # docno -> frozenset of description terms
+        self.doc_lengths = []
+        self.total_length = 0
+        self.live = 0            # bitset of indexed postings
+        self.facets = {name: {} for name in FACETS}
+        self.doc_facets = []     # docno -> {facet: values}
+        self.sort_keys = []      # docno -> (created_at timestamp, salary_min, salary_max)
+        self.signature = None
+        self.built_at = time.time()
+        self._vocabulary = None
+        self._salary_masks = {}
+
+    # --- building ---
+
+    @classmethod
+    def build(cls, documents):
+        index = cls()
+        facet_docs = {name: {} for name in FACETS}
+        for document in documents:
+            docno = index._add_document(document)
+            for name, values in index.doc_facets[docno].items():
+                for value in values:
+                    facet_docs[name].setdefault(value, []).append(docno)
+        index.live = _bitset(index.docnos.values())
+        index.facets = {
+            name: {value: _bitset(docnos) for value, docnos in values.items()}
+            for name, values in facet_docs.items()
+        }
+        return index
+
+    def _add_document(self, document):
+        docno = len(self.job_ids)
+        self.job_ids.append(document['job_id'])
+        self.docnos[document['job_id']] = docno
+
+        # Title words count twice
+        terms = Counter(tokenize(document['title']) * 2)
+        for field in ('description', 'requirements', 'company_name'):
+            terms.update(tokenize(document.get(field)))
+        for _, skill_name in document['skills']:
+            terms.update(tokenize(skill_name))
+
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[docno] = frequency
+        self.doc_terms.append(terms)
+        description_terms = frozenset(tokenize(document.get('description')))
+        for term in description_terms:
+            self.description_postings.setdefault(term, set()).add(docno)
+        self.description_terms.append(description_terms)
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+
+        experience = document['experience_required']
+        self.doc_facets.append({
+            'job_type': [document['job_type'].lower()] if document['job_type'] else [],
+            # Postings without an experience requirement show up in every band
+            'experience': [
+                band for band, (low, high) in EXPERIENCE_BANDS.items()
+                if experience is None or low <= experience <= high
+            ],
+            'skill': sorted({skill_id for skill_id, _ in document['skills']}),
+            'location': [document['location'].strip().lower()] if document['location'] else [],
+        })
+        created_at = document['created_at']
+        self.sort_keys.append((
+            created_at.timestamp() if created_at else 0.0,
+            float(document['salary_min']) if document['salary_min'] is not None else None,
+            float(document['salary_max']) if document['salary_max'] is not None else None,
+        ))
+        self._vocabulary = None
+        self._salary_masks = {}
+        return docno
+
+    def add(self, document):
+        """Index (or re-index) one posting"""
+        self.remove(document['job_id'])
+        docno = self._add_document(document)
+        bit = 1 << docno
+        self.live |= bit
+        for name, values in self.doc_facets[docno].items():
+            for value in values:
+                self.facets[name][value] = self.facets[name].get(value, 0) | bit
+
+    def remove(self, job_id):
+        """Drop a posting from the index; unknown ids are ignored"""
+        docno = self.docnos.pop(job_id, None)
+        if docno is None:
+            return
+        bit = 1 << docno
+        self.live &= ~bit
+        self.job_ids[docno] = None
+
+        for term in self.doc_terms[docno]:
+            postings = self.postings[term]
+            postings.pop(docno, None)
+            if not postings:
+                del self.postings[term]
+                self._vocabulary = None
+        self.total_length -= self.doc_lengths[docno]
+        self.doc_terms[docno] = Counter()
+        self.doc_lengths[docno] = 0
+        for term in self.description_terms[docno]:
+            docnos = self.description_postings[term]
+            docnos.discard(docno)
+            if not docnos:
+                del self.description_postings[term]
+        self.description_terms[docno] = frozenset()
+
+        for name, values in self.doc_facets[docno].items():
+            for value in values:
+                remaining = self.facets[name].get(value, 0) & ~bit
+                if remaining:
+                    self.facets[name][value] = remaining
+                else:
+                    self.facets[name].pop(value, None)
+        self.doc_facets[docno] = {}
+        self._salary_masks = {}
+
+    @property
+    def size(self):
+        return len(self.docnos)
+
+    # --- querying ---
+
+    def _expand(self, term):
+        """Indexed terms starting with ``term`` (prefix match)"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        position = bisect_left(vocabulary, term)
+        matches = []
+        while position < len(vocabulary) and vocabulary[position].startswith(term):
+            matches.append(vocabulary[position])
+            position += 1
+        return matches
+
+    def _text_matches(self, query):
+        """``{docno: bm25 score}`` for postings containing every query word"""
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        n = max(self.size, 1)
+        average_length = (self.total_length / n) or 1.0
+        scores = None
+        for term in dict.fromkeys(terms):
+            term_scores = {}
+            for expansion in self._expand(term):
+                postings = self.postings[expansion]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for docno, frequency in postings.items():
+                    norm = frequency + K1 * (1 - B + B * self.doc_lengths[docno] / average_length)
+                    term_scores[docno] = term_scores.get(docno, 0.0) + idf * frequency * (K1 + 1) / norm
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {docno: score + term_scores[docno] for docno, score in scores.items() if docno in term_scores}
+            if not scores:
+                return {}
+        return scores
+
+    def _salary_mask(self, salary_min):
+        """Postings whose minimum or maximum salary reaches ``salary_min``"""
+        mask = self._salary_masks.get(salary_min)
+        if mask is None:
+            mask = _bitset(
+                docno for docno in self.docnos.values()
+                if any(value is not None and value >= salary_min for value in self.sort_keys[docno][1:])
+            )
+            self._salary_masks[salary_min] = mask
+        return mask
+
+    def _description_mask(self, text):
+        """Postings whose description has every word of ``text`` (prefix match)"""
+        mask = None
+        for term in dict.fromkeys(tokenize(text)):
+            docnos = set()
+            for expansion in self._expand(term):
+                docnos |= self.description_postings.get(expansion, set())
+            mask = _bitset(docnos) if mask is None else mask & _bitset(docnos)
+        return mask or 0
+
+    def _substring_mask(self, needle):
+        needle = needle.strip().lower()
+        mask = 0
+        for value, bitset in self.facets['location'].items():
+            if needle in value:
+                mask |= bitset
+        return mask
+
+    def search(self, query='', job_types=None, experience=None, skill_id=None,
+               location=None, work_mode=None, salary_min=None, sort='newest'):
+        """Run a browse_jobs search against the index.
+
+        Returns ``(job_ids, facet_counts)``: all matching job ids in display
+        order, and ``{facet: {value: count}}`` where each facet is counted
+        with every filter applied except its own.
+        """
+        matches = self._text_matches(query)
+        base = _bitset(matches) & self.live if matches is not None else self.live
+
+        # One mask per facet filter; None means the facet isn't filtered
+        masks = dict.fromkeys(FACETS)
+        if job_types:
+            masks['job_type'] = 0
+            for job_type in job_types:
+                masks['job_type'] |= self.facets['job_type'].get(job_type.lower(), 0)
+        if experience in EXPERIENCE_BANDS:
+            masks['experience'] = self.facets['experience'].get(experience, 0)
+        if skill_id:
+            masks['skill'] = self.facets['skill'].get(skill_id, 0)
+        if location:
+            masks['location'] = self._substring_mask(location)
+
+        if work_mode:
+            # Location or description only, like the database search
+            base &= self._description_mask(work_mode) | self._substring_mask(work_mode)
+        if salary_min:
+            base &= self._salary_mask(salary_min)
+
+        result = base
+        for mask in masks.values():
+            if mask is not None:
+                result &= mask
+
+        facet_counts = {}
+        for name in FACETS:
+            scope = base
+            for other, mask in masks.items():
+                if other != name and mask is not None:
+                    scope &= mask
+            counts = {}
+            for value, bitset in self.facets[name].items():
+                count = (scope & bitset).bit_count()
+                if count:
+                    counts[value] = count
+            facet_counts[name] = counts
+
+        docnos = _members(result)
+        keys = self.sort_keys
+        if sort == 'relevance' and matches:
+            docnos.sort(key=lambda d: (-matches[d], -keys[d][0]))
+        elif sort == 'salary_high':
+            docnos.sort(key=lambda d: (-(keys[d][2] or 0), -keys[d][0]))
+        elif sort == 'salary_low':
+            docnos.sort(key=lambda d: (keys[d][1] if keys[d][1] is not None else 999999999, -keys[d][0]))
+        else:  # newest
+            docnos.sort(key=lambda d: -keys[d][0])
+
+        return [self.job_ids[docno] for docno in docnos], facet_counts
+
+    # --- persistence ---
+
+    def save(self, path):
+        """Write the index to ``path`` atomically"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = dict(self.__dict__, _vocabulary=None, _salary_masks={})
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((INDEX_FORMAT, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by ``save``; None if missing or from another format"""
+        try:
+            with open(path, 'rb') as f:
+                index_format, state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if index_format != INDEX_FORMAT:
+            return None
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        return index
+
+
+class IndexPagination(Pagination):
+    """Flask-SQLAlchemy style pagination over an ordered list of job ids"""
+
+    def _query_items(self):
+        job_ids = self._query_args['job_ids']
+        page_ids = job_ids[(self.page - 1) * self.per_page:self.page * self.per_page]
+        if not page_ids:
+            return []
+        rows = {
+            job.id: (job, company)
+            for job, company in db.session.query(JobPosting, Company).join(
+                Company, JobPosting.company_id == Company.id
+            ).filter(JobPosting.id.in_(page_ids))
+        }
+        return [rows[job_id] for job_id in page_ids if job_id in rows]
+
+    def _query_count(self):
+        return len(self._query_args['job_ids'])
+
+
+# --- LOADING FROM THE DATABASE ---
+
+def _load_documents(job_ids=None, company_ids=None):
+    """Index documents of active postings, optionally limited to some jobs/companies"""
+    query = db.session.query(JobPosting, Company.company_name).join(
+        Company, JobPosting.company_id == Company.id
+    ).filter(JobPosting.is_active == True)
+    if job_ids is not None:
+        query = query.filter(JobPosting.id.in_(job_ids))
+    if company_ids is not None:
+        query = query.filter(JobPosting.company_id.in_(company_ids))
+    rows = query.all()
+
+    skills = {}
+    skill_query = db.session.query(JobRequiredSkill.job_id, Skill.id, Skill.skill_name).join(
+        Skill, JobRequiredSkill.skill_id == Skill.id
+    )
+    if job_ids is not None or company_ids is not None:
+        skill_query = skill_query.filter(JobRequiredSkill.job_id.in_([job.id for job, _ in rows]))
+    for job_id, skill_id, skill_name in skill_query:
+        skills.setdefault(job_id, []).append((skill_id, skill_name))
+
+    return [{
+        'job_id': job.id,
+        'title': job.title,
+        'description': job.description,
+        'requirements': job.requirements,
+        'company_name': company_name,
+        'location': job.location,
+        'job_type': job.job_type,
+        'experience_required': job.experience_required,
+        'salary_min': job.salary_min,
+        'salary_max': job.salary_max,
+        'created_at': job.created_at,
+        'skills': skills.get(job.id, []),
+    } for job, company_name in rows]
+
+
+def _database_signature():
+    """Cheap fingerprint of the postings table used to spot changes from other processes"""
+    return tuple(db.session.query(
+        func.count(JobPosting.id), func.max(JobPosting.id), func.max(JobPosting.updated_at)
+    ).one())
+
+
+def build_job_index():
+    """Build a fresh index from the database"""
+    signature = _database_signature()
+    index = JobIndex.build(_load_documents())
+    index.signature = signature
+    return index
+
+
+def index_path():
+    return current_app.config.get('JOB_INDEX_PATH') or os.path.join(current_app.instance_path, 'job_index.pickle')
+
+
+# --- PROCESS-LEVEL INDEX ---
+
+_index = None
+_index_lock = threading.Lock()
+_checked_at = 0.0
+
+# Jobs / companies written since the index last caught up
+_pending_jobs = set()
+_pending_companies = set()
+
+
+def get_job_index():
+    """The process-wide index, loaded or built on first use and kept current.
+
+    Postings written by this process are re-indexed incrementally; a cheap
+    signature query every JOB_INDEX_CHECK_INTERVAL seconds picks up writes
+    from other processes (and a stale warm-start file) with a full rebuild.
+    """
+    global _index, _checked_at
+    with _index_lock:
+        if _index is None:
+            index = JobIndex.load(index_path())
+            _index = index if index is not None else build_job_index()
+            _checked_at = 0.0
+
+        if _pending_jobs or _pending_companies:
+            job_ids, company_ids = list(_pending_jobs), list(_pending_companies)
+            _pending_jobs.clear()
+            _pending_companies.clear()
+            _apply_changes(_index, job_ids, company_ids)
+            _index.signature = _database_signature()
+
+        now = time.time()
+        if now - _checked_at >= current_app.config.get('JOB_INDEX_CHECK_INTERVAL', 30):
+            _checked_at = now
+            too_old = now - _index.built_at >= current_app.config.get('JOB_INDEX_MAX_AGE', 3600)
+            if too_old or _database_signature() != _index.signature:
+                _index = build_job_index()
+
+        return _index
+
+
+def _apply_changes(index, job_ids, company_ids):
+    documents = _load_documents(job_ids=job_ids)
+    if company_ids:
+        documents += _load_documents(company_ids=company_ids)
+    still_active = set()
+    for document in documents:
+        index.add(document)
+        still_active.add(document['job_id'])
+    # Deactivated or deleted postings
+    for job_id in job_ids:
+        if job_id not in still_active:
+            index.remove(job_id)
+
+
+def save_job_index(path=None):
+    """Persist the current index so the next worker can warm-start from it"""
+    index = get_job_index()
+    with _index_lock:
+        index.save(path or index_path())
+        return index.size
+
+
+def rebuild_job_index(path=None):
+    """Rebuild from the database, swap it in and persist it"""
+    global _index, _checked_at
+    index = build_job_index()
+    with _index_lock:
+        _index = index
+        _checked_at = time.time()
+        _pending_jobs.clear()
+        _pending_companies.clear()
+        index.save(path or index_path())
+    return index.size
+
+
+def search_jobs(query='', page=1, per_page=12, **filters):
+    """Search active postings from memory.
+
+    Returns ``(pagination, facet_counts, total_active)`` where ``pagination``
+    yields ``(JobPosting, Company)`` rows like ``Query.paginate``.
+    """
+    index = get_job_index()
+    # Incremental updates mutate the index in place
+    with _index_lock:
+        job_ids, facet_counts = index.search(query, **filters)
+    pagination = IndexPagination(page=page, per_page=per_page, error_out=False, job_ids=job_ids)
+    return pagination, facet_counts, index.size
+
+
+# --- INCREMENTAL UPDATES ---
+# Written postings are noted per session and handed to the index once
+# committed; the next search re-reads just those rows.
+
+def _written_key(instance):
+    if isinstance(instance, JobPosting):
+        return ('job', instance.id)
+    if isinstance(instance, JobRequiredSkill):
+        return ('job', instance.job_id)
+    # A new company has no postings to refresh yet
+    if not inspect(instance).pending:
+        return ('company', instance.id)
+    return None
+
+
+def _queue_committed_job_writes(written):
+    # Without a loaded index there is nothing to patch; the first load checks freshness
+    # Bulk statements (ALL_ROWS) are left to the periodic signature check
+    written.discard(ALL_ROWS)
+    if written and _index is not None:
+        with _index_lock:
+            for kind, key in written:
+                (_pending_jobs if kind == 'job' else _pending_companies).add(key)
+
+
+watch_writes(JobPosting, JobRequiredSkill, Company, on_commit=_queue_committed_job_writes, key=_written_key)
@@ -1,15 +1,27 @@
 from decimal import Decimal
+from datetime import datetime
+from sqlalchemy import func, case, and_
+from sqlalchemy.exc import IntegrityError
 from extensions import db
-from models import CandidateProfile, JobPosting, JobRequiredSkill, CandidateSkill
+from models import (
+    CandidateProfile, JobPosting, JobRequiredSkill,
+    CandidateJobMatch, JobApplication, Company, User, Skill
+)
+from services.skill_matrix_service import get_skill_matrix, candidate_skill_pairs
+
+
+def _skill_weight(importance):
+    """Weight of a required skill: Required=3, Preferred=2, anything else=1"""
+    return 3 if importance == 'Required' else 2 if importance == 'Preferred' else 1
 
-def calculate_job_match_score(candidate_id, job_id):
-    """Calculate match score between candidate and job"""
-    candidate = CandidateProfile.query.get(candidate_id)
-    job = JobPosting.query.get(job_id)
-    
-    if not candidate or not job:
-        return 0
 
+def _score_candidate_job(candidate, job, matched_weight, total_weight):
+    """Combine experience, skills, location and salary into a 0-100 score.
+
+    ``matched_weight``/``total_weight`` are the summed skill weights the
+    candidate covers / the job asks for (``total_weight == 0`` means the job
+    lists no required skills).
+    """
     score = 0
     max_score = 100
 
@@ -22,21 +34,8 @@ def calculate_job_match_score(candidate_id, job_id):
         score += 10
 
     # Skills match (50 points)
-    required_skills = JobRequiredSkill.query.filter_by(job_id=job_id).all()
-    candidate_skills = CandidateSkill.query.filter_by(candidate_id=candidate_id).all()
-    candidate_skill_ids = [cs.skill_id for cs in candidate_skills]
-
-    if required_skills:
-        matched_skills = 0
-        total_weight = 0
-        for req_skill in required_skills:
-            weight = 3 if req_skill.importance == 'Required' else 2 if req_skill.importance == 'Preferred' else 1
-            total_weight += weight
-            if req_skill.skill_id in candidate_skill_ids:
-                matched_skills += weight
-
-        if total_weight > 0:
-            score += int((matched_skills / total_weight) * 50)
+    if total_weight > 0:
+        score += int((matched_weight / total_weight) * 50)
     else:
         score += 25  # No specific skills required
 
@@ -56,3 +55,368 @@ def calculate_job_match_score(candidate_id, job_id):
             score += 5
 
     return min(score, max_score)
+
+
+def calculate_job_match_score(candidate_id, job_id):
+    """Calculate match score between candidate and job"""
+    candidate = CandidateProfile.query.get(candidate_id)
+    job = JobPosting.query.get(job_id)
+
+    if not candidate or not job:
+        return 0
+
+    required_skills = JobRequiredSkill.query.filter_by(job_id=job_id).all()
+    pairs = candidate_skill_pairs([candidate_id])
+    candidate_skill_ids = [skill_id for (skill_id,) in db.session.query(pairs.c.skill_id)]
+
+    matched_skills = 0
+    total_weight = 0
+    for req_skill in required_skills:
+        weight = _skill_weight(req_skill.importance)
+        total_weight += weight
+        if req_skill.skill_id in candidate_skill_ids:
+            matched_skills += weight
+
+    return _score_candidate_job(candidate, job, matched_skills, total_weight)
+
+
+def score_jobs_for_candidate(candidate_id, job_ids=None):
+    """Score many jobs for one candidate.
+
+    Uses the cached skill matrix for the jobs it knows and the SQL
+    aggregation for the rest (postings made by another process since the
+    matrix was built). ``job_ids=None`` scores all active jobs, read from
+    the database rather than the matrix. Returns ``{job_id: score}``.
+    """
+    matrix = get_skill_matrix()
+    if not matrix.has_candidate(candidate_id):
+        return _query_scores_for_candidate(candidate_id, job_ids)
+
+    if job_ids is None:
+        job_ids = [job_id for (job_id,) in db.session.query(JobPosting.id).filter(JobPosting.is_active == True)]
+    else:
+        job_ids = list(job_ids)
+    covered = [job_id for job_id in job_ids if matrix.has_job(job_id)]
+    scores = matrix.score_jobs_for_candidate(candidate_id, covered) if covered else {}
+    if len(covered) < len(job_ids):
+        scores.update(_query_scores_for_candidate(
+            candidate_id, [job_id for job_id in job_ids if not matrix.has_job(job_id)]
+        ))
+    return scores
+
+
+def score_candidates_for_job(job_id, candidate_ids=None):
+    """Score many candidates for one job.
+
+    Reverse of ``score_jobs_for_candidate``, with the same matrix/SQL split.
+    ``candidate_ids=None`` scores every candidate. Returns
+    ``{candidate_id: score}``.
+    """
+    matrix = get_skill_matrix()
+    if not matrix.has_job(job_id):
+        return _query_scores_for_job(job_id, candidate_ids)
+
+    if candidate_ids is None:
+        candidate_ids = [cid for (cid,) in db.session.query(CandidateProfile.id)]
+    else:
+        candidate_ids = list(candidate_ids)
+    covered = [cid for cid in candidate_ids if matrix.has_candidate(cid)]
+    scores = matrix.score_candidates_for_job(job_id, covered) if covered else {}
+    if len(covered) < len(candidate_ids):
+        scores.update(_query_scores_for_job(
+            job_id, [cid for cid in candidate_ids if not matrix.has_candidate(cid)]
+        ))
+    return scores
+
+
+def _query_scores_for_candidate(candidate_id, job_ids=None):
+    """Score many jobs for one candidate in a fixed number of queries.
+
+    Loads the candidate and their skills once, aggregates the weighted
+    required-skill coverage of every job in a single GROUP BY and applies the
+    same weights as ``calculate_job_match_score``. ``job_ids=None`` scores all
+    active jobs. Returns ``{job_id: score}``.
+    """
+    candidate = CandidateProfile.query.get(candidate_id)
+    if not candidate:
+        return {}
+
+    if job_ids is not None:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+        jobs = JobPosting.query.filter(JobPosting.id.in_(job_ids)).all()
+    else:
+        jobs = JobPosting.query.filter(JobPosting.is_active == True).all()
+
+    if not jobs:
+        return {}
+
+    pairs = candidate_skill_pairs([candidate_id])
+    candidate_skill_ids = [skill_id for (skill_id,) in db.session.query(pairs.c.skill_id)]
+
+    weight = case(
+        (JobRequiredSkill.importance == 'Required', 3),
+        (JobRequiredSkill.importance == 'Preferred', 2),
+        else_=1
+    )
+    matched = case(
+        (JobRequiredSkill.skill_id.in_(candidate_skill_ids), weight),
+        else_=0
+    ) if candidate_skill_ids else 0
+
+    skill_query = db.session.query(
+        JobRequiredSkill.job_id,
+        func.sum(weight),
+        func.sum(matched)
+    )
+    if job_ids is not None:
+        skill_query = skill_query.filter(JobRequiredSkill.job_id.in_(job_ids))
+    else:
+        skill_query = skill_query.join(
+            JobPosting, JobRequiredSkill.job_id == JobPosting.id
+        ).filter(JobPosting.is_active == True)
+
+    skill_totals = {
+        job_id: (int(matched_weight or 0), int(total_weight or 0))
+        for job_id, total_weight, matched_weight in skill_query.group_by(JobRequiredSkill.job_id)
+    }
+
+    scores = {}
+    for job in jobs:
+        matched_weight, total_weight = skill_totals.get(job.id, (0, 0))
+        scores[job.id] = _score_candidate_job(candidate, job, matched_weight, total_weight)
+
+    return scores
+
+
+def _query_scores_for_job(job_id, candidate_ids=None):
+    """Score many candidates for one job in a fixed number of queries.
+
+    Reverse of ``_query_scores_for_candidate``: the job's required skills are
+    loaded once and candidate coverage is summed in a single GROUP BY over
+    ``candidate_skills``. ``candidate_ids=None`` scores every candidate.
+    Returns ``{candidate_id: score}``.
+    """
+    job = JobPosting.query.get(job_id)
+    if not job:
+        return {}
+
+    if candidate_ids is not None:
+        candidate_ids = list(candidate_ids)
+        if not candidate_ids:
+            return {}
+        candidates = CandidateProfile.query.filter(CandidateProfile.id.in_(candidate_ids)).all()
+    else:
+        candidates = CandidateProfile.query.all()
+
+    skill_weights = {}
+    total_weight = 0
+    for skill_id, importance in db.session.query(
+        JobRequiredSkill.skill_id, JobRequiredSkill.importance
+    ).filter(JobRequiredSkill.job_id == job_id):
+        weight = _skill_weight(importance)
+        total_weight += weight
+        skill_weights[skill_id] = skill_weights.get(skill_id, 0) + weight
+
+    matched_weights = {}
+    if skill_weights:
+        # Distinct pairs: a skill both picked and named in the CV still covers it once
+        coverage = candidate_skill_pairs(candidate_ids, list(skill_weights))
+        matched_weights = dict(
+            db.session.query(
+                coverage.c.candidate_id,
+                func.sum(case(
+                    *[(coverage.c.skill_id == skill_id, w) for skill_id, w in skill_weights.items()],
+                    else_=0
+                ))
+            ).group_by(coverage.c.candidate_id).all()
+        )
+
+    return {
+        candidate.id: _score_candidate_job(
+            candidate, job, int(matched_weights.get(candidate.id) or 0), total_weight
+        )
+        for candidate in candidates
+    }
+
+
+# --- PRECOMPUTED MATCH TABLE ---
+
+def _store_matches(rows):
+    if rows:
+        db.session.execute(CandidateJobMatch.__table__.insert(), rows)
+
+
+def refresh_candidate_matches(candidate_id):
+    """Recompute and store the scores of one candidate against all active jobs"""
+    scores = score_jobs_for_candidate(candidate_id)
+    now = datetime.utcnow()
+    
+    CandidateJobMatch.query.filter_by(candidate_id=candidate_id).delete(synchronize_session=False)
+    _store_matches([
+        {'candidate_id': candidate_id, 'job_id': job_id, 'match_score': score, 'computed_at': now}
+        for job_id, score in scores.items()
+    ])
+    db.session.commit()
+    return len(scores)
+
+
+def refresh_job_matches(job_id):
+    """Recompute and store the scores of every candidate against one job"""
+    scores = score_candidates_for_job(job_id)
+    now = datetime.utcnow()
+    
+    CandidateJobMatch.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+    _store_matches([
+        {'candidate_id': candidate_id, 'job_id': job_id, 'match_score': score, 'computed_at': now}
+        for candidate_id, score in scores.items()
+    ])
+    db.session.commit()
+    return len(scores)
+
+
+def get_match_score(candidate_id, job_id):
+    """Stored score for a pair, falling back to a live computation"""
+    match = CandidateJobMatch.query.get((candidate_id, job_id))
+    if match:
+        return match.match_score
+    return calculate_job_match_score(candidate_id, job_id)
+
+
+def get_top_job_matches(candidate_id, limit=10, min_score=30):
+    """Best stored matches among active jobs the candidate hasn't applied to.
+
+    Returns ``(JobPosting, Company, match_score)`` rows ordered by score.
+    Candidates without stored scores yet are refreshed on first use.
+    """
+    if not db.session.query(
+        CandidateJobMatch.query.filter_by(candidate_id=candidate_id).exists()
+    ).scalar():
+        refresh_candidate_matches(candidate_id)
+    
+    applied_job_ids = db.session.query(JobApplication.job_id).filter(
+        JobApplication.candidate_id == candidate_id
+    )
+    
+    return db.session.query(JobPosting, Company, CandidateJobMatch.match_score).join(
+        CandidateJobMatch, CandidateJobMatch.job_id == JobPosting.id
+    ).join(
+        Company, JobPosting.company_id == Company.id
+    ).filter(
+        CandidateJobMatch.candidate_id == candidate_id,
+        CandidateJobMatch.match_score > min_score,
+        JobPosting.is_active == True,
+        ~JobPosting.id.in_(applied_job_ids)
+    ).order_by(
+        CandidateJobMatch.match_score.desc(), JobPosting.id
+    ).limit(limit).all()
+
+
+def rank_candidates_for_job(job_id, applicants_only=True):
+    """Candidates for a job ordered by match score, best first.
+
+    Returns a query of ``(CandidateProfile, User, JobApplication, match_score)``
+    rows ready for ``.paginate()``; ``JobApplication`` is ``None`` for pool
+    candidates who haven't applied. Candidates with no stored score for the
+    job yet are scored in one batch and stored before the query is built.
+    """
+    stored_ids = db.session.query(CandidateJobMatch.candidate_id).filter(
+        CandidateJobMatch.job_id == job_id
+    )
+    missing_query = db.session.query(CandidateProfile.id).filter(~CandidateProfile.id.in_(stored_ids))
+    if applicants_only:
+        missing_query = missing_query.filter(CandidateProfile.id.in_(
+            db.session.query(JobApplication.candidate_id).filter(JobApplication.job_id == job_id)
+        ))
+    missing_ids = [cid for (cid,) in missing_query]
+    
+    if missing_ids:
+        now = datetime.utcnow()
+        try:
+            _store_matches([
+                {'candidate_id': candidate_id, 'job_id': job_id, 'match_score': score, 'computed_at': now}
+                for candidate_id, score in score_candidates_for_job(job_id, missing_ids).items()
+            ])
+            db.session.commit()
+        except IntegrityError:
+            # Another request stored the same rows first
+            db.session.rollback()
+    
+    query = db.session.query(
+        CandidateProfile, User, JobApplication, CandidateJobMatch.match_score
+    ).join(
+        CandidateJobMatch, and_(
+            CandidateJobMatch.candidate_id == CandidateProfile.id,
+            CandidateJobMatch.job_id == job_id
+        )
+    ).join(
+        User, CandidateProfile.user_id == User.id
+    ).outerjoin(
+        JobApplication, and_(
+            JobApplication.candidate_id == CandidateProfile.id,
+            JobApplication.job_id == job_id
+        )
+    )
+    if applicants_only:
+        query = query.filter(JobApplication.id.isnot(None))
+    
+    return query.order_by(CandidateJobMatch.match_score.desc(), CandidateProfile.id)
+
+
+def get_skill_overlap(job_id, candidate_ids):
+    """Matched and lacking required skill names for several candidates at once.
+
+    Returns ``{candidate_id: (matched, lacking)}`` with both lists in the
+    job's skill-name order.
+    """
+    candidate_ids = list(candidate_ids)
+    required = db.session.query(Skill.id, Skill.skill_name).join(
+        JobRequiredSkill, JobRequiredSkill.skill_id == Skill.id
+    ).filter(
+        JobRequiredSkill.job_id == job_id
+    ).order_by(Skill.skill_name).all()
+    
+    covered = {}
+    if required and candidate_ids:
+        pairs = candidate_skill_pairs(candidate_ids, [skill_id for skill_id, _ in required])
+        for candidate_id, skill_id in db.session.query(pairs.c.candidate_id, pairs.c.skill_id):
+            covered.setdefault(candidate_id, set()).add(skill_id)
+    
+    overlap = {}
+    for candidate_id in candidate_ids:
+        has = covered.get(candidate_id, set())
+        overlap[candidate_id] = (
+            [name for skill_id, name in required if skill_id in has],
+            [name for skill_id, name in required if skill_id not in has]
+        )
+    return overlap
+
+
+def backfill_match_scores():
+    """Rebuild the stored scores for every candidate; returns rows written"""
+    total = 0
+    for (candidate_id,) in db.session.query(CandidateProfile.id).all():
+        total += refresh_candidate_matches(candidate_id)
+    return total
+
+
+def verify_match_scores(candidate_ids=None):
+    """Compare stored scores with a live recompute straight from the database.
+
+    Returns a list of ``(candidate_id, job_id, stored, live)`` for every pair
+    that differs, including active jobs with no stored row (``stored=None``).
+    """
+    if candidate_ids is None:
+        candidate_ids = [cid for (cid,) in db.session.query(CandidateProfile.id).all()]
+    
+    mismatches = []
+    for candidate_id in candidate_ids:
+        live = _query_scores_for_candidate(candidate_id)
+        stored = dict(db.session.query(CandidateJobMatch.job_id, CandidateJobMatch.match_score).filter(
+            CandidateJobMatch.candidate_id == candidate_id
+        ).all())
+        for job_id, score in live.items():
+            if stored.get(job_id) != score:
+                mismatches.append((candidate_id, job_id, stored.get(job_id), score))
+    return mismatches
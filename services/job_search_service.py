@@ -0,0 +1,194 @@
+import re
+from flask import current_app
+from sqlalchemy import select, table, column, literal_column, literal, func, text, case, or_
+from sqlalchemy.dialects.mysql import match
+from extensions import db
+from models import JobPosting, Company, JobSearchDocument
+from services.job_index_service import EXPERIENCE_BANDS
+from utils.cache import TTLCache
+
+# Only the first words of a long search query are used
+MAX_QUERY_TERMS = 16
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+# InnoDB's default full-text stopwords; like short words they are never indexed
+MYSQL_STOPWORDS = frozenset((
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from', 'how', 'i',
+    'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when',
+    'where', 'who', 'will', 'with', 'und', 'www',
+))
+
+# Jobs page lookups that rarely change; writes to the source table drop them
+_page_cache = TTLCache(default_ttl=60)
+_page_cache.invalidate_on_commit('active_jobs', JobPosting)
+
+_fts = table('job_search_fts', column('rowid'))
+_fts_ref = literal_column('job_search_fts')
+
+
+def _query_terms(query):
+    return _WORD.findall((query or '').lower())[:MAX_QUERY_TERMS]
+
+
+def split_fulltext_terms(terms):
+    """``(indexed, unindexed)``: the words MySQL's full-text index can find, and the rest.
+
+    Words shorter than ``FULLTEXT_MIN_TOKEN_SIZE`` and stopwords are left
+    out of the index, so a required ``+go*`` in a boolean search matches
+    no row at all. Those words ("Go", "C", "R", "AI") are matched with LIKE.
+    """
+    min_size = current_app.config.get('FULLTEXT_MIN_TOKEN_SIZE', 3)
+    indexed, unindexed = [], []
+    for term in terms:
+        if len(term) < min_size or term in MYSQL_STOPWORDS:
+            unindexed.append(term)
+        else:
+            indexed.append(term)
+    return indexed, unindexed
+
+
+def full_text_available():
+    """True when the database has a full-text backend this module can use"""
+    return db.engine.dialect.name in ('mysql', 'sqlite')
+
+
+def search_hits(query, columns=('title', 'body', 'company_name')):
+    """Subquery of ``(job_id, score)`` for postings matching every word of ``query``.
+
+    Words are prefix-matched, so partially typed words still hit. Higher
+    ``score`` is more relevant. Returns ``None`` when the database has no
+    full-text backend or ``query`` has no searchable words; callers then fall
+    back to plain ``LIKE`` filtering.
+    """
+    terms = _query_terms(query)
+    if not terms or not full_text_available():
+        return None
+
+    if db.engine.dialect.name == 'mysql':
+        searched = [getattr(JobSearchDocument, name) for name in columns]
+        indexed, unindexed = split_fulltext_terms(terms)
+        # Words the index cannot see must still appear in one of the columns
+        conditions = [or_(*[c.contains(term, autoescape=True) for c in searched]) for term in unindexed]
+        if indexed:
+            # MATCH columns must line up with one of the FULLTEXT indexes
+            relevance = match(*searched, against=' '.join(f'+{term}*' for term in indexed)).in_boolean_mode()
+            conditions.insert(0, relevance)
+        else:
+            relevance = literal(0)
+        return select(
+            JobSearchDocument.job_id.label('job_id'),
+            relevance.label('score')
+        ).where(*conditions).subquery()
+
+    # SQLite FTS5: bm25() is lower-is-better, so negate it
+    fts_query = '{%s} : (%s)' % (' '.join(columns), ' '.join(f'"{term}"*' for term in terms))
+    return select(
+        _fts.c.rowid.label('job_id'),
+        (-func.bm25(_fts_ref)).label('score')
+    ).where(_fts_ref.op('MATCH')(fts_query)).subquery()
+
+
+def _document_values(job, company_name):
+    return {
+        'job_id': job.id,
+        'title': job.title,
+        'body': '\n'.join(part for part in (job.description, job.requirements) if part),
+        'company_name': company_name,
+        'location': job.location,
+    }
+
+
+def index_job(job, company=None):
+    """Add or refresh the search document of a posting; the caller commits"""
+    company = company or Company.query.get(job.company_id)
+    db.session.merge(JobSearchDocument(**_document_values(job, company.company_name if company else None)))
+
+
+def reindex_company_jobs(company):
+    """Refresh the documents of every posting of a company (e.g. after a rename)"""
+    for job in JobPosting.query.filter_by(company_id=company.id).all():
+        index_job(job, company)
+
+
+def rebuild_search_index(batch_size=500):
+    """Rebuild every search document from the postings; returns the number indexed"""
+    JobSearchDocument.query.delete(synchronize_session=False)
+
+    total = 0
+    last_id = 0
+    while True:
+        rows = db.session.query(JobPosting, Company.company_name).join(
+            Company, JobPosting.company_id == Company.id
+        ).filter(
+            JobPosting.id > last_id
+        ).order_by(JobPosting.id).limit(batch_size).all()
+        if not rows:
+            break
+        db.session.execute(JobSearchDocument.__table__.insert(), [
+            _document_values(job, company_name) for job, company_name in rows
+        ])
+        total += len(rows)
+        last_id = rows[-1][0].id
+
+    if db.engine.dialect.name == 'sqlite':
+        db.session.execute(text("INSERT INTO job_search_fts(job_search_fts) VALUES ('rebuild')"))
+    db.session.commit()
+    return total
+
+
+# --- JOBS PAGE COUNTS ---
+
+def count_active_jobs():
+    """Number of active postings, cached for a minute"""
+    return _page_cache.get('active_jobs', lambda: db.session.query(
+        func.count(JobPosting.id)
+    ).filter(JobPosting.is_active == True).scalar())
+
+
+def experience_condition(band):
+    """SQL condition for an experience band; postings with no requirement match every band"""
+    low, high = EXPERIENCE_BANDS[band]
+    return or_(
+        JobPosting.experience_required.between(low, high),
+        JobPosting.experience_required == None
+    )
+
+
+def count_job_facets(query, job_types=None, experience_level=None):
+    """Job type and experience band counts for a filtered jobs query in one GROUP BY.
+
+    ``query`` carries every filter except job type and experience; each facet
+    is counted with the other one's selection applied. Returns the same
+    ``{facet: {value: count}}`` shape as the in-process index.
+    """
+    band_sums = [
+        func.sum(case((experience_condition(band), 1), else_=0))
+        for band in EXPERIENCE_BANDS
+    ]
+    if experience_level in EXPERIENCE_BANDS:
+        in_selected_band = func.sum(case((experience_condition(experience_level), 1), else_=0))
+    else:
+        in_selected_band = func.sum(literal(1))
+    
+    rows = query.order_by(None).with_entities(
+        JobPosting.job_type, in_selected_band, *band_sums
+    ).group_by(JobPosting.job_type).all()
+    
+    # Enum comparison is case-insensitive on MySQL; the page sends lowercase values
+    selected_types = {job_type.lower() for job_type in job_types or ()}
+    job_type_counts = {}
+    experience_counts = dict.fromkeys(EXPERIENCE_BANDS, 0)
+    for job_type, type_count, *band_counts in rows:
+        if job_type and type_count:
+            job_type_counts[job_type.lower()] = int(type_count)
+        if not selected_types or (job_type and job_type.lower() in selected_types):
+            for band, band_count in zip(EXPERIENCE_BANDS, band_counts):
+                experience_counts[band] += int(band_count or 0)
+    
+    return {
+        'job_type': job_type_counts,
+        'experience': {band: n for band, n in experience_counts.items() if n},
+        'skill': {},
+        'location': {},
+    }
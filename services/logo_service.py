@@ -0,0 +1,111 @@
+import os
+import re
+from io import BytesIO
+from flask import current_app, url_for
+from extensions import db
+from models import Company
+from services.blob_store_service import blob_store, send_blob
+from services.upload_service import SNIFF_BYTES, receive_upload, sniff_mimetype
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # in requirements.txt; without it listings show the original logo
+    Image = ImageOps = None
+
+# Hash-addressed files never change, so browsers may keep them for good
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+_DIGEST = re.compile(r'[0-9a-f]{64}')
+
+
+def thumbnails_available():
+    return Image is not None
+
+
+def make_thumbnail(stream, size):
+    """PNG bytes of the image in ``stream`` scaled to fit ``size`` x ``size``, or None"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(stream) as image:
+            image.draft('RGB', (size, size))  # JPEG: decode at reduced scale
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((size, size))
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.mode else 'RGB')
+            output = BytesIO()
+            image.save(output, format='PNG', optimize=True)
+            return output.getvalue()
+    except Exception:
+        # Unreadable or oversized images keep being shown as uploaded
+        current_app.logger.warning('Could not make a logo thumbnail', exc_info=True)
+        return None
+
+
+def _thumbnail_for(digest):
+    """Blob store key of a thumbnail of blob ``digest``; None when the original will do"""
+    with blob_store.open(digest) as handle:
+        thumbnail = make_thumbnail(handle, current_app.config.get('LOGO_THUMB_SIZE', 128))
+    if thumbnail is None or len(thumbnail) >= os.path.getsize(blob_store.path(digest)):
+        return None
+    return blob_store.put(thumbnail)
+
+
+def store_logo(company, file):
+    """Store an uploaded logo and its listing-size thumbnail for ``company``"""
+    upload = receive_upload(file, 'logo', 'Logo')
+    company.logo_sha256 = upload.digest
+    company.logo_filename = upload.filename
+    company.logo = None
+    company.logo_thumb_sha256 = _thumbnail_for(upload.digest)
+    return upload
+
+
+def company_logo_url(company):
+    """URL of a company's listing-size logo, or None when there is no logo.
+
+    Logos in the blob store are linked by hash and served without touching
+    the database; rows from before the store go through the company route.
+    """
+    if company.logo_thumb_key:
+        return url_for('employer.logo_image', digest=company.logo_thumb_key)
+    if company.has_logo:
+        return url_for('employer.get_company_logo', company_id=company.id)
+    return None
+
+
+def send_logo_image(digest):
+    """Response for a logo addressed by hash, or None.
+
+    Only image files are served, so the hash of another upload (a CV) does
+    not open it up through this public route.
+    """
+    if not _DIGEST.fullmatch(digest) or not blob_store.exists(digest):
+        return None
+    with blob_store.open(digest) as handle:
+        mimetype = sniff_mimetype(handle.read(SNIFF_BYTES))
+    if mimetype is None or not mimetype.startswith('image/'):
+        return None
+    response = send_blob(digest, mimetype=mimetype, as_attachment=False, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+
+def backfill_logo_thumbnails(batch_size=100):
+    """Make thumbnails for stored logos that have none; returns how many were made"""
+    made = 0
+    last_id = 0
+    while True:
+        companies = Company.query.filter(
+            Company.id > last_id,
+            Company.logo_sha256.isnot(None),
+            Company.logo_thumb_sha256.is_(None)
+        ).order_by(Company.id).limit(batch_size).all()
+        if not companies:
+            return made
+        for company in companies:
+            if blob_store.exists(company.logo_sha256):
+                company.logo_thumb_sha256 = _thumbnail_for(company.logo_sha256)
+                made += company.logo_thumb_sha256 is not None
+        last_id = companies[-1].id
+        db.session.commit()
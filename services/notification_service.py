@@ -1,6 +1,12 @@
+from collections import Counter
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event, case, select, func, update, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
 from extensions import db
-from models import Notification, ActivityLog
-import json
+from models import Notification, User
+from services.audit_log_service import audit_log
 
 def create_notification(user_id, title, message, notification_type='system', action_url=None):
     """Create a new notification for a user"""
@@ -14,15 +20,156 @@ def create_notification(user_id, title, message, notification_type='system', act
     db.session.add(notification)
     db.session.commit()
 
+def create_notifications_bulk(recipients, title, message, notification_type='system', action_url=None):
+    """Send the same notification to many users with one multi-row INSERT.
+
+    Runs in the caller's transaction (no commit); duplicate recipients get a
+    single notification. Returns how many were created.
+    """
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in recipients))
+    if not user_ids:
+        return 0
+    
+    db.session.execute(insert(Notification.__table__).values([
+        {
+            'user_id': user_id,
+            'title': title,
+            'message': message,
+            'notification_type': notification_type,
+            'action_url': action_url,
+            'is_read': False,
+        }
+        for user_id in user_ids
+    ]))
+    # Core insert skips the flush hooks below, so bump the counters and queue the push here
+    payload = _push_payload(None, title, message, notification_type, action_url, datetime.utcnow())
+    db.session.info.setdefault(_PUSH_KEY, []).extend((user_id, payload) for user_id in user_ids)
+    db.session.execute(
+        update(User.__table__)
+        .where(User.__table__.c.id.in_(user_ids))
+        .values(unread_notification_count=User.__table__.c.unread_notification_count + 1)
+    )
+    return len(user_ids)
+
 def log_activity(table_name, operation_type, record_id, old_values=None, new_values=None, user_id=None):
-    """Log activity for audit trail"""
-    activity = ActivityLog(
-        table_name=table_name,
-        operation_type=operation_type,
-        record_id=record_id,
-        old_values=json.dumps(old_values) if old_values else None,
-        new_values=json.dumps(new_values) if new_values else None,
-        user_id=user_id
+    """Log activity for audit trail (buffered and written in batches by audit_log)"""
+    audit_log.log(table_name, operation_type, record_id,
+                  old_values=old_values, new_values=new_values, user_id=user_id)
+
+
+# --- UNREAD COUNTERS ---
+# users.unread_notification_count mirrors COUNT(*) of the user's unread
+# notifications. ORM adds/deletes/is_read changes adjust it in the same
+# flush; bulk UPDATEs must go through mark_notifications_read().
+
+def _adjust_unread_counts(connection, deltas):
+    """Atomically add ``{user_id: delta}`` to the counters, never going below zero"""
+    users = User.__table__
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        new_value = users.c.unread_notification_count + delta
+        connection.execute(
+            users.update()
+            .where(users.c.id == user_id)
+            .values(unread_notification_count=case((new_value < 0, 0), else_=new_value))
+        )
+
+
+@event.listens_for(Session, 'after_flush')
+def _count_unread_changes(session, flush_context):
+    deltas = Counter()
+    for instance in session.new:
+        if isinstance(instance, Notification) and not instance.is_read:
+            deltas[instance.user_id] += 1
+    for instance in session.deleted:
+        if isinstance(instance, Notification) and not instance.is_read:
+            deltas[instance.user_id] -= 1
+    for instance in session.dirty:
+        if isinstance(instance, Notification) and instance not in session.deleted:
+            history = get_history(instance, 'is_read')
+            if history.added and history.deleted and bool(history.added[0]) != bool(history.deleted[0]):
+                deltas[instance.user_id] += -1 if history.added[0] else 1
+    if deltas:
+        _adjust_unread_counts(session.connection(), deltas)
+
+
+# --- REAL-TIME PUSH ---
+# Notifications written in a transaction are pushed to the recipients'
+# Socket.IO rooms once it commits (see realtime.push_notifications).
+
+_PUSH_KEY = 'notification_pushes'
+
+def _push_payload(notification_id, title, message, notification_type, action_url, created_at):
+    return {
+        'id': notification_id,
+        'title': title,
+        'message': message,
+        'notification_type': notification_type or 'system',
+        'action_url': action_url,
+        'created_at': created_at.isoformat() if created_at else None,
+    }
+
+
+@event.listens_for(Session, 'after_flush')
+def _queue_new_notifications(session, flush_context):
+    for instance in session.new:
+        if isinstance(instance, Notification):
+            session.info.setdefault(_PUSH_KEY, []).append((instance.user_id, _push_payload(
+                instance.id, instance.title, instance.message,
+                instance.notification_type, instance.action_url, instance.created_at
+            )))
+
+
+@event.listens_for(Session, 'after_commit')
+def _push_committed_notifications(session):
+    pushes = session.info.pop(_PUSH_KEY, None)
+    if pushes and has_app_context():
+        from realtime import push_notifications
+        push_notifications(current_app._get_current_object(), pushes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_rolled_back_notifications(session):
+    session.info.pop(_PUSH_KEY, None)
+
+
+def get_unread_count(user_id):
+    """Unread notifications of a user, read from the counter column"""
+    return db.session.query(User.unread_notification_count).filter(User.id == user_id).scalar() or 0
+
+
+def mark_notifications_read(user_id, notification_ids=None):
+    """Mark the user's unread notifications (or just ``notification_ids``) read.
+
+    Decrements the counter by the rows actually changed, in the caller's
+    transaction; returns that number.
+    """
+    query = Notification.query.filter_by(user_id=user_id, is_read=False)
+    if notification_ids is not None:
+        if not notification_ids:
+            return 0
+        query = query.filter(Notification.id.in_(notification_ids))
+    
+    changed = query.update({'is_read': True}, synchronize_session=False)
+    if changed:
+        _adjust_unread_counts(db.session.connection(), {user_id: -changed})
+    return changed
+
+
+def reconcile_unread_counts(user_ids=None):
+    """Reset counters that drifted from the notifications table; returns how many were fixed"""
+    actual = select(func.count(Notification.id)).where(
+        Notification.user_id == User.id,
+        Notification.is_read == False
+    ).scalar_subquery()
+    
+    stmt = update(User).where(User.unread_notification_count != actual).values(
+        unread_notification_count=actual
     )
-    db.session.add(activity)
+    if user_ids:
+        stmt = stmt.where(User.id.in_(user_ids))
+    
+    fixed = db.session.execute(stmt, execution_options={'synchronize_session': False}).rowcount
     db.session.commit()
+    return fixed
@@ -0,0 +1,192 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, delete, insert, or_, and_
+from extensions import db
+from models import (
+    User, JobPosting, JobApplication, JobRequiredSkill, Skill, Company,
+    ReportDailyRegistrations, ReportDailyApplications, ReportDailyJobs,
+    ReportDailySkillDemand, ReportRollupState
+)
+
+ROLLUP_NAME = 'daily_reports'
+
+
+def _as_date(value):
+    """func.date() comes back as a string on SQLite"""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _on_days(column, days):
+    """``column`` falls on one of ``days``, as timestamp ranges the index can use"""
+    return or_(*[
+        and_(column >= datetime.combine(day, datetime.min.time()),
+             column < datetime.combine(day + timedelta(days=1), datetime.min.time()))
+        for day in sorted(days)
+    ])
+
+
+def _touched_days(day_column, changed_column, since):
+    """Days (of ``day_column``) of rows whose ``changed_column`` moved since the last rollup"""
+    return {_as_date(day) for day, in db.session.query(func.date(day_column)).filter(
+        changed_column >= since
+    ).distinct() if day is not None}
+
+
+# --- FACT DEFINITIONS ---
+# (fact model, grouped source query, columns in query order)
+
+def _registration_source():
+    day = func.date(User.created_at)
+    return db.session.query(day, User.user_type, func.count(User.id)).group_by(day, User.user_type), User.created_at
+
+
+def _application_source():
+    day = func.date(JobApplication.applied_at)
+    return db.session.query(
+        day, JobApplication.application_status, func.count(JobApplication.id)
+    ).group_by(day, JobApplication.application_status), JobApplication.applied_at
+
+
+def _job_source():
+    day = func.date(JobPosting.created_at)
+    return db.session.query(
+        day, JobPosting.company_id, JobPosting.job_type, JobPosting.location, func.count(JobPosting.id)
+    ).group_by(day, JobPosting.company_id, JobPosting.job_type, JobPosting.location), JobPosting.created_at
+
+
+def _skill_demand_source():
+    day = func.date(JobPosting.created_at)
+    return db.session.query(
+        day, JobRequiredSkill.skill_id, func.count(JobRequiredSkill.id)
+    ).join(JobPosting, JobRequiredSkill.job_id == JobPosting.id).group_by(
+        day, JobRequiredSkill.skill_id
+    ), JobPosting.created_at
+
+
+FACTS = (
+    (ReportDailyRegistrations, _registration_source, ('day', 'user_type', 'user_count')),
+    (ReportDailyApplications, _application_source, ('day', 'application_status', 'application_count')),
+    (ReportDailyJobs, _job_source, ('day', 'company_id', 'job_type', 'location', 'job_count')),
+    (ReportDailySkillDemand, _skill_demand_source, ('day', 'skill_id', 'demand_count')),
+)
+
+
+def _rebuild_fact(model, source, columns, days=None):
+    """Recompute ``model`` for ``days`` (all days when None); returns rows written"""
+    query, day_column = source()
+    clear = delete(model)
+    if days is not None:
+        if not days:
+            return 0
+        query = query.filter(_on_days(day_column, days))
+        clear = clear.where(model.day.in_(sorted(days)))
+
+    rows = [dict(zip(columns, (_as_date(row[0]), *row[1:]))) for row in query if row[0] is not None]
+    db.session.execute(clear)
+    if rows:
+        db.session.execute(insert(model), rows)
+    return len(rows)
+
+
+def refresh_report_facts(full=False):
+    """Bring the daily report tables up to date.
+
+    Incremental runs only recompute the days that gained or changed rows
+    since the previous run: new users, applications created or moved to
+    another status (updated_at), jobs posted or edited. ``full`` rebuilds
+    every day, which also catches deletions; run it nightly. Returns
+    ``{table name: rows written}``.
+    """
+    started = datetime.utcnow()
+    state = db.session.get(ReportRollupState, ROLLUP_NAME)
+    since = None if full or state is None else state.rolled_at
+
+    if since is None:
+        touched = {model: None for model, source, columns in FACTS}
+    else:
+        job_days = _touched_days(JobPosting.created_at, JobPosting.updated_at, since)
+        touched = {
+            ReportDailyRegistrations: _touched_days(User.created_at, User.created_at, since),
+            ReportDailyApplications: _touched_days(JobApplication.applied_at, JobApplication.updated_at, since),
+            ReportDailyJobs: job_days,
+            ReportDailySkillDemand: job_days,
+        }
+
+    written = {
+        model.__tablename__: _rebuild_fact(model, source, columns, touched[model])
+        for model, source, columns in FACTS
+    }
+
+    if state is None:
+        db.session.add(ReportRollupState(name=ROLLUP_NAME, rolled_at=started))
+    else:
+        state.rolled_at = started
+    db.session.commit()
+    return written
+
+
+# --- REPORTS ---
+# Each reads only the fact tables, so the cost depends on the number of
+# days and dimension values in range, not on the size of the source tables.
+
+def _in_range(query, day_column, date_from=None, date_to=None):
+    if date_from:
+        query = query.filter(day_column >= date_from)
+    if date_to:
+        query = query.filter(day_column <= date_to)
+    return query
+
+
+def user_growth_report(date_from=None, date_to=None):
+    """``[(day, user_type, count)]`` ordered by day"""
+    return _in_range(db.session.query(
+        ReportDailyRegistrations.day, ReportDailyRegistrations.user_type, ReportDailyRegistrations.user_count
+    ), ReportDailyRegistrations.day, date_from, date_to).order_by(ReportDailyRegistrations.day).all()
+
+
+def job_statistics_report(date_from=None, date_to=None):
+    """Postings by type, top locations and top companies"""
+    jobs = func.sum(ReportDailyJobs.job_count)
+
+    def grouped(*columns):
+        return _in_range(db.session.query(*columns, jobs), ReportDailyJobs.day, date_from, date_to)
+
+    return {
+        'total_jobs': grouped().scalar() or 0,
+        'by_type': grouped(ReportDailyJobs.job_type).group_by(ReportDailyJobs.job_type).all(),
+        'by_location': grouped(ReportDailyJobs.location).group_by(
+            ReportDailyJobs.location
+        ).order_by(jobs.desc()).limit(10).all(),
+        'by_company': grouped(Company.company_name).join(
+            Company, Company.id == ReportDailyJobs.company_id
+        ).group_by(Company.id, Company.company_name).order_by(jobs.desc()).limit(10).all(),
+    }
+
+
+def daily_applications_report(date_from=None, date_to=None):
+    """``[(day, count)]`` of applications submitted per day"""
+    return _in_range(
+        db.session.query(ReportDailyApplications.day, func.sum(ReportDailyApplications.application_count)),
+        ReportDailyApplications.day, date_from, date_to
+    ).group_by(ReportDailyApplications.day).order_by(ReportDailyApplications.day).all()
+
+
+def status_distribution_report(date_from=None, date_to=None):
+    """``[(status, count)]`` of the current status of applications submitted in range"""
+    return _in_range(
+        db.session.query(ReportDailyApplications.application_status, func.sum(ReportDailyApplications.application_count)),
+        ReportDailyApplications.day, date_from, date_to
+    ).group_by(ReportDailyApplications.application_status).all()
+
+
+def skill_demand_report(date_from=None, date_to=None, limit=20):
+    """``[(skill_name, category, demand_count)]`` for the most required skills"""
+    demand = func.sum(ReportDailySkillDemand.demand_count)
+    return _in_range(db.session.query(
+        Skill.skill_name, Skill.category, demand.label('demand_count')
+    ).join(Skill, Skill.id == ReportDailySkillDemand.skill_id),
+        ReportDailySkillDemand.day, date_from, date_to
+    ).group_by(Skill.id, Skill.skill_name, Skill.category).order_by(demand.desc()).limit(limit).all()
@@ -0,0 +1,85 @@
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+from datetime import datetime
+from sqlalchemy import insert, update
+from extensions import db
+from models import Skill, CacheVersion
+from utils.cache import watch_writes
+
+CATALOG_NAME = 'skills'
+
+# Skill entry; plain data so it can outlive the request that loaded it
+SkillOption = namedtuple('SkillOption', 'id skill_name category')
+
+# Immutable snapshot of the skills table:
+#   skills       tuple of SkillOption ordered by name
+#   by_id        {id: SkillOption}
+#   names        {id: skill_name}
+#   by_category  {category: tuple of SkillOption by name}, categories sorted, None last
+SkillCatalog = namedtuple('SkillCatalog', 'version skills by_id names by_category')
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def catalog_version():
+    """Committed version of the skills table (0 before the first write)"""
+    return db.session.query(CacheVersion.version).filter(
+        CacheVersion.name == CATALOG_NAME
+    ).scalar() or 0
+
+
+def build_skill_catalog(version):
+    skills = tuple(SkillOption(*row) for row in db.session.query(
+        Skill.id, Skill.skill_name, Skill.category
+    ).order_by(Skill.skill_name))
+
+    by_category = {}
+    for skill in skills:
+        by_category.setdefault(skill.category, []).append(skill)
+
+    return SkillCatalog(
+        version=version,
+        skills=skills,
+        by_id=MappingProxyType({skill.id: skill for skill in skills}),
+        names=MappingProxyType({skill.id: skill.skill_name for skill in skills}),
+        by_category=MappingProxyType({
+            category: tuple(by_category[category])
+            for category in sorted(by_category, key=lambda c: (c is None, c or ''))
+        }),
+    )
+
+
+def get_skill_catalog():
+    """Current catalog snapshot.
+
+    Costs one primary-key lookup of the version counter; the skills are
+    only reloaded when another transaction (in any process) changed them.
+    """
+    global _catalog
+    version = catalog_version()
+    catalog = _catalog
+    if catalog is None or catalog.version != version:
+        with _catalog_lock:
+            catalog = _catalog
+            if catalog is None or catalog.version != version:
+                catalog = _catalog = build_skill_catalog(version)
+    return catalog
+
+
+# --- VERSION BUMPS ---
+# The counter moves inside the transaction that writes skills, once per
+# transaction, so other processes see the new version exactly when the
+# new rows become visible to them.
+
+def _bump_version(session):
+    connection = session.connection()
+    result = connection.execute(update(CacheVersion).where(CacheVersion.name == CATALOG_NAME).values(
+        version=CacheVersion.version + 1, updated_at=datetime.utcnow()
+    ))
+    if not result.rowcount:
+        connection.execute(insert(CacheVersion).values(name=CATALOG_NAME, version=1, updated_at=datetime.utcnow()))
+
+
+watch_writes(Skill, on_write=_bump_version)
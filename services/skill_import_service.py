@@ -0,0 +1,124 @@
+import csv
+import io
+from collections import namedtuple
+from sqlalchemy import insert, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from extensions import db
+from models import Skill
+
+IMPORT_BATCH_SIZE = 1000
+# Invalid rows listed individually in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+SKILL_NAME_LENGTH = Skill.__table__.c.skill_name.type.length
+CATEGORY_LENGTH = Skill.__table__.c.category.type.length
+
+SkillImportReport = namedtuple('SkillImportReport', 'added skipped invalid errors')
+
+
+def _dialect():
+    return db.session.get_bind(mapper=Skill.__mapper__).dialect.name
+
+
+def _insert_ignoring_duplicates(dialect):
+    """INSERT into skills that leaves rows with an existing skill_name alone.
+
+    Built on the table rather than the model so the result has a rowcount
+    of the rows actually inserted.
+    """
+    table = Skill.__table__
+    if dialect in ('mysql', 'mariadb'):
+        # Not ON DUPLICATE KEY UPDATE: with CLIENT_FOUND_ROWS a duplicate counts as an affected row
+        return insert(table).prefix_with('IGNORE')
+    if dialect == 'sqlite':
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=['skill_name'])
+    return insert(table)
+
+
+def _key(name):
+    # skill_name is unique under a case-insensitive collation on MySQL
+    return name.casefold()
+
+
+def _insert_batch(pending):
+    """Insert the rows of ``pending`` whose names are not in the table yet; returns ``(added, already present)``"""
+    dialect = _dialect()
+    names = [row['skill_name'] for row in pending.values()]
+    if dialect == 'sqlite':
+        # SQLite compares names case-sensitively
+        condition = func.lower(Skill.skill_name).in_([name.lower() for name in names])
+    else:
+        # MySQL's _ci collation already ignores case, and a bare column keeps the unique index usable
+        condition = Skill.skill_name.in_(names)
+    existing = {_key(name) for name, in db.session.query(Skill.skill_name).filter(condition)}
+    rows = [row for key, row in pending.items() if key not in existing]
+    added = 0
+    if rows:
+        # The duplicate handling only covers a concurrent import inserting the same names
+        result = db.session.execute(_insert_ignoring_duplicates(dialect), rows)
+        added = result.rowcount if result.rowcount >= 0 else len(rows)
+    return added, len(pending) - added
+
+
+def import_skills_csv(stream, batch_size=IMPORT_BATCH_SIZE):
+    """Import skills from a CSV with a ``skill_name`` column (``category``, ``description`` optional).
+
+    The file is read row by row from ``stream`` (binary, UTF-8). Names are
+    compared trimmed and case-insensitively, against the rest of the file
+    through a set and against the table with one IN query per batch, and
+    new skills go in with one multi-row insert per batch. Commits once at
+    the end; raises ValueError when the file has no ``skill_name`` column.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    if not reader.fieldnames or 'skill_name' not in [name.strip() for name in reader.fieldnames]:
+        raise ValueError('CSV file must have a skill_name column')
+    reader.fieldnames = [name.strip() for name in reader.fieldnames]
+
+    seen = set()
+    pending = {}
+    added = skipped = invalid = 0
+    errors = []
+
+    def reject(message):
+        nonlocal invalid
+        invalid += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append((reader.line_num, message))
+
+    for row in reader:
+        name = (row.get('skill_name') or '').strip()
+        category = (row.get('category') or '').strip() or 'General'
+        if not name:
+            reject('missing skill_name')
+            continue
+        if len(name) > SKILL_NAME_LENGTH:
+            reject(f'skill_name longer than {SKILL_NAME_LENGTH} characters')
+            continue
+        if len(category) > CATEGORY_LENGTH:
+            reject(f'category longer than {CATEGORY_LENGTH} characters')
+            continue
+
+        key = _key(name)
+        if key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+
+        pending[key] = {
+            'skill_name': name,
+            'category': category,
+            'description': (row.get('description') or '').strip()
+        }
+        if len(pending) >= batch_size:
+            inserted, existing = _insert_batch(pending)
+            added += inserted
+            skipped += existing
+            pending = {}
+
+    if pending:
+        inserted, existing = _insert_batch(pending)
+        added += inserted
+        skipped += existing
+
+    db.session.commit()
+    return SkillImportReport(added, skipped, invalid, errors)
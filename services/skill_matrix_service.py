@@ -0,0 +1,460 @@
+import copy
+import threading
+import time
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import select, union, inspect
+
+from extensions import db
+from models import CandidateProfile, JobPosting, JobRequiredSkill, CandidateSkill, CvDocument, CvSkillMention
+from utils.cache import watch_writes, ALL_ROWS
+
+# Tables whose rows feed the matrix; committed writes patch the cached copy
+MATCH_INPUT_MODELS = (CandidateSkill, JobRequiredSkill, CandidateProfile, JobPosting, CvSkillMention)
+
+# Columns that feed the scores; edits to other profile and posting fields leave the matrix alone
+CANDIDATE_MATCH_COLUMNS = ('experience_years', 'location', 'salary_expectation', 'cv_sha256')
+JOB_MATCH_COLUMNS = ('is_active', 'experience_required', 'location', 'salary_min', 'salary_max')
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+# Rows written since the snapshot was last patched
+_pending_jobs = set()
+_pending_candidates = set()
+_pending_documents = set()
+
+
+def _cents(value):
+    """Money as integer cents so salary comparisons stay exact"""
+    return int((value * 100).to_integral_value()) if value else 0
+
+
+def _index_locations(locations):
+    """Encode lowercased locations as codes into a list of distinct values (-1 = none)"""
+    distinct = {}
+    codes = np.full(len(locations), -1, dtype=np.int64)
+    for i, location in enumerate(locations):
+        if location:
+            codes[i] = distinct.setdefault(location.lower(), len(distinct))
+    return codes, list(distinct)
+
+
+def _location_code(location, distinct):
+    """Code of one location, appending it to ``distinct`` when new"""
+    if not location:
+        return -1
+    location = location.lower()
+    if location not in distinct:
+        distinct.append(location)
+        return len(distinct) - 1
+    return distinct.index(location)
+
+
+def _job_weight(importance):
+    return 3 if importance == 'Required' else 2 if importance == 'Preferred' else 1
+
+
+def _location_points(location, codes, distinct):
+    """10 for a substring match either way, 5 for any other pair, 0 if one is missing"""
+    if not location:
+        return np.zeros(len(codes), dtype=np.int64)
+    location = location.lower()
+    per_value = np.array(
+        [10 if location in other or other in location else 5 for other in distinct] + [0],
+        dtype=np.int64
+    )
+    # code -1 picks the trailing 0
+    return per_value[codes]
+
+
+class SkillMatrix:
+    """Immutable snapshot of every match input, held as sparse COO arrays.
+
+    Job rows carry the Required=3 / Preferred=2 / Nice to have=1 weights of
+    their required skills; candidate rows are 0/1 over the same skill
+    columns. Overlap for one candidate against all jobs (or one job against
+    all candidates) is a single sparse matrix-vector product.
+    """
+
+    def __init__(self, jobs, job_skills, candidates, candidate_skills):
+        skill_ids = sorted({skill_id for _, skill_id, _ in job_skills} |
+                           {skill_id for _, skill_id in candidate_skills})
+        self.skill_col = {skill_id: i for i, skill_id in enumerate(skill_ids)}
+        self.n_skills = len(skill_ids)
+
+        # --- jobs ---
+        self.job_ids = np.array([row[0] for row in jobs], dtype=np.int64)
+        self.job_row = {job_id: i for i, job_id in enumerate(self.job_ids.tolist())}
+        self.job_active = np.array([bool(row[1]) for row in jobs], dtype=bool)
+        self.job_experience = np.array([row[2] or 0 for row in jobs], dtype=np.int64)
+        self.job_location, self.job_locations = _index_locations([row[3] for row in jobs])
+        self.job_salary_min = np.array([_cents(row[4]) for row in jobs], dtype=np.int64)
+        self.job_salary_max = np.array([_cents(row[5]) for row in jobs], dtype=np.int64)
+
+        rows = [self.job_row[job_id] for job_id, _, _ in job_skills if job_id in self.job_row]
+        self.job_skill_rows = np.array(rows, dtype=np.int64)
+        self.job_skill_cols = np.array(
+            [self.skill_col[skill_id] for job_id, skill_id, _ in job_skills if job_id in self.job_row],
+            dtype=np.int64
+        )
+        self.job_skill_weights = np.array(
+            [weight for job_id, _, weight in job_skills if job_id in self.job_row],
+            dtype=np.float64
+        )
+        self.job_total_weight = np.bincount(
+            self.job_skill_rows, weights=self.job_skill_weights, minlength=len(self.job_ids)
+        )
+
+        # --- candidates ---
+        self.candidate_ids = np.array([row[0] for row in candidates], dtype=np.int64)
+        self.candidate_row = {cid: i for i, cid in enumerate(self.candidate_ids.tolist())}
+        self.candidate_experience = np.array([row[1] or 0 for row in candidates], dtype=np.int64)
+        self.candidate_location_values = [row[2] for row in candidates]
+        self.candidate_location, self.candidate_locations = _index_locations(self.candidate_location_values)
+        self.candidate_salary = np.array([_cents(row[3]) for row in candidates], dtype=np.int64)
+
+        pairs = [(self.candidate_row[cid], self.skill_col[skill_id])
+                 for cid, skill_id in candidate_skills if cid in self.candidate_row]
+        self.candidate_skill_rows = np.array([r for r, _ in pairs], dtype=np.int64)
+        self.candidate_skill_cols = np.array([c for _, c in pairs], dtype=np.int64)
+
+        self.built_at = time.monotonic()
+
+    # --- patching ---
+
+    def patched(self, job_ids, jobs, job_skills, candidate_ids, candidates, candidate_skills):
+        """Copy with the rows of ``job_ids`` and ``candidate_ids`` replaced.
+
+        ``jobs``, ``job_skills``, ``candidates`` and ``candidate_skills`` are
+        freshly loaded for just those ids, in the constructor's layouts; ids
+        with no row were deleted and stay behind inactive and without skills.
+        Arrays are copied, never changed in place, so callers holding this
+        snapshot keep a consistent view.
+        """
+        matrix = copy.copy(self)
+        matrix.skill_col = dict(self.skill_col)
+        if job_ids:
+            matrix._patch_jobs(job_ids, jobs, job_skills)
+        if candidate_ids:
+            matrix._patch_candidates(candidate_ids, candidates, candidate_skills)
+        return matrix
+
+    def _columns_for(self, skill_ids):
+        cols = [self.skill_col.setdefault(skill_id, len(self.skill_col)) for skill_id in skill_ids]
+        self.n_skills = len(self.skill_col)
+        return np.array(cols, dtype=np.int64)
+
+    def _patch_jobs(self, job_ids, jobs, job_skills):
+        new_ids = [row[0] for row in jobs if row[0] not in self.job_row]
+        grow = len(new_ids)
+        if grow:
+            self.job_row = dict(self.job_row)
+            for job_id in new_ids:
+                self.job_row[job_id] = len(self.job_row)
+            self.job_ids = np.concatenate([self.job_ids, np.array(new_ids, dtype=np.int64)])
+        self.job_active = np.concatenate([self.job_active, np.zeros(grow, dtype=bool)])
+        self.job_experience = np.concatenate([self.job_experience, np.zeros(grow, dtype=np.int64)])
+        self.job_location = np.concatenate([self.job_location, np.full(grow, -1, dtype=np.int64)])
+        self.job_salary_min = np.concatenate([self.job_salary_min, np.zeros(grow, dtype=np.int64)])
+        self.job_salary_max = np.concatenate([self.job_salary_max, np.zeros(grow, dtype=np.int64)])
+        self.job_locations = list(self.job_locations)
+
+        rows = np.array([self.job_row[job_id] for job_id in job_ids if job_id in self.job_row], dtype=np.int64)
+        self.job_active[rows] = False
+        for job_id, is_active, experience, location, salary_min, salary_max in jobs:
+            row = self.job_row[job_id]
+            self.job_active[row] = bool(is_active)
+            self.job_experience[row] = experience or 0
+            self.job_location[row] = _location_code(location, self.job_locations)
+            self.job_salary_min[row] = _cents(salary_min)
+            self.job_salary_max[row] = _cents(salary_max)
+
+        keep = ~np.isin(self.job_skill_rows, rows)
+        self.job_skill_rows = np.concatenate([
+            self.job_skill_rows[keep],
+            np.array([self.job_row[job_id] for job_id, _, _ in job_skills], dtype=np.int64)
+        ])
+        self.job_skill_cols = np.concatenate([
+            self.job_skill_cols[keep], self._columns_for([skill_id for _, skill_id, _ in job_skills])
+        ])
+        self.job_skill_weights = np.concatenate([
+            self.job_skill_weights[keep], np.array([weight for _, _, weight in job_skills], dtype=np.float64)
+        ])
+        self.job_total_weight = np.bincount(
+            self.job_skill_rows, weights=self.job_skill_weights, minlength=len(self.job_ids)
+        )
+
+    def _patch_candidates(self, candidate_ids, candidates, candidate_skills):
+        new_ids = [row[0] for row in candidates if row[0] not in self.candidate_row]
+        grow = len(new_ids)
+        if grow:
+            self.candidate_row = dict(self.candidate_row)
+            for candidate_id in new_ids:
+                self.candidate_row[candidate_id] = len(self.candidate_row)
+            self.candidate_ids = np.concatenate([self.candidate_ids, np.array(new_ids, dtype=np.int64)])
+        self.candidate_experience = np.concatenate([self.candidate_experience, np.zeros(grow, dtype=np.int64)])
+        self.candidate_location = np.concatenate([self.candidate_location, np.full(grow, -1, dtype=np.int64)])
+        self.candidate_salary = np.concatenate([self.candidate_salary, np.zeros(grow, dtype=np.int64)])
+        self.candidate_location_values = self.candidate_location_values + [None] * grow
+        self.candidate_locations = list(self.candidate_locations)
+
+        rows = np.array(
+            [self.candidate_row[cid] for cid in candidate_ids if cid in self.candidate_row], dtype=np.int64
+        )
+        for candidate_id, experience, location, salary in candidates:
+            row = self.candidate_row[candidate_id]
+            self.candidate_experience[row] = experience or 0
+            self.candidate_location_values[row] = location
+            self.candidate_location[row] = _location_code(location, self.candidate_locations)
+            self.candidate_salary[row] = _cents(salary)
+
+        keep = ~np.isin(self.candidate_skill_rows, rows)
+        self.candidate_skill_rows = np.concatenate([
+            self.candidate_skill_rows[keep],
+            np.array([self.candidate_row[cid] for cid, _ in candidate_skills], dtype=np.int64)
+        ])
+        self.candidate_skill_cols = np.concatenate([
+            self.candidate_skill_cols[keep], self._columns_for([skill_id for _, skill_id in candidate_skills])
+        ])
+
+    # --- membership ---
+
+    def has_candidate(self, candidate_id):
+        return candidate_id in self.candidate_row
+
+    def has_job(self, job_id):
+        return job_id in self.job_row
+
+    # --- skill overlap ---
+
+    def _skill_points(self, matched, total):
+        """Same rule as calculate_job_match_score: int(matched/total*50), or 25 with no skills"""
+        points = np.full(len(total), 25, dtype=np.int64)
+        has_skills = total > 0
+        points[has_skills] = ((matched[has_skills] / total[has_skills]) * 50).astype(np.int64)
+        return points
+
+    def job_skill_points(self, candidate_id):
+        """Skill points (0-50) of one candidate against every job row"""
+        vector = np.zeros(self.n_skills, dtype=np.float64)
+        row = self.candidate_row[candidate_id]
+        vector[self.candidate_skill_cols[self.candidate_skill_rows == row]] = 1.0
+        matched = np.bincount(
+            self.job_skill_rows,
+            weights=self.job_skill_weights * vector[self.job_skill_cols],
+            minlength=len(self.job_ids)
+        )
+        return self._skill_points(matched, self.job_total_weight)
+
+    def candidate_skill_points(self, job_id):
+        """Skill points (0-50) of every candidate row against one job"""
+        row = self.job_row[job_id]
+        mask = self.job_skill_rows == row
+        vector = np.bincount(
+            self.job_skill_cols[mask], weights=self.job_skill_weights[mask], minlength=self.n_skills
+        )
+        matched = np.bincount(
+            self.candidate_skill_rows,
+            weights=vector[self.candidate_skill_cols],
+            minlength=len(self.candidate_ids)
+        )
+        total = np.full(len(self.candidate_ids), self.job_total_weight[row])
+        return self._skill_points(matched, total)
+
+    # --- full scores ---
+
+    @staticmethod
+    def _experience_points(candidate_years, required_years):
+        return np.where(
+            candidate_years >= required_years, 30,
+            np.where(candidate_years >= required_years * 0.7, 20,
+                     np.where(candidate_years >= required_years * 0.5, 10, 0))
+        )
+
+    @staticmethod
+    def _salary_points(expectation, salary_min, salary_max):
+        has_range = (expectation > 0) & (salary_min > 0) & (salary_max > 0)
+        # expectation <= salary_max * 1.2, kept in integer cents
+        within = (salary_min <= expectation) & (expectation <= salary_max)
+        near = expectation * 10 <= salary_max * 12
+        return np.where(has_range, np.where(within, 10, np.where(near, 5, 0)), 0)
+
+    def score_jobs_for_candidate(self, candidate_id, job_ids=None):
+        """``{job_id: score}`` for all active jobs, or for ``job_ids``"""
+        row = self.candidate_row[candidate_id]
+        scores = (
+            self._experience_points(self.candidate_experience[row], self.job_experience) +
+            self.job_skill_points(candidate_id) +
+            _location_points(self.candidate_location_values[row], self.job_location, self.job_locations) +
+            self._salary_points(self.candidate_salary[row], self.job_salary_min, self.job_salary_max)
+        )
+        scores = np.minimum(scores, 100)
+
+        if job_ids is None:
+            rows = np.flatnonzero(self.job_active)
+        else:
+            rows = np.array([self.job_row[job_id] for job_id in job_ids], dtype=np.int64)
+        return dict(zip(self.job_ids[rows].tolist(), scores[rows].tolist()))
+
+    def score_candidates_for_job(self, job_id, candidate_ids=None):
+        """``{candidate_id: score}`` for all candidates, or for ``candidate_ids``"""
+        row = self.job_row[job_id]
+        job_location = self.job_locations[self.job_location[row]] if self.job_location[row] >= 0 else None
+        scores = (
+            self._experience_points(self.candidate_experience, self.job_experience[row]) +
+            self.candidate_skill_points(job_id) +
+            _location_points(job_location, self.candidate_location, self.candidate_locations) +
+            self._salary_points(self.candidate_salary, self.job_salary_min[row], self.job_salary_max[row])
+        )
+        scores = np.minimum(scores, 100)
+
+        if candidate_ids is None:
+            rows = np.arange(len(self.candidate_ids))
+        else:
+            rows = np.array([self.candidate_row[cid] for cid in candidate_ids], dtype=np.int64)
+        return dict(zip(self.candidate_ids[rows].tolist(), scores[rows].tolist()))
+
+
+def _load_inputs(job_ids=None, candidate_ids=None):
+    """``(jobs, job_skills, candidates, candidate_skills)`` rows, for all or just the given ids"""
+    jobs = db.session.query(
+        JobPosting.id, JobPosting.is_active, JobPosting.experience_required,
+        JobPosting.location, JobPosting.salary_min, JobPosting.salary_max
+    )
+    job_skills = db.session.query(JobRequiredSkill.job_id, JobRequiredSkill.skill_id, JobRequiredSkill.importance)
+    candidates = db.session.query(
+        CandidateProfile.id, CandidateProfile.experience_years,
+        CandidateProfile.location, CandidateProfile.salary_expectation
+    )
+    if job_ids is not None:
+        jobs = jobs.filter(JobPosting.id.in_(job_ids))
+        job_skills = job_skills.filter(JobRequiredSkill.job_id.in_(job_ids))
+    if candidate_ids is not None:
+        candidates = candidates.filter(CandidateProfile.id.in_(candidate_ids))
+    pairs = candidate_skill_pairs(candidate_ids)
+    return (
+        jobs.all(),
+        [(job_id, skill_id, _job_weight(importance)) for job_id, skill_id, importance in job_skills],
+        candidates.all(),
+        db.session.query(pairs.c.candidate_id, pairs.c.skill_id).all()
+    )
+
+
+def build_skill_matrix():
+    """Load every match input in four queries and build a fresh snapshot"""
+    return SkillMatrix(*_load_inputs())
+
+
+def patch_skill_matrix(matrix, job_ids, candidate_ids):
+    """``matrix`` with the given jobs and candidates re-read from the database"""
+    job_ids, candidate_ids = list(job_ids), list(candidate_ids)
+    jobs, job_skills, candidates, candidate_skills = _load_inputs(job_ids or [], candidate_ids or [])
+    return matrix.patched(job_ids, jobs, job_skills, candidate_ids, candidates, candidate_skills)
+
+
+def candidate_skill_pairs(candidate_ids=None, skill_ids=None):
+    """Subquery of distinct ``(candidate_id, skill_id)``: the skills a candidate has for matching.
+
+    That is the skills picked on the profile plus the catalog skills named
+    in the text extracted from the candidate's CV. ``candidate_ids`` and
+    ``skill_ids`` narrow both halves.
+    """
+    picked = select(CandidateSkill.candidate_id.label('candidate_id'), CandidateSkill.skill_id.label('skill_id'))
+    from_cv = select(CandidateProfile.id, CvSkillMention.skill_id).join(
+        CvDocument, CvDocument.sha256 == CandidateProfile.cv_sha256
+    ).join(
+        CvSkillMention, CvSkillMention.document_id == CvDocument.id
+    )
+    if candidate_ids is not None:
+        picked = picked.where(CandidateSkill.candidate_id.in_(candidate_ids))
+        from_cv = from_cv.where(CandidateProfile.id.in_(candidate_ids))
+    if skill_ids is not None:
+        picked = picked.where(CandidateSkill.skill_id.in_(skill_ids))
+        from_cv = from_cv.where(CvSkillMention.skill_id.in_(skill_ids))
+    return union(picked, from_cv).subquery('candidate_skill_pairs')
+
+
+def get_skill_matrix():
+    """Process-wide snapshot, patched with this process's committed writes.
+
+    Rows written since the last lookup are re-read and swapped in; the
+    whole snapshot is rebuilt every SKILL_MATRIX_TTL seconds, which is how
+    writes from other processes (and bulk statements) reach it.
+    """
+    global _matrix
+    ttl = current_app.config.get('SKILL_MATRIX_TTL', 300)
+    matrix = _matrix
+    if matrix is not None and time.monotonic() - matrix.built_at < ttl and not (
+        _pending_jobs or _pending_candidates or _pending_documents
+    ):
+        return matrix
+
+    with _matrix_lock:
+        matrix = _matrix
+        if matrix is None or time.monotonic() - matrix.built_at >= ttl:
+            _take_pending()
+            matrix = _matrix = build_skill_matrix()
+        else:
+            job_ids, candidate_ids, document_ids = _take_pending()
+            if document_ids:
+                candidate_ids |= {cid for (cid,) in db.session.query(CandidateProfile.id).join(
+                    CvDocument, CvDocument.sha256 == CandidateProfile.cv_sha256
+                ).filter(CvDocument.id.in_(document_ids))}
+            if job_ids or candidate_ids:
+                matrix = _matrix = patch_skill_matrix(matrix, job_ids, candidate_ids)
+        return matrix
+
+
+def _take_pending():
+    pending = set(_pending_jobs), set(_pending_candidates), set(_pending_documents)
+    _pending_jobs.clear()
+    _pending_candidates.clear()
+    _pending_documents.clear()
+    return pending
+
+
+def invalidate_skill_matrix():
+    """Drop the cached snapshot; the next lookup rebuilds it"""
+    global _matrix
+    _matrix = None
+
+
+# --- AUTOMATIC UPDATES ---
+# Writes are noted per session and only handed to the matrix once they are
+# committed, so a concurrent rebuild can't cache rows that are rolled back.
+
+def _written_key(instance):
+    if isinstance(instance, CandidateSkill):
+        return ('candidate', instance.candidate_id)
+    if isinstance(instance, JobRequiredSkill):
+        return ('job', instance.job_id)
+    if isinstance(instance, CvSkillMention):
+        return ('document', instance.document_id)
+
+    if isinstance(instance, CandidateProfile):
+        kind, columns = 'candidate', CANDIDATE_MATCH_COLUMNS
+    else:
+        kind, columns = 'job', JOB_MATCH_COLUMNS
+    state = inspect(instance)
+    if state.pending or instance in state.session.deleted or any(
+        state.attrs[name].history.has_changes() for name in columns
+    ):
+        return (kind, instance.id)
+    return None
+
+
+_PENDING = {'job': _pending_jobs, 'candidate': _pending_candidates, 'document': _pending_documents}
+
+
+def _queue_committed_writes(written):
+    if ALL_ROWS in written:
+        invalidate_skill_matrix()
+        return
+    with _matrix_lock:
+        for kind, key in written:
+            _PENDING[kind].add(key)
+
+
+watch_writes(*MATCH_INPUT_MODELS, on_commit=_queue_committed_writes, key=_written_key)
@@ -0,0 +1,115 @@
+from collections import namedtuple
+from flask import current_app
+from werkzeug.utils import secure_filename
+from services.blob_store_service import blob_store
+
+# Bytes read up front to tell the file type from its signature
+SNIFF_BYTES = 16
+
+PDF = 'application/pdf'
+DOC = 'application/msword'
+DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+JPEG = 'image/jpeg'
+PNG = 'image/png'
+GIF = 'image/gif'
+WEBP = 'image/webp'
+
+_SIGNATURES = (
+    (b'%PDF-', PDF),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', DOC),  # OLE2 compound file (Word 97-2003)
+    (b'\x89PNG\r\n\x1a\n', PNG),
+    (b'\xff\xd8\xff', JPEG),
+    (b'GIF87a', GIF),
+    (b'GIF89a', GIF),
+)
+
+# What each kind of upload may be; size limits come from UPLOAD_LIMITS
+UPLOAD_TYPES = {
+    'cv': {PDF, DOC, DOCX},
+    'experience_proof': {PDF, DOC, DOCX, JPEG, PNG},
+    'certificate': {PDF, JPEG, PNG},
+    'logo': {PNG, JPEG, GIF, WEBP},
+}
+
+_TYPE_NAMES = {PDF: 'PDF', DOC: 'DOC', DOCX: 'DOCX', JPEG: 'JPG', PNG: 'PNG', GIF: 'GIF', WEBP: 'WEBP'}
+
+# A stored upload: blob store key, size in bytes, sniffed MIME type, safe file name
+Upload = namedtuple('Upload', 'digest size mimetype filename')
+
+
+class UploadError(ValueError):
+    """An upload that is too large or not of an accepted type; the message is shown to the user"""
+
+
+def sniff_mimetype(head, filename=''):
+    """MIME type from the first bytes of a file, or None when it is none of the known formats.
+
+    A ZIP signature only counts as DOCX when the name says so; the
+    container looks the same for every Office Open XML format.
+    """
+    for signature, mimetype in _SIGNATURES:
+        if head.startswith(signature):
+            return mimetype
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return WEBP
+    if head.startswith(b'PK\x03\x04') and filename.lower().endswith('.docx'):
+        return DOCX
+    return None
+
+
+def _megabytes(size):
+    return f'{size / (1024 * 1024):g} MB'
+
+
+class _LimitedStream:
+    """Replays the sniffed head, then reads through; fails once more than ``limit`` bytes went by"""
+
+    def __init__(self, head, stream, limit, label):
+        self._head = head
+        self._stream = stream
+        self._limit = limit
+        self._label = label
+        self.size = 0
+
+    def read(self, size):
+        if self._head:
+            chunk, self._head = self._head[:size], self._head[size:]
+        else:
+            chunk = self._stream.read(size)
+        self.size += len(chunk)
+        if self.size > self._limit:
+            raise UploadError(f'{self._label} is larger than {_megabytes(self._limit)}')
+        return chunk
+
+
+def receive_upload(file, kind, label='File'):
+    """Check an uploaded file and stream it into the blob store; returns an Upload.
+
+    The file is read once, in blob-store chunks, from the spool file the
+    form parser wrote: its type is taken from its leading bytes (not the
+    browser's Content-Type), the size is counted against
+    ``UPLOAD_LIMITS[kind]`` and the SHA-256 is computed as it is copied.
+    Raises UploadError, leaving nothing stored, when a check fails.
+    """
+    filename = secure_filename(file.filename or '') or kind
+    head = file.stream.read(SNIFF_BYTES)
+    mimetype = sniff_mimetype(head, filename)
+    allowed = UPLOAD_TYPES[kind]
+    if mimetype not in allowed:
+        accepted = ', '.join(sorted(_TYPE_NAMES[t] for t in allowed))
+        raise UploadError(f'{label} must be one of: {accepted}')
+
+    stream = _LimitedStream(head, file.stream, current_app.config['UPLOAD_LIMITS'][kind], label)
+    digest = blob_store.put(stream)
+    return Upload(digest, stream.size, mimetype, filename)
+
+
+def store_upload(instance, content_name, file, kind, label='File'):
+    """``receive_upload`` and point ``instance``'s ``<name>_sha256/_filename/_mimetype`` at the result"""
+    upload = receive_upload(file, kind, label)
+    name = content_name[:-len('_content')] if content_name.endswith('_content') else content_name
+    setattr(instance, f'{name}_sha256', upload.digest)
+    setattr(instance, f'{name}_filename', upload.filename)
+    setattr(instance, f'{name}_mimetype', upload.mimetype)
+    setattr(instance, content_name, None)
+    return upload
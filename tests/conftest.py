@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from __init__ import create_app  # noqa: E402
+from config import TestingConfig  # noqa: E402
+from extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    class Config(TestingConfig):
+        BLOB_STORE_DIR = str(tmp_path / 'blobs')
+        EXPORT_DIR = str(tmp_path / 'exports')
+        # Serve browse_jobs from the database query rather than the in-process index
+        JOB_SEARCH_BACKEND = 'database'
+
+    app = create_app(Config)
+    with app.app_context():
+        # The match matrix is process-wide; each test starts from its own empty database
+        from services import skill_matrix_service
+        skill_matrix_service.invalidate_skill_matrix()
+        skill_matrix_service._take_pending()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    def login(user):
+        with client.session_transaction() as session:
+            session['user_id'] = user.id
+            session['user_type'] = user.user_type
+    return login
+
+
+@pytest.fixture
+def statements(app):
+    """SQL text of every statement run on the engine while the test runs"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield captured
+    event.remove(db.engine, 'before_cursor_execute', capture)
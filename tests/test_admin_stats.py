@@ -0,0 +1,17 @@
+from extensions import db
+from models import User
+from services.admin_stats_service import get_dashboard_stats, invalidate_dashboard_stats
+
+
+def test_admin_changes_show_on_the_dashboard_at_once(client, login):
+    admin = User(email='admin@example.com', password_hash='x', user_type='admin', first_name='Test', last_name='Admin')
+    db.session.add(admin)
+    db.session.commit()
+    login(admin)
+    invalidate_dashboard_stats()  # the cache outlives each test's database
+    assert get_dashboard_stats()[0]['total_skills'] == 0
+
+    client.post('/admin/skills', data={'action': 'add_skill', 'skill_name': 'Python', 'category': 'Languages'})
+
+    stats, _ = get_dashboard_stats()
+    assert stats['total_skills'] == 1
@@ -0,0 +1,34 @@
+from extensions import db
+from models import User, Company, CandidateProfile, JobPosting, JobApplication
+
+
+def _user(email, user_type, first_name):
+    user = User(email=email, password_hash='x', user_type=user_type, first_name=first_name, last_name='Example')
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def test_pool_hides_contact_details_of_candidates_who_did_not_apply(client, login):
+    employer = _user('employer@example.com', 'employer', 'Erin')
+    company = Company(user_id=employer.id, company_name='Acme')
+    db.session.add(company)
+    db.session.flush()
+    job = JobPosting(company_id=company.id, title='Developer', description='d', is_active=True)
+    applicant = CandidateProfile(user_id=_user('applicant@example.com', 'candidate', 'Alice').id)
+    stranger = CandidateProfile(user_id=_user('stranger@example.com', 'candidate', 'Sam').id)
+    db.session.add_all([job, applicant, stranger])
+    db.session.flush()
+    db.session.add(JobApplication(job_id=job.id, candidate_id=applicant.id))
+    db.session.commit()
+    login(employer)
+
+    rows = {row['candidate_id']: row for row in
+            client.get(f'/employer/api/job/{job.id}/candidates?scope=pool').get_json()['candidates']}
+    assert (rows[applicant.id]['name'], rows[applicant.id]['email']) == ('Alice Example', 'applicant@example.com')
+    assert (rows[stranger.id]['name'], rows[stranger.id]['email']) == (f'Candidate #{stranger.id}', None)
+
+    page = client.get(f'/employer/job/{job.id}/candidates?scope=pool').get_data(as_text=True)
+    assert 'Alice Example' in page
+    assert 'Sam Example' not in page and 'stranger@example.com' not in page
+    assert f'Candidate #{stranger.id}' in page
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import ExportJob
+from services import export_service
+from services.export_service import expire_stale_exports
+
+
+def _job(status, quiet_for):
+    job = ExportJob(data_type='jobs', status=status, heartbeat_at=datetime.utcnow() - timedelta(seconds=quiet_for))
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def test_only_silent_jobs_expire(app):
+    stale_running = _job('running', 3600)
+    live_running = _job('running', 1)
+    orphaned_queued = _job('queued', 3600)
+
+    assert expire_stale_exports() == 2
+
+    assert db.session.get(ExportJob, stale_running).status == 'failed'
+    assert db.session.get(ExportJob, live_running).status == 'running'
+    assert db.session.get(ExportJob, orphaned_queued).status == 'failed'
+
+
+def test_jobs_queued_behind_a_long_export_stay_alive(app):
+    running = _job('running', 1)
+    waiting = _job('queued', 3600)
+    export_service._waiting.add(waiting)
+    try:
+        export_service._set_progress(running, rows_written=1000)
+    finally:
+        export_service._waiting.discard(waiting)
+
+    assert expire_stale_exports() == 0
+    db.session.expire_all()
+    assert db.session.get(ExportJob, waiting).status == 'queued'
@@ -0,0 +1,85 @@
+"""The job and skill exports read their counts set-wise (user-017).
+
+Each export must issue the same number of statements however many rows it
+covers; a per-row COUNT would grow with the seeded data.
+"""
+import pytest
+
+from extensions import db
+from models import User, Company, CandidateProfile, JobPosting, JobApplication, Skill, CandidateSkill, JobRequiredSkill
+from services.export_service import export_rows
+
+
+def _seed(count, start=0):
+    """``count`` more jobs and skills, each applied to / used by a growing number of candidates"""
+    employer = User(email=f'employer{start}@example.com', password_hash='x', user_type='employer',
+                    first_name='Test', last_name='Employer')
+    db.session.add(employer)
+    db.session.flush()
+    company = Company(user_id=employer.id, company_name=f'Company {start}')
+    db.session.add(company)
+    db.session.flush()
+
+    for i in range(start, start + count):
+        user = User(email=f'candidate{i}@example.com', password_hash='x', user_type='candidate',
+                    first_name='Test', last_name='Candidate')
+        db.session.add(user)
+        db.session.flush()
+        candidate = CandidateProfile(user_id=user.id)
+        job = JobPosting(company_id=company.id, title=f'Job {i}', description='Description')
+        skill = Skill(skill_name=f'Skill {i}', category='Testing')
+        db.session.add_all([candidate, job, skill])
+        db.session.flush()
+        db.session.add_all([
+            JobApplication(job_id=job.id, candidate_id=candidate.id),
+            CandidateSkill(candidate_id=candidate.id, skill_id=skill.id),
+            JobRequiredSkill(job_id=job.id, skill_id=skill.id),
+        ])
+    db.session.commit()
+
+
+def _export(statements, data_type):
+    statements.clear()
+    rows = list(export_rows(data_type))
+    return rows, len(statements)
+
+
+@pytest.mark.parametrize('data_type', ['jobs', 'skills'])
+def test_export_statement_count_does_not_grow_with_rows(app, statements, data_type):
+    _seed(2)
+    few_rows, few_statements = _export(statements, data_type)
+    _seed(10, start=2)
+    many_rows, many_statements = _export(statements, data_type)
+
+    assert (len(few_rows), len(many_rows)) == (2, 12)
+    assert few_statements == many_statements == 1
+
+
+def test_export_counts_match_rows(app, statements):
+    _seed(3)
+
+    jobs = list(export_rows('jobs'))
+    skills = list(export_rows('skills'))
+
+    assert [row[-1] for row in jobs] == [1, 1, 1]
+    # One candidate and one job use each skill
+    assert [row[-1] for row in skills] == [2, 2, 2]
+
+
+@pytest.mark.parametrize('data_type', ['jobs', 'skills'])
+def test_admin_export_route_statement_count(client, login, statements, data_type):
+    admin = User(email='admin@example.com', password_hash='x', user_type='admin', first_name='Test', last_name='Admin')
+    db.session.add(admin)
+    db.session.commit()
+    login(admin)
+
+    counts = []
+    for count, start in ((2, 0), (10, 2)):
+        _seed(count, start)
+        statements.clear()
+        response = client.get(f'/admin/export/{data_type}')
+        assert response.status_code == 200
+        assert response.data.decode().count('\n') == start + count + 1
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
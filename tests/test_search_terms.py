@@ -0,0 +1,14 @@
+from services.job_search_service import split_fulltext_terms
+
+
+def test_short_words_and_stopwords_are_not_indexed(app):
+    indexed, unindexed = split_fulltext_terms(['senior', 'go', 'c', 'developer', 'it', 'ai'])
+
+    assert indexed == ['senior', 'developer']
+    assert unindexed == ['go', 'c', 'it', 'ai']
+
+
+def test_min_token_size_follows_config(app):
+    app.config['FULLTEXT_MIN_TOKEN_SIZE'] = 4
+
+    assert split_fulltext_terms(['php', 'rust']) == (['rust'], ['php'])
@@ -0,0 +1,37 @@
+from extensions import db
+from models import (
+    User, Company, CandidateProfile, JobPosting, JobRequiredSkill, CandidateSkill, Skill,
+    CvDocument, CvSkillMention
+)
+
+
+def test_skills_found_in_the_cv_count_as_matching(client, login):
+    employer = User(email='employer@example.com', password_hash='x', user_type='employer',
+                    first_name='Test', last_name='Employer')
+    candidate_user = User(email='candidate@example.com', password_hash='x', user_type='candidate',
+                          first_name='Test', last_name='Candidate')
+    python, go = Skill(skill_name='Python'), Skill(skill_name='Golang')
+    document = CvDocument(sha256='a' * 64, status='done', body='Golang and Python developer')
+    db.session.add_all([employer, candidate_user, python, go, document])
+    db.session.flush()
+    company = Company(user_id=employer.id, company_name='Acme')
+    profile = CandidateProfile(user_id=candidate_user.id, experience_years=5, cv_sha256=document.sha256)
+    db.session.add_all([company, profile])
+    db.session.flush()
+    job = JobPosting(company_id=company.id, title='Backend developer', description='d', is_active=True)
+    db.session.add(job)
+    db.session.flush()
+    db.session.add_all([
+        JobRequiredSkill(job_id=job.id, skill_id=python.id, importance='Required'),
+        JobRequiredSkill(job_id=job.id, skill_id=go.id, importance='Required'),
+        CandidateSkill(candidate_id=profile.id, skill_id=python.id),
+        CvSkillMention(document_id=document.id, skill_id=go.id),
+    ])
+    db.session.commit()
+    login(candidate_user)
+
+    page = client.get('/candidate/skill_analysis').get_data(as_text=True)
+
+    assert 'Backend developer' in page
+    assert 'Matching Skills (2)' in page
+    assert 'Skills to Learn (0)' in page
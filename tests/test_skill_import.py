@@ -0,0 +1,53 @@
+from io import BytesIO
+from unittest import mock
+
+from sqlalchemy.exc import OperationalError
+
+from extensions import db
+from models import User, Skill
+from services.skill_catalog_service import catalog_version
+from services.skill_import_service import import_skills_csv, _insert_batch
+
+
+def test_existing_names_match_case_insensitively(app):
+    db.session.add(Skill(skill_name='Python', category='Languages'))
+    db.session.commit()
+
+    report = import_skills_csv(BytesIO(b'skill_name,category\npython,Languages\nGo,Languages\nGO,Languages\n'))
+
+    assert (report.added, report.skipped, report.invalid) == (1, 2, 0)
+    assert sorted(name for name, in db.session.query(Skill.skill_name)) == ['Go', 'Python']
+
+
+def test_rows_taken_by_a_concurrent_import_are_not_counted(app):
+    db.session.add(Skill(skill_name='Python'))
+    db.session.commit()
+    version = catalog_version()
+
+    # As if the name was inserted after this batch looked for existing ones
+    with mock.patch('services.skill_import_service._key', side_effect=lambda name: object()):
+        added, present = _insert_batch({
+            'python': {'skill_name': 'Python', 'category': 'General', 'description': ''},
+            'go': {'skill_name': 'Go', 'category': 'General', 'description': ''},
+        })
+    db.session.commit()
+
+    assert (added, present) == (1, 1)
+    assert catalog_version() == version + 1
+
+
+def test_database_error_rolls_back_and_is_reported(client, login):
+    admin = User(email='admin@example.com', password_hash='x', user_type='admin', first_name='Test', last_name='Admin')
+    db.session.add(admin)
+    db.session.commit()
+    login(admin)
+
+    error = OperationalError('INSERT INTO skills', {}, Exception('lock wait timeout'))
+    with mock.patch('routes.admin.import_skills_csv', side_effect=error):
+        response = client.post('/admin/skills', data={
+            'action': 'bulk_import',
+            'csv_file': (BytesIO(b'skill_name\nRust\n'), 'skills.csv'),
+        }, follow_redirects=True)
+
+    assert response.status_code == 200
+    assert b'Error importing skills' in response.data
@@ -0,0 +1,133 @@
+from decimal import Decimal
+
+import pytest
+
+from extensions import db
+from models import User, Company, CandidateProfile, JobPosting, JobRequiredSkill, CandidateSkill, Skill, CandidateJobMatch
+from services import skill_matrix_service
+from services.skill_matrix_service import get_skill_matrix
+from services.job_matching_service import (
+    _query_scores_for_candidate, _query_scores_for_job, refresh_candidate_matches
+)
+
+
+@pytest.fixture
+def data(app):
+    skills = [Skill(skill_name=name) for name in ('Python', 'SQL', 'Go', 'Rust')]
+    employer = User(email='employer@example.com', password_hash='x', user_type='employer',
+                    first_name='Test', last_name='Employer')
+    db.session.add_all([*skills, employer])
+    db.session.flush()
+    company = Company(user_id=employer.id, company_name='Acme')
+    db.session.add(company)
+    db.session.flush()
+
+    jobs = [
+        JobPosting(company_id=company.id, title=f'Job {i}', description='d', experience_required=i,
+                   location=('Berlin', 'Remote', None)[i % 3], salary_min=Decimal(1000 * i),
+                   salary_max=Decimal(2000 * i), is_active=True)
+        for i in range(1, 5)
+    ]
+    candidates = []
+    for i in range(3):
+        user = User(email=f'candidate{i}@example.com', password_hash='x', user_type='candidate',
+                    first_name='Test', last_name='Candidate')
+        db.session.add(user)
+        db.session.flush()
+        candidates.append(CandidateProfile(user_id=user.id, experience_years=i * 2, location='Berlin',
+                                           salary_expectation=Decimal(1500 * (i + 1))))
+    db.session.add_all([*jobs, *candidates])
+    db.session.flush()
+    db.session.add_all([
+        JobRequiredSkill(job_id=jobs[0].id, skill_id=skills[0].id, importance='Required'),
+        JobRequiredSkill(job_id=jobs[0].id, skill_id=skills[1].id, importance='Preferred'),
+        JobRequiredSkill(job_id=jobs[1].id, skill_id=skills[2].id, importance='Required'),
+        CandidateSkill(candidate_id=candidates[0].id, skill_id=skills[0].id),
+        CandidateSkill(candidate_id=candidates[1].id, skill_id=skills[2].id),
+    ])
+    db.session.commit()
+    return {'company': company, 'skills': skills, 'jobs': jobs, 'candidates': candidates}
+
+
+def _assert_matrix_matches_database():
+    matrix = get_skill_matrix()
+    for (candidate_id,) in db.session.query(CandidateProfile.id):
+        assert matrix.score_jobs_for_candidate(candidate_id) == _query_scores_for_candidate(candidate_id)
+    for (job_id,) in db.session.query(JobPosting.id):
+        assert matrix.score_candidates_for_job(job_id) == _query_scores_for_job(job_id)
+
+
+def test_committed_writes_patch_the_matrix(data):
+    built = get_skill_matrix()
+    skills, jobs, candidates = data['skills'], data['jobs'], data['candidates']
+
+    candidates[0].experience_years = 9
+    candidates[2].location = 'Remote'
+    db.session.add(CandidateSkill(candidate_id=candidates[2].id, skill_id=skills[3].id))
+    jobs[2].is_active = False
+    JobRequiredSkill.query.filter_by(job_id=jobs[0].id, skill_id=skills[1].id).delete()
+    new_job = JobPosting(company_id=data['company'].id, title='New', description='d', experience_required=1,
+                         location='Lisbon', is_active=True)
+    db.session.add(new_job)
+    db.session.flush()
+    db.session.add(JobRequiredSkill(job_id=new_job.id, skill_id=skills[3].id, importance='Required'))
+    db.session.commit()
+    # The filtered delete above is a bulk statement, which drops the snapshot
+    assert skill_matrix_service._matrix is None
+
+    rebuilt = get_skill_matrix()
+    jobs[1].salary_min = Decimal(100)
+    db.session.add(CandidateSkill(candidate_id=candidates[1].id, skill_id=skills[0].id))
+    db.session.commit()
+
+    patched = get_skill_matrix()
+    assert built is not rebuilt
+    assert patched is not rebuilt and patched.built_at == rebuilt.built_at
+    assert patched.has_job(new_job.id)
+    _assert_matrix_matches_database()
+
+
+def test_patch_keeps_snapshot_and_adds_new_rows(data):
+    built = get_skill_matrix()
+    user = User(email='late@example.com', password_hash='x', user_type='candidate', first_name='L', last_name='C')
+    db.session.add(user)
+    db.session.flush()
+    late = CandidateProfile(user_id=user.id, experience_years=3, location='Berlin')
+    db.session.add(late)
+    db.session.flush()
+    db.session.add(CandidateSkill(candidate_id=late.id, skill_id=data['skills'][2].id))
+    data['jobs'][3].location = 'Remote'
+    db.session.commit()
+
+    patched = get_skill_matrix()
+    assert patched.built_at == built.built_at
+    assert not built.has_candidate(late.id) and patched.has_candidate(late.id)
+    _assert_matrix_matches_database()
+
+
+def test_unrelated_profile_edits_leave_the_matrix_alone(data):
+    matrix = get_skill_matrix()
+    data['candidates'][0].summary = 'Changed summary'
+    data['jobs'][0].title = 'Renamed'
+    db.session.commit()
+
+    assert not skill_matrix_service._pending_candidates and not skill_matrix_service._pending_jobs
+    assert get_skill_matrix() is matrix
+
+
+def test_refresh_scores_jobs_the_matrix_has_not_seen(data):
+    get_skill_matrix()
+    job = JobPosting(company_id=data['company'].id, title='Elsewhere', description='d', is_active=True)
+    db.session.add(job)
+    db.session.commit()
+    # As if another process had posted it: this snapshot never hears of it
+    skill_matrix_service._take_pending()
+
+    candidate_id = data['candidates'][0].id
+    refresh_candidate_matches(candidate_id)
+
+    stored = dict(db.session.query(CandidateJobMatch.job_id, CandidateJobMatch.match_score).filter_by(
+        candidate_id=candidate_id
+    ))
+    assert stored == _query_scores_for_candidate(candidate_id)
+    assert job.id in stored
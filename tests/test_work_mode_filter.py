@@ -0,0 +1,41 @@
+from extensions import db
+from models import User, Company, JobPosting
+from routes.job import _query_browse_jobs
+from services.job_index_service import JobIndex, _load_documents
+from services.job_search_service import index_job
+
+
+def test_work_mode_matches_location_and_description_on_both_backends(app):
+    employer = User(email='employer@example.com', password_hash='x', user_type='employer',
+                    first_name='Test', last_name='Employer')
+    db.session.add(employer)
+    db.session.flush()
+    remote_inc = Company(user_id=employer.id, company_name='Remote Inc')
+    db.session.add(remote_inc)
+    db.session.flush()
+    jobs = {
+        'located': JobPosting(company_id=remote_inc.id, title='Engineer', description='Office based', location='Remote'),
+        'described': JobPosting(company_id=remote_inc.id, title='Engineer', description='Fully remote team', location='Berlin'),
+        'title_only': JobPosting(company_id=remote_inc.id, title='Remote tooling engineer', description='On site', location='Berlin'),
+        'company_only': JobPosting(company_id=remote_inc.id, title='Engineer', description='On site', location='Lisbon'),
+    }
+    for job in jobs.values():
+        job.is_active = True
+    db.session.add_all(jobs.values())
+    db.session.flush()
+    for job in jobs.values():
+        index_job(job, remote_inc)
+    db.session.commit()
+
+    index = JobIndex.build(_load_documents())
+    from_index, _ = index.search(work_mode='Remote')
+    pagination, _, _ = _query_browse_jobs('', '', [], 'Remote', '', None, None, 'newest', 1)
+    from_database = [job.id for job, _ in pagination.items]
+
+    expected = {jobs['located'].id, jobs['described'].id}
+    assert set(from_index) == expected
+    assert set(from_database) == expected
+
+    # Incremental updates keep the description terms in step
+    index.remove(jobs['described'].id)
+    assert index.search(work_mode='Remote')[0] == [jobs['located'].id]
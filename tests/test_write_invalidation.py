@@ -0,0 +1,69 @@
+from sqlalchemy import update
+
+from extensions import db
+from models import Skill, CacheVersion, CandidateProfile
+from services import skill_matrix_service
+from services.skill_catalog_service import catalog_version
+from utils.cache import watch_writes, ALL_ROWS
+
+# Listeners are global, so the watched model is one no other test writes through this hook
+_calls = []
+watch_writes(
+    CacheVersion,
+    on_write=lambda session: _calls.append('write'),
+    on_commit=lambda written: _calls.append(('commit', written)),
+    key=lambda instance: instance.name
+)
+
+
+def test_watch_writes_reports_committed_keys_once_per_transaction(app):
+    _calls.clear()
+    db.session.add(CacheVersion(name='a', version=1))
+    db.session.flush()
+    db.session.add(CacheVersion(name='b', version=1))
+    db.session.commit()
+
+    assert _calls == ['write', ('commit', {'a', 'b'})]
+
+
+def test_watch_writes_notes_bulk_statements_and_forgets_rollbacks(app):
+    db.session.add(CacheVersion(name='a', version=1))
+    db.session.commit()
+    _calls.clear()
+
+    db.session.execute(update(CacheVersion).values(version=2))
+    db.session.rollback()
+    db.session.execute(update(CacheVersion).values(version=3))
+    db.session.commit()
+
+    assert _calls == ['write', 'write', ('commit', {ALL_ROWS})]
+
+
+def test_skill_writes_bump_catalog_version_once_per_transaction(app):
+    before = catalog_version()
+    db.session.add(Skill(skill_name='Python'))
+    db.session.flush()
+    db.session.add(Skill(skill_name='Go'))
+    db.session.flush()
+    db.session.execute(update(Skill).values(category='Languages'))
+    db.session.commit()
+
+    assert catalog_version() == before + 1
+
+    db.session.add(Skill(skill_name='Rust'))
+    db.session.flush()
+    db.session.rollback()
+
+    assert catalog_version() == before + 1
+
+
+def test_match_input_commit_drops_skill_matrix(app):
+    skill_matrix_service._matrix = object()
+    # Skills alone are not a match input
+    db.session.add(Skill(skill_name='Python'))
+    db.session.commit()
+    assert skill_matrix_service._matrix is not None
+
+    db.session.execute(update(CandidateProfile).values(experience_years=1))
+    db.session.commit()
+    assert skill_matrix_service._matrix is None
@@ -1,4 +1,7 @@
 from .file_utils import allowed_file, ALLOWED_EXTENSIONS
 from .code_executor import execute_code
+from .pagination import keyset_paginate, KeysetPage
+from .csv_export import stream_csv
+from .aggregates import counts_by
 
-__all__ = ['allowed_file', 'ALLOWED_EXTENSIONS', 'execute_code']
+__all__ = ['allowed_file', 'ALLOWED_EXTENSIONS', 'execute_code', 'keyset_paginate', 'KeysetPage', 'stream_csv', 'counts_by']
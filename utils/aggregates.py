@@ -0,0 +1,20 @@
+from sqlalchemy import func, select
+
+
+def counts_by(fk_column, *criteria, name=None):
+    """Subquery of ``(key, count)``: rows per value of ``fk_column``, in one GROUP BY.
+
+    Outer-join it on ``.c.key`` and read ``func.coalesce(sq.c.count, 0)`` to
+    get a per-row count for a whole listing in the same statement, instead
+    of one COUNT per row::
+
+        applications = counts_by(JobApplication.job_id)
+        db.session.query(JobPosting, func.coalesce(applications.c.count, 0)).outerjoin(
+            applications, applications.c.key == JobPosting.id)
+
+    ``criteria`` narrow the grouped rows, e.g. to the key range of one batch.
+    """
+    return select(
+        fk_column.label('key'),
+        func.count().label('count')
+    ).where(*criteria).group_by(fk_column).subquery(name)
@@ -0,0 +1,107 @@
+import itertools
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_watch_ids = itertools.count()
+
+# Key noted for a bulk INSERT/UPDATE/DELETE, whose rows aren't known
+ALL_ROWS = object()
+
+
+def watch_writes(*models, on_write=None, on_commit=None, key=None):
+    """Hook the transactions that write any of ``models``, by flush or by bulk statement.
+
+    ``on_write(session)`` runs inside the transaction at its first such
+    write. ``on_commit(written)`` runs once it has committed; ``written`` is
+    the set of ``key(instance)`` for the flushed instances (``None`` left
+    out) plus ``ALL_ROWS`` for a bulk statement, and always empty without
+    ``key``. Rolled back writes are forgotten, so a concurrent reload can't
+    cache rows that never committed.
+    """
+    name = f'watched_writes:{next(_watch_ids)}'
+
+    def note(session):
+        written = session.info.get(name)
+        if written is None:
+            written = session.info[name] = set()
+            if on_write is not None:
+                on_write(session)
+        return written
+
+    @event.listens_for(Session, 'after_flush')
+    def _note_writes(session, flush_context):
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(instance, models):
+                written = note(session)
+                if key is None:
+                    return
+                mark = key(instance)
+                if mark is not None:
+                    written.add(mark)
+
+    tables = {model.__table__ for model in models}
+
+    @event.listens_for(Session, 'do_orm_execute')
+    def _note_bulk_writes(orm_execute_state):
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            mapper = orm_execute_state.bind_mapper
+            if mapper is not None:
+                watched = issubclass(mapper.class_, models)
+            else:
+                # Core statements on a model's table have no mapper
+                watched = getattr(orm_execute_state.statement, 'table', None) in tables
+            if watched:
+                written = note(orm_execute_state.session)
+                if key is not None:
+                    written.add(ALL_ROWS)
+
+    @event.listens_for(Session, 'after_commit')
+    def _after_commit(session):
+        written = session.info.pop(name, None)
+        if written is not None and on_commit is not None:
+            on_commit(written)
+
+    @event.listens_for(Session, 'after_rollback')
+    def _forget_writes(session):
+        session.info.pop(name, None)
+
+
+class TTLCache:
+    """Small process-level cache whose entries expire after a few seconds.
+
+    Values should be plain data (tuples, ints), never ORM instances, since
+    they outlive the session that loaded them.
+    """
+
+    def __init__(self, default_ttl=60):
+        self.default_ttl = default_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, ttl=None):
+        """Cached value for ``key``, calling ``loader()`` when missing or expired"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        value = loader()
+        self.set(key, value, ttl)
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store ``value`` under ``key`` (e.g. from a background refresher)"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.default_ttl), value)
+
+    def invalidate(self, *keys):
+        """Drop the given keys, or everything when called without keys"""
+        with self._lock:
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate_on_commit(self, key, *models):
+        """Drop ``key`` whenever a transaction that wrote one of ``models`` commits"""
+        watch_writes(*models, on_commit=lambda written: self.invalidate(key))
@@ -0,0 +1,35 @@
+import csv
+import io
+from flask import Response, stream_with_context
+
+
+def iter_csv(header, rows, chunk_size=64 * 1024):
+    """Encode ``rows`` as CSV text, yielding chunks of about ``chunk_size`` characters.
+
+    The header goes out on its own so the client gets its first byte before
+    the query produces anything. Quoting and escaping are the csv module's.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_csv(filename, header, rows):
+    """Chunked CSV download; ``rows`` is consumed lazily while the response is sent"""
+    response = Response(stream_with_context(iter_csv(header, rows)), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,135 @@
+from datetime import datetime
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import and_, func, or_
+
+_CURSOR_SALT = 'keyset-cursor'
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.secret_key, salt=_CURSOR_SALT)
+
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _load_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(direction, values):
+    """Opaque, signed token for the rows after (``'next'``) or before (``'prev'``) ``values``"""
+    return _serializer().dumps([direction, [_dump_value(v) for v in values]])
+
+
+def decode_cursor(token):
+    """``(direction, values)`` from a token, or ``None`` if it is missing or tampered with"""
+    if not token:
+        return None
+    try:
+        direction, values = _serializer().loads(token)
+    except (BadSignature, ValueError, TypeError):
+        return None
+    if direction not in ('next', 'prev'):
+        return None
+    return direction, [_load_value(v) for v in values]
+
+
+def _seek(columns, values, descending):
+    """Rows strictly after ``values`` in ``columns`` order (row-value comparison spelled out)"""
+    clauses = []
+    for i, column in enumerate(columns):
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*[columns[j] == values[j] for j in range(i)], step))
+    return or_(*clauses)
+
+
+class KeysetPage:
+    """One page of a keyset-paginated query.
+
+    Exposes ``items``, ``has_next``/``has_prev`` and the opaque
+    ``next_cursor``/``prev_cursor`` tokens to put in links. ``total`` is
+    ``None`` unless counting was requested; with a capped count
+    ``total_is_exact`` is False once the cap is reached.
+    """
+
+    def __init__(self, items, per_page, next_cursor, prev_cursor, total=None, total_is_exact=True):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+        self.total_is_exact = total_is_exact
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def keyset_paginate(query, columns, cursor=None, per_page=20, descending=True, key=None, count=None):
+    """Paginate ``query`` by seeking on ``columns`` instead of OFFSET.
+
+    ``columns`` must end with a unique column, e.g. ``(Model.created_at,
+    Model.id)``, and should be covered by an index in that order. ``query``
+    must not be ordered yet. ``key`` extracts the column values from a result
+    row (defaults to reading attributes named like the columns). ``count`` is
+    ``None`` (no count query), ``'exact'``, or an int cap: rows are only
+    counted up to the cap, which stays cheap on large tables.
+    """
+    key = key or (lambda item: [getattr(item, column.key) for column in columns])
+    decoded = decode_cursor(cursor)
+    backwards = decoded is not None and decoded[0] == 'prev'
+
+    page_query = query
+    if decoded is not None:
+        # Going back means seeking the other way, then flipping the rows
+        page_query = page_query.filter(_seek(columns, decoded[1], descending != backwards))
+    ordering = [c.desc() if descending != backwards else c.asc() for c in columns]
+    rows = page_query.order_by(*ordering).limit(per_page + 1).all()
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        # Coming back from a later page there is always a next page; otherwise ask the extra row
+        if more or backwards:
+            next_cursor = encode_cursor('next', key(rows[-1]))
+        if (more and backwards) or (decoded is not None and not backwards):
+            prev_cursor = encode_cursor('prev', key(rows[0]))
+
+    total, total_is_exact = None, True
+    if count == 'exact':
+        total = query.order_by(None).count()
+    elif count:
+        total = query.order_by(None).with_entities(columns[-1]).limit(count + 1).count()
+        total_is_exact = total <= count
+        total = min(total, count)
+
+    return KeysetPage(rows, per_page, next_cursor, prev_cursor, total, total_is_exact)
+
+
+def offset_paginate(query, count_column, page=1, per_page=20):
+    """``query.paginate()`` with the total counted as ``COUNT(count_column)``.
+
+    ``Query.count()`` wraps the whole entity, deferred columns included, in
+    a subquery; counting a single (primary key) column keeps tables with
+    file bytes from being read just to number the pages.
+    """
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+    pagination.total = query.order_by(None).with_entities(func.count(count_column)).scalar()
+    return pagination